@@ -0,0 +1,76 @@
+"""
+Benchmarks artist lookups: p50/p99 latency in-process (cold and warm cache) and over HTTP.
+
+Lookups follow a Zipf distribution over the indexed artists, like drill-throughs that
+keep coming back to the same popular artists.
+
+Usage:
+    python benchmarks/bench_artist_lookup.py data/cache/artist_index.json --lookups 20000 --http
+"""
+import os
+import sys
+import time
+import argparse
+import urllib.request
+from urllib.parse import quote
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+
+import numpy as np
+from src.serving.artist_lookup import ArtistLookup, serve_lookup
+
+
+def percentiles(timings):
+    return np.percentile(np.array(timings) * 1e6, [50, 99])
+
+
+def timed(func, names):
+    timings = []
+    for name in names:
+        start = time.perf_counter()
+        func(name)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("index", help="Path to a published artist index")
+    parser.add_argument("--lookups", type=int, default=20000)
+    parser.add_argument("--zipf", type=float, default=1.2)
+    parser.add_argument("--cache-size", type=int, default=4096)
+    parser.add_argument("--http", action="store_true", help="Also measure the HTTP endpoint")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    lookup = ArtistLookup(args.index, cache_size=args.cache_size, recheck_s=60)
+    lookup.get("")
+    keys = lookup._index["keys"]
+    rng = np.random.default_rng(args.seed)
+    ranks = np.minimum(rng.zipf(args.zipf, args.lookups), len(keys)) - 1
+    names = [keys[rank] for rank in ranks]
+
+    results = {"cold (decode)": timed(lookup.get, list(dict.fromkeys(names)))}
+    lookup._cache.clear()
+    lookup.hits = lookup.misses = 0
+    results["zipf (LRU)"] = timed(lookup.get, names)
+    hit_rate = lookup.hits / (lookup.hits + lookup.misses)
+
+    if args.http:
+        server = serve_lookup(lookup, port=0)
+        base_url = f"http://127.0.0.1:{server.server_address[1]}/artists/"
+        results["zipf over HTTP"] = timed(lambda name: urllib.request.urlopen(base_url + quote(name)).read(),
+                                          names[:min(len(names), 5000)])
+        server.shutdown()
+
+    print(f"{'lookup path':<18} {'lookups':>8} {'p50 us':>10} {'p99 us':>10}")
+    for name, timings in results.items():
+        p50, p99 = percentiles(timings)
+        print(f"{name:<18} {len(timings):>8} {p50:>10.1f} {p99:>10.1f}")
+    print(f"{'artists indexed':<18} {len(keys):>8}")
+    print(f"{'LRU hit rate':<18} {hit_rate:>8.1%}")
+
+
+if __name__ == "__main__":
+    main()
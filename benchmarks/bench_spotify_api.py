@@ -0,0 +1,59 @@
+"""
+Benchmarks the Spotify API extraction offline against the replay server.
+
+Record the responses once (SPOTIFY_RECORDINGS_MODE=record), then e.g.:
+    python benchmarks/bench_spotify_api.py data/cache/spotify_recordings.json \
+        --latency-ms 120 --latency-sigma 0.5 --error-rate 0.01 --burst-every 200 --burst-length 5
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+
+from src.extract.spotify_replay import ReplaySimulator, load_recordings, serve_replay
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recordings", help="Path to the recorded responses")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-sigma", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--burst-every", type=int, default=0)
+    parser.add_argument("--burst-length", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    simulator = ReplaySimulator(args.latency_ms, args.latency_sigma, args.error_rate,
+                                args.burst_every, args.burst_length, retry_after_s=0, seed=args.seed)
+    server = serve_replay(args.recordings, port=0, simulator=simulator)
+    os.environ["SPOTIFY_API_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1/"
+    os.environ["SPOTIFY_RECORDINGS_MODE"] = "off"
+
+    # Imported after the environment is set: the client is created at import time.
+    from src.extract.extract_api import extract_spotify_api_data
+
+    queries = load_recordings(args.recordings)["search"]
+    artist_names = [query.split(":", 1)[1] if query.startswith("artist:") else query for query in queries]
+    with tempfile.TemporaryDirectory(prefix="spotify-api-bench-") as output_dir:
+        start = time.perf_counter()
+        artist_df = extract_spotify_api_data(artist_names, output_path=os.path.join(output_dir, "artists.csv"))
+        elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    resolved = int(artist_df["followers"].notna().sum())
+    print(f"{'artists':<22} {len(artist_names):>10}")
+    print(f"{'resolved':<22} {resolved:>10}")
+    print(f"{'requests served':<22} {simulator.requests:>10}")
+    print(f"{'throttled (429)':<22} {simulator.throttled:>10}")
+    print(f"{'errors (500)':<22} {simulator.errors:>10}")
+    print(f"{'elapsed s':<22} {elapsed:>10.3f}")
+    print(f"{'artists / s':<22} {len(artist_names) / elapsed if elapsed else 0:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmarks reading spotify_dataset.csv: plain pandas parsing vs. the parsed Arrow cache.
+
+Usage:
+    python benchmarks/bench_spotify_read.py data/spotify_dataset.csv --repeats 5
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+
+import pandas as pd
+from src.extract.parsed_cache import read_csv_cached
+from src.pipeline.contracts import source_projection
+
+
+def timed(func, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="Path to spotify_dataset.csv")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    usecols = source_projection("spotify_csv")
+    cache_dir = tempfile.mkdtemp(prefix="parsed-cache-bench-")
+    try:
+        def cold():
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            read_csv_cached(args.path, usecols=usecols, cache_dir=cache_dir)
+
+        results = {
+            "pd.read_csv": timed(lambda: pd.read_csv(args.path, usecols=usecols), args.repeats),
+            "cache cold (parse + write)": timed(cold, args.repeats),
+            "cache warm (memory-mapped)": timed(lambda: read_csv_cached(args.path, usecols=usecols, cache_dir=cache_dir), args.repeats),
+        }
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print(f"{'read path':<30} {'median s':>10} {'min s':>10}")
+    for name, timings in results.items():
+        print(f"{name:<30} {statistics.median(timings):>10.3f} {min(timings):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
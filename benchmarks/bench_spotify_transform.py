@@ -0,0 +1,61 @@
+"""
+Benchmarks transform_spotify_data in one process vs. hash-partitioned shards.
+
+The dataset is replicated to the requested size with fresh track ids, so the
+duplicate-detection steps have real work to do. Every sharded result is checked
+against the single-process one.
+
+Usage:
+    python benchmarks/bench_spotify_transform.py data/spotify_dataset.csv --rows 10000000 --workers 2 4 8
+"""
+import os
+import sys
+import time
+import argparse
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+
+import pandas as pd
+from src.transform.spotify_transform import transform_spotify_data
+from src.pipeline.contracts import source_projection
+
+
+def replicate(df: pd.DataFrame, rows: int) -> pd.DataFrame:
+    copies = -(-rows // len(df))
+    frames = []
+    for copy in range(copies):
+        frame = df.copy()
+        if copy:
+            # Half the copies are new tracks, half re-list existing songs under new ids.
+            frame["track_id"] = frame["track_id"] + f"-{copy}"
+            if copy % 2:
+                frame["track_name"] = frame["track_name"] + f" ({copy})"
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True).head(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="Path to spotify_dataset.csv")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4])
+    args = parser.parse_args()
+
+    df = replicate(pd.read_csv(args.path, usecols=source_projection("spotify_csv")), args.rows)
+
+    start = time.perf_counter()
+    expected = transform_spotify_data(df.copy(), as_frame=True, workers=1)
+    baseline = time.perf_counter() - start
+
+    print(f"{'workers':<10} {'seconds':>10} {'speed-up':>10} {'identical':>10}")
+    print(f"{1:<10} {baseline:>10.3f} {1.0:>10.2f} {'-':>10}")
+    for workers in args.workers:
+        start = time.perf_counter()
+        result = transform_spotify_data(df.copy(), as_frame=True, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"{workers:<10} {elapsed:>10.3f} {baseline / elapsed:>10.2f} {str(result.equals(expected)):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -23,14 +23,27 @@ sys.path.append('/opt/airflow/src')
 logger.info(f"ETL tasks: Updated Python path: {sys.path}")
 
 from src.extract.spotify_extract import extract_spotify_data
-from src.extract.grammys_extract import extract_grammys_data
+from src.extract.grammys_extract import extract_grammys_data, GRAMMYS_RAW_PRIMARY_KEY, GRAMMYS_RAW_INDEXES
 from src.transform.spotify_transform import transform_spotify_data
 from src.transform.grammys_transform import transform_grammys_data
 from src.transform.merge import merge_data as merge_data_func
+from src.transform.semijoin import SEMIJOIN_PREFILTER, API_JOIN_WORKLIST, artist_keys, semijoin_prefilter, join_worklist
 from src.load_store.load import load_data as load_data_func
 from src.load_store.store import store_merged_data as store_data_func
-from src.extract.extract_api import extract_spotify_api_data
+from src.extract.refresh_scheduler import artist_activity, artist_popularity, refresh_artist_followers
+from src.extract.api_checkpoint import checkpoint_path
 from src.transform.transform_api import transform_spotify_api_data
+from src.transform.grammys_transform import ROLES_OF_INTEREST
+from src.transform.credits import CreditsCache, credits_frame
+from src.database.db_operations import create_gcp_engine, dispose_engine, load_data_raw, load_data_indexed
+from src.database.follower_snapshots import record_follower_snapshots
+from src.pipeline.contracts import source_projection
+from src.pipeline.diagnostics import describe_frame, describe_payload
+from src.pipeline.payloads import to_payload, from_payload
+from src.serving.artist_lookup import publish_artist_index
+from src.pipeline.profiles import record_profile, find_drift
+from src.pipeline.quality import run_quality_gate, SPOTIFY_EXPECTATIONS, SPOTIFY_TRANSFORMED_EXPECTATIONS, GRAMMYS_EXPECTATIONS
+from src.pipeline.run_stats import track_stage, find_regressions, REGRESSION_THRESHOLD_PCT
 
 load_dotenv("/opt/airflow/.env")
 
@@ -48,7 +61,7 @@ def create_schemas(**context):
         engine = create_engine(connection_string)
         logger.info("Database engine created successfully for schema creation.")
 
-        schemas = ['raw', 'staging', 'processed']
+        schemas = ['raw', 'staging', 'processed', 'meta']
 
         with engine.connect() as connection:
             for schema in schemas:
@@ -65,38 +78,37 @@ def create_schemas(**context):
 def load_grammys_csv_to_db(**context):
     logger.info("DEBUG: load_grammys_csv_to_db() called")
     try:
-        file_path = "/opt/airflow/data/the_grammy_awards.csv"
-        logger.info(f"Loading Grammy Awards data from {file_path}")
+        with track_stage("load_grammys_csv", context) as stats:
+            file_path = "/opt/airflow/data/the_grammy_awards.csv"
+            logger.info(f"Loading Grammy Awards data from {file_path}")
 
-        df = pd.read_csv(file_path)
-        if df.empty:
-            raise ValueError("No data found in the_grammy_awards.csv")
+            df = pd.read_csv(file_path)
+            if df.empty:
+                raise ValueError("No data found in the_grammy_awards.csv")
 
-        logger.info(f"Loaded {len(df)} rows from the_grammy_awards.csv")
-        logger.info(f"Sample data:\n{df.head(2).to_string()}")
+            stats.update(rows_in=len(df), bytes_in=os.path.getsize(file_path))
+            describe_frame("load_grammys_csv", df)
 
-        db_user = os.getenv("PG_USER")
-        db_password = os.getenv("PG_PASSWORD")
-        db_host = os.getenv("PG_HOST")
-        db_port = os.getenv("PG_PORT")
-        db_name = os.getenv("PG_DATABASE")
-        db_driver = os.getenv("PG_DRIVER")
+            db_user = os.getenv("PG_USER")
+            db_password = os.getenv("PG_PASSWORD")
+            db_host = os.getenv("PG_HOST")
+            db_port = os.getenv("PG_PORT")
+            db_name = os.getenv("PG_DATABASE")
+            db_driver = os.getenv("PG_DRIVER")
 
-        connection_string = f"{db_driver}://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
-        engine = create_engine(connection_string)
-        logger.info("Database engine created successfully.")
+            connection_string = f"{db_driver}://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+            engine = create_engine(connection_string)
+            logger.info("Database engine created successfully.")
 
-        df.to_sql(
-            name='grammy_awards',
-            schema='raw',
-            con=engine,
-            if_exists='replace',
-            index=False
-        )
-        logger.info("Successfully loaded data into raw.grammy_awards table.")
+            # Keyed by the CSV row number so reloads of the same file keep stable keys.
+            df.insert(0, GRAMMYS_RAW_PRIMARY_KEY, range(1, len(df) + 1))
+            load_data_indexed(engine, df, 'grammy_awards', 'raw',
+                              primary_key=GRAMMYS_RAW_PRIMARY_KEY, indexes=GRAMMYS_RAW_INDEXES)
+            logger.info("Successfully loaded data into raw.grammy_awards table.")
+            stats.update(rows_out=len(df))
 
-        engine.dispose()
-        logger.info("Database engine disposed.")
+            engine.dispose()
+            logger.info("Database engine disposed.")
 
     except Exception as e:
         logger.error(f"Error loading Grammy Awards data into database: {e}", exc_info=True)
@@ -105,14 +117,19 @@ def load_grammys_csv_to_db(**context):
 def extract_spotify(**context):
     logger.info("DEBUG: extract_spotify() called")
     try:
-        file_path = "/opt/airflow/data/spotify_dataset.csv"
-        logger.info(f"Extracting Spotify data from {file_path}")
-        df = extract_spotify_data(file_path)
-        if df.empty:
-            raise ValueError("No data extracted from Spotify dataset")
-        logger.info(f"Extracted Spotify data with {len(df)} rows")
-        logger.info(f"Spotify sample data:\n{df.head(2).to_string()}")
-        return df.to_json(orient="records")
+        with track_stage("extract_spotify", context) as stats:
+            file_path = "/opt/airflow/data/spotify_dataset.csv"
+            logger.info(f"Extracting Spotify data from {file_path}")
+            df = extract_spotify_data(file_path, usecols=source_projection("spotify_csv"))
+            if df.empty:
+                raise ValueError("No data extracted from Spotify dataset")
+            run_quality_gate("extract_spotify", df, SPOTIFY_EXPECTATIONS)
+            context['ti'].xcom_push(key='artist_popularity', value=artist_popularity(df))
+            describe_frame("extract_spotify", df)
+            record_profile("extract_spotify", df, context)
+            json_data = df.to_json(orient="records")
+            stats.update(rows_out=len(df), bytes_in=os.path.getsize(file_path), bytes_out=len(json_data))
+            return json_data
     except Exception as e:
         logger.error(f"Error extracting Spotify data: {e}", exc_info=True)
         raise
@@ -120,18 +137,44 @@ def extract_spotify(**context):
 def extract_spotify_api(**context):
     logger.info("DEBUG: extract_spotify_api() called")
     try:
-        artist_names = context['ti'].xcom_pull(key='grammy_artists', task_ids='extract_grammys')
-        logger.info(f"Pulled artist names from XCom: {artist_names[:5] if artist_names else 'None'}")
-        if not artist_names:
-            raise ValueError("No artist names received from extract_grammys task")
-        
-        artist_df = extract_spotify_api_data(artist_names=artist_names)
-        if artist_df.empty:
-            raise ValueError("No artist data extracted from Spotify API")
-        
-        context['ti'].xcom_push(key='artist_data', value=artist_df.to_json(orient="records"))
-        logger.info("Pushed artist_data to XCom")
-        return artist_df.to_json(orient="records")
+        with track_stage("extract_spotify_api", context) as stats:
+            artist_names = context['ti'].xcom_pull(key='grammy_artists', task_ids='extract_grammys')
+            logger.info(f"Pulled artist names from XCom: {artist_names[:5] if artist_names else 'None'}")
+            if not artist_names:
+                raise ValueError("No artist names received from extract_grammys task")
+            stats.update(rows_in=len(artist_names))
+            
+            activity = pd.DataFrame(json.loads(
+                context['ti'].xcom_pull(key='grammy_artist_activity', task_ids='extract_grammys') or "[]"
+            ), columns=["artist_name", "last_nominated", "wins"])
+            popularity = context['ti'].xcom_pull(key='artist_popularity', task_ids='extract_spotify') or {}
+            if API_JOIN_WORKLIST:
+                # The popularity map is keyed by every normalised Spotify artist.
+                if not popularity:
+                    raise ValueError("No Spotify artist keys received from extract_spotify task")
+                artist_names = join_worklist(artist_names, popularity.keys())
+            
+            engine = create_gcp_engine()
+            try:
+                # A retry of this run resumes the searches and lookups from its checkpoint and
+                # redoes the failed ones; the last attempt keeps whatever still fails as misses.
+                ti = context['ti']
+                refresh = refresh_artist_followers(engine, artist_names, activity, popularity, context['ds'],
+                                                   checkpoint_path=checkpoint_path(context['run_id']),
+                                                   final_attempt=ti.try_number > ti.max_tries)
+                artist_df = refresh["artists"]
+                if artist_df.empty:
+                    raise ValueError("No artist data extracted from Spotify API")
+                written = record_follower_snapshots(engine, refresh["refreshed"], context['ds'])
+                logger.info(f"Wrote {written} follower changes to the snapshot history for {context['ds']}")
+            finally:
+                dispose_engine(engine)
+            
+            json_data = artist_df.to_json(orient="records")
+            context['ti'].xcom_push(key='artist_data', value=json_data)
+            logger.info("Pushed artist_data to XCom")
+            stats.update(rows_out=len(artist_df), bytes_out=len(json_data))
+            return json_data
     except Exception as e:
         logger.error(f"Error extracting Spotify API data: {e}", exc_info=True)
         raise
@@ -139,33 +182,43 @@ def extract_spotify_api(**context):
 def extract_grammys(**context):
     logger.info("DEBUG: extract_grammys() called")
     try:
-        logger.info("Extracting Grammy Awards data from database")
-        dataframes = extract_grammys_data()
-        logger.info(f"Extracted Grammy Awards data with keys: {list(dataframes.keys())}")
-        
-        if 'grammy_awards' not in dataframes:
-            raise ValueError("Expected 'grammy_awards' table not found in extracted data")
-        
-        df = dataframes['grammy_awards']
-        if df.empty:
-            raise ValueError("No data extracted from Grammy Awards database")
-        
-        possible_artist_cols = ['artist', 'nominee', 'artist_name', 'performer']
-        artist_col = next((col for col in possible_artist_cols if col in df.columns), None)
-        if not artist_col:
-            raise KeyError("No artist column found in Grammy data; tried 'artist', 'nominee', 'artist_name', 'performer'")
-        
-        artist_names = df[artist_col].dropna().unique().tolist()
-        logger.info(f"Extracted {len(artist_names)} unique artist names from Grammy data")
-        logger.info(f"Sample artist names: {artist_names[:5]}")
-        
-        context['ti'].xcom_push(key='grammy_artists', value=artist_names)
-        logger.info("Pushed grammy_artists to XCom")
-        
-        logger.info(f"Grammy DataFrame columns: {df.columns.tolist()}")
-        logger.info(f"Extracted Grammy Awards data with {len(df)} rows")
-        logger.info(f"Grammy sample data:\n{df.head(2).to_string()}")
-        return df.to_json(orient="records")
+        with track_stage("extract_grammys", context) as stats:
+            logger.info("Extracting Grammy Awards data from database")
+            params = context.get('params') or {}
+            dataframes = extract_grammys_data(
+                year_from=params.get('grammys_year_from'),
+                year_to=params.get('grammys_year_to'),
+                categories=params.get('grammys_categories')
+            )
+            logger.info(f"Extracted Grammy Awards data with keys: {list(dataframes.keys())}")
+            
+            if 'grammy_awards' not in dataframes:
+                raise ValueError("Expected 'grammy_awards' table not found in extracted data")
+            
+            df = dataframes['grammy_awards']
+            if df.empty:
+                raise ValueError("No data extracted from Grammy Awards database")
+            run_quality_gate("extract_grammys", df, GRAMMYS_EXPECTATIONS)
+            
+            possible_artist_cols = ['artist', 'nominee', 'artist_name', 'performer']
+            artist_col = next((col for col in possible_artist_cols if col in df.columns), None)
+            if not artist_col:
+                raise KeyError("No artist column found in Grammy data; tried 'artist', 'nominee', 'artist_name', 'performer'")
+            
+            artist_names = df[artist_col].dropna().unique().tolist()
+            logger.info(f"Extracted {len(artist_names)} unique artist names from Grammy data")
+            logger.info(f"Sample artist names: {artist_names[:5]}")
+            
+            context['ti'].xcom_push(key='grammy_artists', value=artist_names)
+            logger.info("Pushed grammy_artists to XCom")
+            activity = artist_activity(df, artist_col)
+            context['ti'].xcom_push(key='grammy_artist_activity', value=activity.to_json(orient="records"))
+            
+            describe_frame("extract_grammys", df)
+            record_profile("extract_grammys", df, context)
+            json_data = df.to_json(orient="records")
+            stats.update(rows_out=len(df), bytes_out=len(json_data))
+            return json_data
     except Exception as e:
         logger.error(f"Error extracting Grammy Awards data: {e}", exc_info=True)
         raise
@@ -173,21 +226,26 @@ def extract_grammys(**context):
 def transform_spotify(df, **context):
     logger.info("DEBUG: transform_spotify() called")
     try:
-        logger.info(f"Received Spotify data for transformation: {df[:100]}...")
-        logger.info("Transforming Spotify data")
-        json_df = json.loads(df)
-        raw_df = pd.DataFrame(json_df)
-        transformed_data = transform_spotify_data(raw_df)
-        json_data = transformed_data
-        try:
-            if isinstance(json_data, pd.DataFrame):
-                json_data = json_data.to_json(orient="records")
-            json_parsed = json.loads(json_data)
-            logger.info(f"Transformed Spotify data with {len(json_parsed)} rows")
-            logger.info(f"Transformed Spotify sample data:\n{pd.DataFrame(json_parsed).head(2).to_string()}")
-        except Exception as e:
-            logger.info(f"Transformed Spotify data successfully, but couldn't parse JSON: {e}")
-        return json_data
+        with track_stage("transform_spotify", context) as stats:
+            describe_payload("transform_spotify", df)
+            logger.info("Transforming Spotify data")
+            json_df = json.loads(df)
+            raw_df = pd.DataFrame(json_df)
+            stats.update(rows_in=len(raw_df), bytes_in=len(df))
+            if SEMIJOIN_PREFILTER:
+                keys = context['ti'].xcom_pull(key='grammy_artist_keys', task_ids='transform_grammys')
+                if keys is None:
+                    raise ValueError("Semi-join pre-filter enabled but transform_grammys pushed no artist keys")
+                raw_df, _ = semijoin_prefilter(raw_df, keys)
+            transformed_df = transform_spotify_data(raw_df, as_frame=True)
+            if transformed_df is None:
+                raise ValueError("Spotify transformation returned no data")
+            run_quality_gate("transform_spotify", transformed_df, SPOTIFY_TRANSFORMED_EXPECTATIONS)
+            json_data = to_payload(transformed_df)
+            stats.update(rows_out=len(transformed_df), bytes_out=len(json_data))
+            describe_frame("transform_spotify", transformed_df)
+            record_profile("transform_spotify", transformed_df, context)
+            return json_data
     except Exception as e:
         logger.error(f"Error transforming Spotify data: {e}", exc_info=True)
         raise
@@ -195,21 +253,18 @@ def transform_spotify(df, **context):
 def transform_spotify_api(df, **context):
     logger.info("DEBUG: transform_spotify_api() called")
     try:
-        logger.info(f"Received Spotify API data for transformation: {df[:100]}...")
-        logger.info("Transforming Spotify API data")
-        json_df = json.loads(df)
-        raw_df = pd.DataFrame(json_df)
-        transformed_data = transform_spotify_api_data(raw_df)
-        json_data = transformed_data
-        try:
-            if isinstance(json_data, pd.DataFrame):
-                json_data = json_data.to_json(orient="records")
-            json_parsed = json.loads(json_data)
-            logger.info(f"Transformed Spotify API data with {len(json_parsed)} rows")
-            logger.info(f"Transformed Spotify API sample data:\n{pd.DataFrame(json_parsed).head(2).to_string()}")
-        except Exception as e:
-            logger.info(f"Transformed Spotify API data successfully, but couldn't parse JSON: {e}")
-        return json_data
+        with track_stage("transform_spotify_api", context) as stats:
+            describe_payload("transform_spotify_api", df)
+            logger.info("Transforming Spotify API data")
+            json_df = json.loads(df)
+            raw_df = pd.DataFrame(json_df)
+            stats.update(rows_in=len(raw_df), bytes_in=len(df))
+            transformed_df = transform_spotify_api_data(raw_df)
+            json_data = transformed_df.to_json(orient="records")
+            stats.update(rows_out=len(transformed_df), bytes_out=len(json_data))
+            describe_frame("transform_spotify_api", transformed_df)
+            record_profile("transform_spotify_api", transformed_df, context)
+            return json_data
     except Exception as e:
         logger.error(f"Error transforming Spotify API data: {e}", exc_info=True)
         raise
@@ -217,55 +272,73 @@ def transform_spotify_api(df, **context):
 def transform_grammys(df, **context):
     logger.info("DEBUG: transform_grammys() called")
     try:
-        logger.info(f"Received Grammy data for transformation: {df[:100]}...")
-        logger.info("Transforming Grammy Awards data")
-        json_df = json.loads(df)
-        raw_df = pd.DataFrame(json_df)
-        transformed_data = transform_grammys_data(raw_df)
-        json_data = transformed_data
-        try:
-            if isinstance(json_data, pd.DataFrame):
-                json_data = json_data.to_json(orient="records")
-            json_parsed = json.loads(json_data)
-            logger.info(f"Transformed Grammy Awards data with {len(json_parsed)} rows")
-            logger.info(f"Transformed Grammy sample data:\n{pd.DataFrame(json_parsed).head(2).to_string()}")
-        except Exception as e:
-            logger.info(f"Transformed Grammy Awards data successfully, but couldn't parse JSON: {e}")
-        return json_data
+        with track_stage("transform_grammys", context) as stats:
+            describe_payload("transform_grammys", df)
+            logger.info("Transforming Grammy Awards data")
+            json_df = json.loads(df)
+            raw_df = pd.DataFrame(json_df)
+            stats.update(rows_in=len(raw_df), bytes_in=len(df))
+            credits_cache = CreditsCache.load()
+            transformed_df = transform_grammys_data(raw_df, credits_cache=credits_cache, as_frame=True)
+            if transformed_df is None:
+                raise ValueError("Grammy Awards transformation returned no data")
+            publish_grammy_credits(raw_df, credits_cache)
+            credits_cache.save()
+            stats.update(cache_hit_rate=credits_cache.hit_rate)
+            json_data = to_payload(transformed_df)
+            stats.update(rows_out=len(transformed_df), bytes_out=len(json_data))
+            describe_frame("transform_grammys", transformed_df)
+            record_profile("transform_grammys", transformed_df, context)
+            if SEMIJOIN_PREFILTER:
+                context['ti'].xcom_push(key='grammy_artist_keys', value=artist_keys(transformed_df))
+            return json_data
     except Exception as e:
         logger.error(f"Error transforming Grammy Awards data: {e}", exc_info=True)
         raise
 
+def publish_grammy_credits(raw_df, credits_cache):
+    logger.info("DEBUG: publish_grammy_credits() called")
+    if "workers" not in raw_df.columns:
+        logger.info("No workers column in Grammy data; skipping credits publication")
+        return
+    credits_df = credits_frame(raw_df["workers"], credits_cache, ROLES_OF_INTEREST)
+    engine = create_gcp_engine()
+    try:
+        load_data_raw(engine, credits_df, "grammy_credits", schema="staging")
+        logger.info(f"Published {len(credits_df)} parsed credits to staging.grammy_credits")
+    finally:
+        dispose_engine(engine)
+
 def merge_data(spotify_df, grammys_df, spotify_api_df=None, **context):
     logger.info("DEBUG: merge_data() called")
     try:
-        logger.info(f"Received Spotify data for merging: {spotify_df[:100]}...")
-        logger.info(f"Received Grammy data for merging: {grammys_df[:100]}...")
-        if spotify_api_df:
-            logger.info(f"Received Spotify API data for merging: {spotify_api_df[:100]}...")
-        
-        logger.info("Merging Spotify and Grammy Awards data")
-        spotify_json = json.loads(spotify_df)
-        grammys_json = json.loads(grammys_df)
-        spotify_df = pd.DataFrame(spotify_json)
-        grammys_df = pd.DataFrame(grammys_json)
-        
-        if spotify_api_df:
-            spotify_api_json = json.loads(spotify_api_df)
-            spotify_api_df = pd.DataFrame(spotify_api_json)
-            merged_data = merge_data_func(spotify_df, grammys_df, spotify_api_df)
-        else:
-            merged_data = merge_data_func(spotify_df, grammys_df)
+        with track_stage("merge_data", context) as stats:
+            describe_payload("merge_data.spotify", spotify_df)
+            describe_payload("merge_data.grammys", grammys_df)
+            if spotify_api_df:
+                describe_payload("merge_data.spotify_api", spotify_api_df)
             
-        if isinstance(merged_data, pd.DataFrame):
-            merged_data = merged_data.to_json(orient="records")
-        try:
-            json_parsed = json.loads(merged_data)
-            logger.info(f"Merged data with {len(json_parsed)} rows")
-            logger.info(f"Merged sample data:\n{pd.DataFrame(json_parsed).head(2).to_string()}")
-        except Exception as e:
-            logger.info(f"Data merged successfully, but couldn't parse JSON: {e}")
-        return merged_data
+            logger.info("Merging Spotify and Grammy Awards data")
+            bytes_in = len(spotify_df) + len(grammys_df) + len(spotify_api_df or "")
+            spotify_df = from_payload(spotify_df)
+            grammys_df = from_payload(grammys_df)
+            stats.update(rows_in=len(spotify_df) + len(grammys_df), bytes_in=bytes_in)
+            
+            if spotify_api_df:
+                spotify_api_json = json.loads(spotify_api_df)
+                spotify_api_df = pd.DataFrame(spotify_api_json)
+                merged_data = merge_data_func(spotify_df, grammys_df, spotify_api_df)
+            else:
+                merged_data = merge_data_func(spotify_df, grammys_df)
+            
+            # Row amplification: merged rows per Spotify input row (see MERGE_GRANULARITY).
+            stats.update(rows_out=len(merged_data),
+                         row_amplification=len(merged_data) / len(spotify_df) if len(spotify_df) else None)
+            describe_frame("merge_data", merged_data)
+            record_profile("merge_data", merged_data, context)
+            json_data = to_payload(merged_data)
+            stats.update(bytes_out=len(json_data))
+            return json_data
     except Exception as e:
         logger.error(f"Error merging data: {e}", exc_info=True)
         raise
@@ -273,13 +346,24 @@ def merge_data(spotify_df, grammys_df, spotify_api_df=None, **context):
 def load_data(df, **context):
     logger.info("DEBUG: load_data() called")
     try:
-        logger.info(f"Received data for loading: {df[:100]}...")
-        logger.info("Loading merged data into database")
-        json_df = json.loads(df)
-        df = pd.DataFrame(json_df)
-        load_data_func(df, "merged_data")
-        logger.info("Merged data loaded successfully")
-        return df.to_json(orient="records")
+        with track_stage("load_data", context) as stats:
+            describe_payload("load_data", df)
+            logger.info("Loading merged data into database")
+            stats.update(bytes_in=len(df))
+            df = from_payload(df)
+            stats.update(rows_in=len(df))
+            # Keyed by run, so a retry continues from the first chunk the failed attempt didn't commit.
+            rows_loaded = load_data_func(df, "merged_data", load_id=f"{context['run_id']}:merged.merged_data")
+            if rows_loaded is None:
+                raise RuntimeError("Loading merged data into the database failed")
+            stats.update(rows_out=rows_loaded)
+            logger.info("Merged data loaded successfully")
+            # Lookup services swap to this run's index and drop their caches. The load itself
+            # already succeeded, so a failed publish leaves the previous index in service.
+            try:
+                publish_artist_index(df, context['run_id'])
+            except Exception as e:
+                logger.warning(f"Could not publish the artist index: {e}", exc_info=True)
     except Exception as e:
         logger.error(f"Error loading data: {e}", exc_info=True)
         raise
@@ -287,12 +371,45 @@ def load_data(df, **context):
 def store_data(df, **context):
     logger.info("DEBUG: store_data() called")
     try:
-        logger.info(f"Received data for storing: {df[:100]}...")
-        logger.info("Storing merged data")
-        json_df = json.loads(df)
-        df = pd.DataFrame(json_df)
-        store_data_func("merged_data", df)
-        logger.info("Merged data stored successfully")
+        with track_stage("store_data", context) as stats:
+            describe_payload("store_data", df)
+            logger.info("Storing merged data")
+            stats.update(bytes_in=len(df))
+            df = from_payload(df)
+            stats.update(rows_in=len(df))
+            stored = store_data_func("merged_data", df)
+            stats.update(rows_out=len(df), bytes_out=stored["bytes"])
+            logger.info("Merged data stored successfully")
     except Exception as e:
         logger.error(f"Error storing data: {e}", exc_info=True)
-        raise
\ No newline at end of file
+        raise
+
+def check_run_regressions(**context):
+    logger.info("DEBUG: check_run_regressions() called")
+    try:
+        engine = create_gcp_engine()
+        try:
+            regressions = find_regressions(engine, context['dag'].dag_id, context['run_id'])
+            drift = find_drift(engine, context['dag'].dag_id, context['run_id'])
+        finally:
+            dispose_engine(engine)
+        if regressions:
+            for regression in regressions:
+                logger.warning(
+                    f"Performance regression in {regression['stage']}: {regression['metric']} "
+                    f"{regression['value']:.2f} vs baseline {regression['baseline']:.2f} "
+                    f"(+{regression['change_pct']}%, threshold {REGRESSION_THRESHOLD_PCT}%)"
+                )
+        else:
+            logger.info("No stage regressed against the rolling baseline")
+        for change in drift:
+            logger.warning(
+                f"Data drift in {change['stage']}.{change['column']}: {change['statistic']} "
+                f"{change['value']:.2f} vs previous run {change['previous']:.2f} ({change['change_pct']:+}%)"
+            )
+        if not drift:
+            logger.info("No profiled column drifted from the previous run")
+        return json.dumps({"regressions": regressions, "drift": drift})
+    except Exception as e:
+        logger.error(f"Error checking run regressions: {e}", exc_info=True)
+        raise
@@ -35,8 +35,14 @@ from tasks.etl import (
     load_data,
     store_data,
     extract_spotify_api,
-    transform_spotify_api
+    transform_spotify_api,
+    check_run_regressions
 )
+from src.pipeline.contracts import validate_contracts
+from src.transform.semijoin import SEMIJOIN_PREFILTER
+
+# Fail the DAG import, not a run, if a stage consumes a column its upstream doesn't provide.
+validate_contracts()
 
 with DAG(
     dag_id='workshop_002_etl_pipeline',
@@ -46,6 +52,12 @@ with DAG(
     catchup=False,
     tags=['etl', 'spotify', 'grammys'],
     is_paused_upon_creation=False,
+    # Optional Grammys filters, pushed down to the indexed raw.grammy_awards table.
+    params={
+        'grammys_year_from': None,
+        'grammys_year_to': None,
+        'grammys_categories': [],
+    },
 ) as dag:
 
     create_schemas_task = PythonOperator(
@@ -180,7 +192,19 @@ with DAG(
     store_data_task = PythonOperator(
         task_id='store_data',
         python_callable=store_data,
-        op_args=['{{ ti.xcom_pull(task_ids="load_data") }}'],
+        op_args=['{{ ti.xcom_pull(task_ids="merge_data") }}'],
+        provide_context=True,
+        owner='sebasbelmos',
+        depends_on_past=False,
+        email_on_failure=False,
+        email_on_retry=False,
+        retries=1,
+        retry_delay=timedelta(minutes=5),
+    )
+
+    check_run_regressions_task = PythonOperator(
+        task_id='check_run_regressions',
+        python_callable=check_run_regressions,
         provide_context=True,
         owner='sebasbelmos',
         depends_on_past=False,
@@ -195,9 +219,16 @@ with DAG(
     create_schemas_task >> extract_grammys_task
     load_grammys_csv_task >> extract_grammys_task
     extract_grammys_task >> extract_spotify_api_task
+    # The API worklist is restricted to, and ranked by, the Spotify artists extract_spotify pushes.
+    extract_spotify_task >> extract_spotify_api_task
     extract_spotify_task >> transform_spotify_task
     extract_spotify_api_task >> transform_spotify_api_task
     extract_grammys_task >> transform_grammys_task
+    if SEMIJOIN_PREFILTER:
+        # transform_spotify filters its input by the Grammy artist keys transform_grammys pushes.
+        transform_grammys_task >> transform_spotify_task
     [transform_spotify_task, transform_grammys_task, transform_spotify_api_task] >> merge_data_task
-    merge_data_task >> load_data_task
-    load_data_task >> store_data_task
\ No newline at end of file
+    # Both sinks read the merged output materialised once by merge_data and run concurrently,
+    # each with its own retries.
+    merge_data_task >> [load_data_task, store_data_task]
+    [load_data_task, store_data_task] >> check_run_regressions_task
\ No newline at end of file
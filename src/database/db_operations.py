@@ -1,16 +1,20 @@
+import io
 import os
+import hashlib
 import logging
-from typing import Any, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 from dotenv import load_dotenv
 from sqlalchemy import (
-    create_engine, inspect, BigInteger, Boolean, Integer, Float,
-    String, Text, DateTime, MetaData, Table, Column
+    create_engine, inspect, BigInteger, Boolean, Integer, SmallInteger, Float,
+    String, Text, DateTime, MetaData, Table, Column, Index, ForeignKey, text
 )
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy_utils import database_exists, create_database
 import pandas as pd
 from pathlib import Path
 
+from src.database.dimensions import replace_labelled_view
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -50,13 +54,16 @@ except ValueError as e:
     raise ValueError(f"Invalid port number in environment variables: {DB_CONFIG['port']}") from e
 
 
-def create_gcp_engine() -> Engine:
+def create_gcp_engine(pool_size: Optional[int] = None) -> Engine:
     """
     Creates a database engine using environment variables.
     
     This function initialises a connection to the PostgreSQL database using
     credentials stored in environment variables.
     
+    Args:
+        pool_size (Optional[int]): Connections kept in the pool; SQLAlchemy's default when omitted
+    
     Returns:
         Engine: SQLAlchemy database engine instance
         
@@ -66,7 +73,7 @@ def create_gcp_engine() -> Engine:
     try:
         db_url = f"postgresql://{DB_CONFIG['user']}:{DB_CONFIG['password']}@{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}"
         
-        engine = create_engine(db_url)
+        engine = create_engine(db_url, **({"pool_size": pool_size} if pool_size else {}))
         logging.info("Database engine created successfully.")
         return engine
         
@@ -95,7 +102,7 @@ def dispose_engine(engine: Engine) -> None:
         raise
 
 
-def infer_types(dtype: Any, column_name: str, df: pd.DataFrame) -> Union[Integer, Float, String, Text, DateTime, Boolean]:
+def infer_types(dtype: Any, column_name: str, df: pd.DataFrame) -> Union[SmallInteger, Integer, Float, String, Text, DateTime, Boolean]:
     """
     Infers the appropriate SQLAlchemy type for a DataFrame column.
     
@@ -105,9 +112,11 @@ def infer_types(dtype: Any, column_name: str, df: pd.DataFrame) -> Union[Integer
         df (pd.DataFrame): DataFrame containing the column
         
     Returns:
-        Union[Integer, Float, String, Text, DateTime, Boolean]: SQLAlchemy type
+        Union[SmallInteger, Integer, Float, String, Text, DateTime, Boolean]: SQLAlchemy type
     """
-    if "int" in dtype.name:
+    if dtype.name.lower() == "int16":
+        return SmallInteger
+    elif "int" in dtype.name:
         return Integer
     elif "float" in dtype.name:
         return Float
@@ -153,30 +162,46 @@ def load_data_raw(engine: Engine, df: pd.DataFrame, table_name: str, schema: str
         raise
 
 
-def load_data_clean(engine: Engine, df: pd.DataFrame, table_name: str, schema: str = "merged") -> None:
+def load_data_clean(engine: Engine, df: pd.DataFrame, table_name: str, schema: str = "merged",
+                    foreign_keys: Optional[Dict[str, str]] = None, load_id: Optional[str] = None) -> None:
     """
     Loads cleaned data from a DataFrame into a database table.
     
     This function creates a table with appropriate column types if it doesn't exist,
     then loads the data. It performs type inference and schema validation.
     
+    The data is written in ledgered chunks (see load_chunks). A retry of the same load
+    finds the table it created on an earlier attempt, even one left empty, and continues
+    from the first missing chunk instead of failing because the table exists. The load's
+    ledger entries are removed once every chunk is in.
+    
     Args:
         engine (Engine): SQLAlchemy database engine
         df (pd.DataFrame): DataFrame containing the cleaned data to load
         table_name (str): Name of the table to create or update
+        foreign_keys (Optional[Dict[str, str]]): Column -> referenced "schema.table.column"
+        load_id (Optional[str]): Identifies the load across retries; derived from the data when omitted
         
     Raises:
         Exception: If there is an error creating or loading the table
     """
     logging.info(f"Creating table {schema}.{table_name} from Pandas DataFrame.")
+    foreign_keys = foreign_keys or {}
+    fingerprint = frame_fingerprint(df)
+    load_id = load_id or f"{schema}.{table_name}:{fingerprint[:16]}"
     
     try:
-        if not inspect(engine).has_table(table_name, schema=schema):
+        if resumable_load(engine, table_name, schema, load_id, fingerprint, allow_empty=True):
+            load_chunks(engine, df, table_name, schema, load_id, fingerprint)
+            with engine.begin() as conn:
+                finish_load(conn, load_id)
+        elif not inspect(engine).has_table(table_name, schema=schema):
             metadata = MetaData()
             columns = [
                 Column(
                     name,
                     infer_types(dtype, name, df),
+                    *([ForeignKey(foreign_keys[name])] if name in foreign_keys else []),
                     primary_key=(name == "id")
                 )
                 for name, dtype in df.dtypes.items()
@@ -187,9 +212,11 @@ def load_data_clean(engine: Engine, df: pd.DataFrame, table_name: str, schema: s
             
             logging.info(f"Table {schema}.{table_name} was created successfully.")
 
-            with engine.connect() as conn:
-                df.to_sql(table_name, con=conn, schema=schema, if_exists="append", index=False)
-                logging.info(f"Data loaded to table {schema}.{table_name}.")
+            clear_load_ledger(engine, load_id)
+            load_chunks(engine, df, table_name, schema, load_id, fingerprint)
+            with engine.begin() as conn:
+                finish_load(conn, load_id)
+            logging.info(f"Data loaded to table {schema}.{table_name}.")
         else:
             logging.error(f"Table {schema}.{table_name} already exists.")
             raise ValueError(f"Table {schema}.{table_name} already exists. Use load_data_raw to replace it.")
@@ -198,4 +225,400 @@ def load_data_clean(engine: Engine, df: pd.DataFrame, table_name: str, schema: s
             
     except Exception as e:
         logging.error(f"Error creating table {schema}.{table_name}: {str(e)}")
-        raise
\ No newline at end of file
+        raise
+
+def load_data_indexed(engine: Engine, df: pd.DataFrame, table_name: str, schema: str,
+                      primary_key: str, indexes: List[List[str]]) -> int:
+    """
+    Replaces the rows of a keyed, indexed table without dropping it.
+    
+    The table and its indexes are created on first use. New data is written to a
+    staging table, then swapped in with TRUNCATE + INSERT in a single transaction, so
+    readers see either the old or the new rows, and dependent objects (views, grants,
+    indexes) survive the reload. The table is analysed afterwards so the planner can
+    use the indexes straight away.
+    
+    Args:
+        engine (Engine): SQLAlchemy database engine
+        df (pd.DataFrame): DataFrame containing the data to load, including the primary key
+        table_name (str): Name of the target table
+        schema (str): Schema of the target table
+        primary_key (str): Primary key column
+        indexes (List[List[str]]): Column lists to index
+        
+    Returns:
+        int: Number of rows loaded
+        
+    Raises:
+        ValueError: If the DataFrame's columns don't match an existing table
+        Exception: If there is an error creating or loading the table
+    """
+    logging.info(f"Loading {len(df)} rows into {schema}.{table_name} through a staging table.")
+    
+    try:
+        metadata = MetaData()
+        columns = [
+            Column(name, infer_types(dtype, name, df), primary_key=(name == primary_key))
+            for name, dtype in df.dtypes.items()
+        ]
+        table = Table(table_name, metadata, *columns, schema=schema)
+        for index_columns in indexes:
+            Index(f"ix_{table_name}_{'_'.join(index_columns)}", *[table.c[col] for col in index_columns])
+        inspector = inspect(engine)
+        if inspector.has_table(table_name, schema=schema) and \
+                not inspector.get_pk_constraint(table_name, schema=schema).get("constrained_columns"):
+            # One-time migration of a table created by to_sql(if_exists='replace'), which has no key.
+            logging.warning(f"Recreating unkeyed table {schema}.{table_name} with primary key {primary_key}.")
+            with engine.begin() as conn:
+                conn.execute(text(f'DROP TABLE "{schema}"."{table_name}"'))
+        metadata.create_all(engine, checkfirst=True)
+
+        existing = [col["name"] for col in inspect(engine).get_columns(table_name, schema=schema)]
+        if sorted(existing) != sorted(df.columns):
+            raise ValueError(f"Columns of {schema}.{table_name} {existing} don't match the data {list(df.columns)}")
+        
+        staging_table = f"{table_name}_load"
+        df.to_sql(staging_table, con=engine, schema="staging", if_exists="replace", index=False)
+        
+        column_list = ", ".join(f'"{col}"' for col in df.columns)
+        with engine.begin() as conn:
+            conn.execute(text(f'TRUNCATE "{schema}"."{table_name}"'))
+            conn.execute(text(
+                f'INSERT INTO "{schema}"."{table_name}" ({column_list}) '
+                f'SELECT {column_list} FROM "staging"."{staging_table}"'
+            ))
+            conn.execute(text(f'DROP TABLE "staging"."{staging_table}"'))
+        with engine.begin() as conn:
+            conn.execute(text(f'ANALYZE "{schema}"."{table_name}"'))
+        
+        logging.info(f"Swapped {len(df)} rows into {schema}.{table_name}.")
+        return len(df)
+    
+    except Exception as e:
+        logging.error(f"Error loading table {schema}.{table_name}: {str(e)}")
+        raise
+
+
+def _index_name(table_name: str, columns: List[str]) -> str:
+    return f"ix_{table_name}_{'_'.join(columns)}"
+
+
+LEDGER_SCHEMA: str = "meta"
+LEDGER_TABLE: str = "load_ledger"
+LOAD_CHUNK_ROWS: int = int(os.getenv("LOAD_CHUNK_ROWS", "50000"))
+# Ledger entries of loads that were never retried to completion are pruned after this long.
+LEDGER_RETENTION_DAYS: int = int(os.getenv("LOAD_LEDGER_RETENTION_DAYS", "7"))
+
+
+def ensure_load_ledger(engine: Engine) -> None:
+    """
+    Creates the load ledger, which records every committed chunk of a chunked load
+    until the load completes (see finish_load).
+    
+    Args:
+        engine (Engine): SQLAlchemy database engine
+    """
+    with engine.begin() as conn:
+        conn.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS {LEDGER_SCHEMA}.{LEDGER_TABLE} (
+                load_id TEXT NOT NULL,
+                chunk_id INTEGER NOT NULL,
+                target TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                rows INTEGER NOT NULL,
+                committed_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                PRIMARY KEY (load_id, chunk_id)
+            )
+        """))
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Fingerprints a frame's columns and rows, so a load is only resumed for the same data.
+    
+    Args:
+        df (pd.DataFrame): Data to load
+        
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256("\x1f".join(map(str, df.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def clear_load_ledger(engine: Engine, load_id: str) -> None:
+    """
+    Forgets the committed chunks of a load, so it restarts from the first chunk.
+    
+    Args:
+        engine (Engine): SQLAlchemy database engine
+        load_id (str): Load to forget
+    """
+    ensure_load_ledger(engine)
+    with engine.begin() as conn:
+        conn.execute(text(f"DELETE FROM {LEDGER_SCHEMA}.{LEDGER_TABLE} WHERE load_id = :load_id"), {"load_id": load_id})
+
+
+def finish_load(conn: Connection, load_id: str) -> None:
+    """
+    Removes the ledger entries of a completed load, and of abandoned loads past LEDGER_RETENTION_DAYS.
+    
+    Args:
+        conn (Connection): Connection of the transaction that completes the load
+        load_id (str): Completed load
+    """
+    conn.execute(text(f"""
+        DELETE FROM {LEDGER_SCHEMA}.{LEDGER_TABLE}
+        WHERE load_id = :load_id OR committed_at < now() - make_interval(days => :retention_days)
+    """), {"load_id": load_id, "retention_days": LEDGER_RETENTION_DAYS})
+
+
+def resumable_load(engine: Engine, table_name: str, schema: str, load_id: str, fingerprint: str,
+                   allow_empty: bool = False) -> bool:
+    """
+    Checks whether a table holds exactly the committed chunks of an earlier attempt of a load.
+    
+    Every ledger entry must be for the same data, and the table's row count must match
+    the rows the ledger recorded; an UNLOGGED table emptied by a server crash, or a table
+    written by anything else, fails the check.
+    
+    Args:
+        engine (Engine): SQLAlchemy database engine
+        table_name (str): Target table
+        schema (str): Schema of the target table
+        load_id (str): Load being retried
+        fingerprint (str): frame_fingerprint of the data being loaded
+        allow_empty (bool): Also resume into an empty table without ledger entries, which an
+                            attempt that created the table but committed no chunk leaves behind
+        
+    Returns:
+        bool: True when the load can continue from its first missing chunk
+    """
+    ensure_load_ledger(engine)
+    if not inspect(engine).has_table(table_name, schema=schema):
+        return False
+    with engine.connect() as conn:
+        ledger = conn.execute(text(f"""
+            SELECT count(*) AS chunks, coalesce(sum(rows), 0) AS rows,
+                   bool_and(fingerprint = :fingerprint AND target = :target) AS same_data
+            FROM {LEDGER_SCHEMA}.{LEDGER_TABLE} WHERE load_id = :load_id
+        """), {"load_id": load_id, "fingerprint": fingerprint, "target": f"{schema}.{table_name}"}).one()
+        if not (ledger.chunks or allow_empty) or (ledger.chunks and not ledger.same_data):
+            return False
+        table_rows = conn.execute(text(f'SELECT count(*) FROM "{schema}"."{table_name}"')).scalar()
+    if table_rows != ledger.rows:
+        logging.warning(f"{schema}.{table_name} has {table_rows} rows but load {load_id} committed {ledger.rows}; "
+                        "restarting the load.")
+        return False
+    return True
+
+
+def load_chunks(engine: Engine, df: pd.DataFrame, table_name: str, schema: str, load_id: str,
+                fingerprint: Optional[str] = None, chunk_rows: int = LOAD_CHUNK_ROWS) -> int:
+    """
+    Appends a frame to a table with COPY in numbered, deterministic chunks.
+    
+    Each chunk is committed in the same transaction as its row in the load ledger, so
+    after a dropped connection a retry of the same load skips the committed chunks and
+    continues from the first missing one.
+    
+    Args:
+        engine (Engine): SQLAlchemy database engine
+        df (pd.DataFrame): Data to load, in a deterministic order
+        table_name (str): Target table
+        schema (str): Schema of the target table
+        load_id (str): Identifies the load across retries
+        fingerprint (Optional[str]): frame_fingerprint of df, computed when omitted
+        chunk_rows (int): Rows per chunk
+        
+    Returns:
+        int: Number of rows written by this attempt
+    """
+    ensure_load_ledger(engine)
+    fingerprint = fingerprint or frame_fingerprint(df)
+    with engine.connect() as conn:
+        committed = {row.chunk_id for row in conn.execute(
+            text(f"SELECT chunk_id FROM {LEDGER_SCHEMA}.{LEDGER_TABLE} WHERE load_id = :load_id"),
+            {"load_id": load_id}
+        )}
+    chunks = range(0, len(df), chunk_rows)
+    if committed:
+        logging.info(f"Resuming load {load_id}: {len(committed)} of {len(chunks)} chunks already committed.")
+    
+    column_list = ", ".join(f'"{col}"' for col in df.columns)
+    written = 0
+    connection = engine.raw_connection()
+    try:
+        for chunk_id, start in enumerate(chunks):
+            if chunk_id in committed:
+                continue
+            chunk = df.iloc[start:start + chunk_rows]
+            buffer = io.StringIO()
+            chunk.to_csv(buffer, index=False, header=False, na_rep="\\N")
+            buffer.seek(0)
+            with connection.cursor() as cursor:
+                cursor.copy_expert(
+                    f'COPY "{schema}"."{table_name}" ({column_list}) FROM STDIN WITH (FORMAT csv, NULL \'\\N\')',
+                    buffer
+                )
+                cursor.execute(
+                    f"INSERT INTO {LEDGER_SCHEMA}.{LEDGER_TABLE} (load_id, chunk_id, target, fingerprint, rows) "
+                    "VALUES (%s, %s, %s, %s, %s)",
+                    (load_id, chunk_id, f"{schema}.{table_name}", fingerprint, len(chunk))
+                )
+            connection.commit()
+            written += len(chunk)
+    except Exception:
+        try:
+            connection.rollback()
+        except Exception:
+            pass
+        raise
+    finally:
+        connection.close()
+    logging.info(f"Load {load_id} wrote {written} rows to {schema}.{table_name} in chunks of {chunk_rows}.")
+    return written
+
+
+def load_data_swap(engine: Engine, df: pd.DataFrame, table_name: str, schema: str,
+                   indexes: Optional[List[List[str]]] = None, foreign_keys: Optional[Dict[str, str]] = None,
+                   after_swap: Optional[Callable[[Connection], None]] = None, load_id: Optional[str] = None) -> int:
+    """
+    Fully reloads a table through a shadow table swapped in with renames.
+    
+    The data is bulk-loaded with COPY into an UNLOGGED <table>__shadow, which is then
+    made durable with SET LOGGED before its indexes are built and it is analysed. A
+    single transaction renames the live table to <table>__previous and the shadow to
+    <table>, so readers see either the old or the new rows, never a partial load. The
+    previous version is kept for rollback_swap until the next reload.
+    
+    Views are bound to the table, not its name, so after_swap receives the swap's
+    connection to recreate them on the new table before the transaction commits.
+    
+    The shadow is written in ledgered chunks (see load_chunks); a retry of the same load
+    keeps the shadow and continues from its first missing chunk, or goes straight to the
+    swap when the shadow is complete. The swap also removes the load's ledger entries.
+    
+    Args:
+        engine (Engine): SQLAlchemy database engine
+        df (pd.DataFrame): DataFrame containing the data to load
+        table_name (str): Name of the live table
+        schema (str): Schema of the table
+        indexes (Optional[List[List[str]]]): Column lists to index
+        foreign_keys (Optional[Dict[str, str]]): Column -> referenced "schema.table.column"
+        after_swap (Optional[Callable[[Connection], None]]): Runs inside the swap transaction
+        load_id (Optional[str]): Identifies the load across retries; derived from the data when omitted
+        
+    Returns:
+        int: Number of rows loaded
+        
+    Raises:
+        Exception: If there is an error loading or swapping the table
+    """
+    shadow_table = f"{table_name}__shadow"
+    previous_table = f"{table_name}__previous"
+    indexes = [cols for cols in (indexes or []) if all(col in df.columns for col in cols)]
+    foreign_keys = foreign_keys or {}
+    logging.info(f"Reloading {schema}.{table_name} with {len(df)} rows through {schema}.{shadow_table}.")
+    
+    try:
+        fingerprint = frame_fingerprint(df)
+        load_id = load_id or f"{schema}.{table_name}:{fingerprint[:16]}"
+        if not resumable_load(engine, shadow_table, schema, load_id, fingerprint):
+            clear_load_ledger(engine, load_id)
+            with engine.begin() as conn:
+                conn.execute(text(f'DROP TABLE IF EXISTS "{schema}"."{shadow_table}"'))
+            metadata = MetaData()
+            columns = [
+                Column(name, infer_types(dtype, name, df), *([ForeignKey(foreign_keys[name])] if name in foreign_keys else []))
+                for name, dtype in df.dtypes.items()
+            ]
+            Table(shadow_table, metadata, *columns, schema=schema, prefixes=["UNLOGGED"]).create(engine)
+        
+        load_chunks(engine, df, shadow_table, schema, load_id, fingerprint)
+        
+        with engine.begin() as conn:
+            conn.execute(text(f'ALTER TABLE "{schema}"."{shadow_table}" SET LOGGED'))
+            for index_columns in indexes:
+                column_list = ", ".join(f'"{col}"' for col in index_columns)
+                # A kept shadow may already be indexed, e.g. when the swap below timed out.
+                conn.execute(text(
+                    f'CREATE INDEX IF NOT EXISTS "{_index_name(shadow_table, index_columns)}" '
+                    f'ON "{schema}"."{shadow_table}" ({column_list})'
+                ))
+        with engine.begin() as conn:
+            conn.execute(text(f'ANALYZE "{schema}"."{shadow_table}"'))
+        
+        live_exists = inspect(engine).has_table(table_name, schema=schema)
+        with engine.begin() as conn:
+            # Wait briefly for readers to finish rather than queueing them behind the swap.
+            conn.execute(text("SET LOCAL lock_timeout = '30s'"))
+            conn.execute(text(f'DROP TABLE IF EXISTS "{schema}"."{previous_table}"'))
+            if live_exists:
+                conn.execute(text(f'ALTER TABLE "{schema}"."{table_name}" RENAME TO "{previous_table}"'))
+                _rename_indexes(conn, schema, table_name, previous_table, indexes)
+            conn.execute(text(f'ALTER TABLE "{schema}"."{shadow_table}" RENAME TO "{table_name}"'))
+            _rename_indexes(conn, schema, shadow_table, table_name, indexes)
+            if after_swap is not None:
+                after_swap(conn)
+            finish_load(conn, load_id)
+        
+        logging.info(f"Swapped {len(df)} rows into {schema}.{table_name}; "
+                     f"the previous version is kept as {schema}.{previous_table}.")
+        return len(df)
+    
+    except Exception as e:
+        logging.error(f"Error reloading table {schema}.{table_name}: {str(e)}")
+        raise
+
+
+def _rename_indexes(conn: Connection, schema: str, old_table: str, new_table: str, indexes: List[List[str]]) -> None:
+    # Index names are unique per schema, so they follow their table through the swap.
+    for index_columns in indexes:
+        conn.execute(text(
+            f'ALTER INDEX IF EXISTS "{schema}"."{_index_name(old_table, index_columns)}" '
+            f'RENAME TO "{_index_name(new_table, index_columns)}"'
+        ))
+
+
+def rollback_swap(engine: Engine, table_name: str, schema: str, indexes: Optional[List[List[str]]] = None,
+                  after_swap: Optional[Callable[[Connection], None]] = None) -> None:
+    """
+    Swaps the previous version of a table reloaded by load_data_swap back into place.
+    
+    The rolled-back version becomes <table>__previous, so the rollback can itself be undone.
+    The <table>_labelled view, when there is one, is recreated on the restored table in the
+    same transaction; left bound to <table>__previous it would block the next reload's
+    DROP of that table.
+    
+    Args:
+        engine (Engine): SQLAlchemy database engine
+        table_name (str): Name of the live table
+        schema (str): Schema of the table
+        indexes (Optional[List[List[str]]]): Column lists indexed by load_data_swap
+        after_swap (Optional[Callable[[Connection], None]]): Runs inside the swap transaction, for
+                                                             other objects bound to the table
+        
+    Raises:
+        ValueError: If there is no previous version to roll back to
+    """
+    previous_table = f"{table_name}__previous"
+    parked_table = f"{table_name}__rollback"
+    indexes = indexes or []
+    if not inspect(engine).has_table(previous_table, schema=schema):
+        raise ValueError(f"No previous version of {schema}.{table_name} to roll back to")
+    with engine.begin() as conn:
+        conn.execute(text("SET LOCAL lock_timeout = '30s'"))
+        for old, new in [(table_name, parked_table), (previous_table, table_name), (parked_table, previous_table)]:
+            conn.execute(text(f'ALTER TABLE "{schema}"."{old}" RENAME TO "{new}"'))
+            _rename_indexes(conn, schema, old, new, indexes)
+        view_exists = conn.execute(text(
+            "SELECT 1 FROM information_schema.views WHERE table_schema = :schema AND table_name = :view"
+        ), {"schema": schema, "view": f"{table_name}_labelled"}).first() is not None
+        if view_exists:
+            columns = [column["name"] for column in inspect(conn).get_columns(table_name, schema=schema)]
+            replace_labelled_view(conn, table_name, schema, columns)
+        if after_swap is not None:
+            after_swap(conn)
+    logging.info(f"Rolled {schema}.{table_name} back to its previous version.")
@@ -0,0 +1,143 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from src.transform.spotify_transform import GENRE_MAPPING, DURATION_CATEGORIES, POPULARITY_CATEGORIES, MOOD_CATEGORIES
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%d/%m/%Y %I:%M:%S %p")
+
+# Dictionary-encoded columns of the merged schema. Each is stored as <column>_id, a
+# SMALLINT foreign key into dim_<column>. Seeded dimensions get ids in list order; the
+# others grow as new labels are loaded.
+DIMENSIONS: Dict[str, Optional[List[str]]] = {
+    "track_genre": list(GENRE_MAPPING),
+    "duration_category": DURATION_CATEGORIES,
+    "popularity_category": POPULARITY_CATEGORIES,
+    "track_mood": MOOD_CATEGORIES,
+    "category": None,
+}
+
+
+def dimension_table(column: str) -> str:
+    """Returns the lookup table name of a dimension column."""
+    return f"dim_{column}"
+
+
+def ensure_dimension(engine: Engine, column: str, values: List[str], schema: str) -> Dict[str, int]:
+    """
+    Creates a dimension table if needed, adds missing labels and returns the label ids.
+
+    Args:
+        engine (Engine): SQLAlchemy database engine
+        column (str): Dimension column
+        values (List[str]): Labels that must exist, in id order for new labels
+        schema (str): Schema holding the dimension table
+
+    Returns:
+        Dict[str, int]: Label -> id
+    """
+    table = f'"{schema}"."{dimension_table(column)}"'
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE TABLE IF NOT EXISTS {table} (id SMALLINT PRIMARY KEY, value TEXT NOT NULL UNIQUE)"))
+        # Serialises concurrent loads so new ids can't collide.
+        conn.execute(text(f"LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE"))
+        existing = dict(conn.execute(text(f"SELECT value, id FROM {table}")).fetchall())
+        next_id = max(existing.values(), default=0) + 1
+        new_rows = []
+        for value in dict.fromkeys(values):
+            if value not in existing:
+                existing[value] = next_id
+                new_rows.append({"id": next_id, "value": value})
+                next_id += 1
+        if new_rows:
+            conn.execute(text(f"INSERT INTO {table} (id, value) VALUES (:id, :value)"), new_rows)
+            logging.info(f"Added {len(new_rows)} labels to {schema}.{dimension_table(column)}.")
+    return existing
+
+
+def encode_foreign_keys(engine: Engine, df: pd.DataFrame, schema: str) -> Tuple[pd.DataFrame, Dict[str, str]]:
+    """
+    Replaces the dimension columns of a frame with SMALLINT ids into their lookup tables.
+
+    Args:
+        engine (Engine): SQLAlchemy database engine
+        df (pd.DataFrame): Frame holding label (or Categorical) dimension columns
+        schema (str): Schema holding the dimension tables
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, str]]: The encoded frame, and <column>_id -> referenced "schema.table.id"
+    """
+    encoded = df.copy()
+    foreign_keys = {}
+    for column, seed in DIMENSIONS.items():
+        if column not in encoded.columns:
+            continue
+        labels = encoded[column].dropna().astype(str).unique().tolist()
+        ids = ensure_dimension(engine, column, (seed or []) + sorted(labels), schema)
+        position = encoded.columns.get_loc(column)
+        id_column = encoded[column].astype(object).map(ids).astype("Int16")
+        encoded = encoded.drop(columns=[column])
+        encoded.insert(position, f"{column}_id", id_column)
+        foreign_keys[f"{column}_id"] = f"{schema}.{dimension_table(column)}.id"
+    return encoded, foreign_keys
+
+
+def labelled_view_sql(table_name: str, schema: str, columns: List[str]) -> str:
+    """
+    Returns the SELECT of <table>_labelled, which joins the dimension ids of a table back to their labels.
+
+    Args:
+        table_name (str): Table holding <column>_id foreign keys
+        schema (str): Schema of the table and dimension tables
+        columns (List[str]): Columns of the table, in order
+
+    Returns:
+        str: The view's query
+    """
+    select_list, joins = [], []
+    for col in columns:
+        dimension = col[:-3] if col.endswith("_id") else None
+        if dimension in DIMENSIONS:
+            alias = f"d_{dimension}"
+            select_list.append(f'{alias}.value AS "{dimension}"')
+            joins.append(f'LEFT JOIN "{schema}"."{dimension_table(dimension)}" {alias} ON {alias}.id = t."{col}"')
+        else:
+            select_list.append(f't."{col}"')
+    return f'SELECT {", ".join(select_list)}\nFROM "{schema}"."{table_name}" t\n' + "\n".join(joins)
+
+
+def create_labelled_view(engine: Engine, table_name: str, schema: str, columns: List[str]) -> None:
+    """
+    Creates <table>_labelled, which joins the dimension ids of a table back to their labels.
+
+    Args:
+        engine (Engine): SQLAlchemy database engine
+        table_name (str): Table holding <column>_id foreign keys
+        schema (str): Schema of the table and dimension tables
+        columns (List[str]): Columns of the table, in order
+    """
+    with engine.begin() as conn:
+        conn.execute(text(f'CREATE OR REPLACE VIEW "{schema}"."{table_name}_labelled" AS\n'
+                          + labelled_view_sql(table_name, schema, columns)))
+    logging.info(f"Created view {schema}.{table_name}_labelled.")
+
+
+def replace_labelled_view(conn: Connection, table_name: str, schema: str, columns: List[str]) -> None:
+    """
+    Recreates <table>_labelled on the current <table> within the caller's transaction.
+
+    Used after a table swap: the old view is bound to the renamed table and its columns
+    may differ from the new one's, so it is dropped rather than replaced.
+
+    Args:
+        conn (Connection): Connection with an open transaction
+        table_name (str): Table holding <column>_id foreign keys
+        schema (str): Schema of the table and dimension tables
+        columns (List[str]): Columns of the table, in order
+    """
+    conn.execute(text(f'DROP VIEW IF EXISTS "{schema}"."{table_name}_labelled"'))
+    conn.execute(text(f'CREATE VIEW "{schema}"."{table_name}_labelled" AS\n'
+                      + labelled_view_sql(table_name, schema, columns)))
@@ -0,0 +1,216 @@
+import logging
+from datetime import date
+from typing import List, Optional, Union
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%d/%m/%Y %I:%M:%S %p")
+
+SNAPSHOT_SCHEMA: str = "processed"
+SNAPSHOT_TABLE: str = "artist_follower_snapshots"
+
+
+def ensure_snapshot_table(engine: Engine) -> None:
+    """
+    Creates the follower snapshot table if it does not exist.
+
+    Args:
+        engine (Engine): SQLAlchemy database engine
+    """
+    with engine.begin() as conn:
+        conn.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS {SNAPSHOT_SCHEMA}.{SNAPSHOT_TABLE} (
+                artist_id TEXT NOT NULL,
+                snapshot_date DATE NOT NULL,
+                followers BIGINT,
+                PRIMARY KEY (artist_id, snapshot_date)
+            )
+        """))
+
+
+def record_follower_snapshots(engine: Engine, api_df: pd.DataFrame, snapshot_date: Union[str, date]) -> int:
+    """
+    Appends the follower counts of a run, writing a row only when an artist's count changed.
+
+    The count is compared with the artist's latest snapshot before snapshot_date. Rerunning
+    a date replaces that date's rows, so retries and backfills stay idempotent. Artists
+    without a follower count (a failed lookup) are skipped and keep their latest snapshot.
+
+    Args:
+        engine (Engine): SQLAlchemy database engine
+        api_df (pd.DataFrame): Spotify API data with artist_id and followers
+        snapshot_date (Union[str, date]): Date the counts were observed
+
+    Returns:
+        int: Number of snapshot rows written
+    """
+    ensure_snapshot_table(engine)
+    # A failed follower lookup leaves followers empty; that is not a change to record.
+    current = (api_df[["artist_id", "followers"]]
+               .dropna(subset=["artist_id", "followers"])
+               .drop_duplicates(subset=["artist_id"]))
+    staging_table = f"{SNAPSHOT_TABLE}_load"
+    current.to_sql(staging_table, con=engine, schema="staging", if_exists="replace", index=False)
+
+    table = f"{SNAPSHOT_SCHEMA}.{SNAPSHOT_TABLE}"
+    with engine.begin() as conn:
+        conn.execute(text(f"""
+            DELETE FROM {table} t
+            USING staging.{staging_table} s
+            WHERE t.artist_id = s.artist_id AND t.snapshot_date = :snapshot_date
+        """), {"snapshot_date": snapshot_date})
+        result = conn.execute(text(f"""
+            INSERT INTO {table} (artist_id, snapshot_date, followers)
+            SELECT s.artist_id, :snapshot_date, s.followers
+            FROM staging.{staging_table} s
+            LEFT JOIN LATERAL (
+                SELECT followers FROM {table} p
+                WHERE p.artist_id = s.artist_id AND p.snapshot_date < :snapshot_date
+                ORDER BY p.snapshot_date DESC
+                LIMIT 1
+            ) previous ON TRUE
+            WHERE previous.followers IS DISTINCT FROM s.followers
+        """), {"snapshot_date": snapshot_date})
+        written = result.rowcount
+        conn.execute(text(f"DROP TABLE staging.{staging_table}"))
+    logging.info(f"Recorded {written} changed follower counts of {len(current)} artists for {snapshot_date}.")
+    return written
+
+
+def load_follower_history(engine: Engine, artist_ids: Optional[List[str]] = None,
+                          until: Optional[Union[str, date]] = None) -> pd.DataFrame:
+    """
+    Reads follower snapshots, optionally restricted to some artists and dates.
+
+    Args:
+        engine (Engine): SQLAlchemy database engine
+        artist_ids (Optional[List[str]]): Artists to read, all when omitted
+        until (Optional[Union[str, date]]): Last snapshot date to read
+
+    Returns:
+        pd.DataFrame: artist_id, snapshot_date, followers
+    """
+    ensure_snapshot_table(engine)
+    conditions, params = [], {}
+    if artist_ids is not None:
+        conditions.append("artist_id = ANY(:artist_ids)")
+        params["artist_ids"] = list(artist_ids)
+    if until is not None:
+        conditions.append("snapshot_date <= :until")
+        params["until"] = until
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    history = pd.read_sql(
+        text(f"SELECT artist_id, snapshot_date, followers FROM {SNAPSHOT_SCHEMA}.{SNAPSHOT_TABLE} {where}"),
+        con=engine, params=params
+    )
+    history["snapshot_date"] = pd.to_datetime(history["snapshot_date"])
+    return history
+
+
+def followers_as_of(df: pd.DataFrame, history: pd.DataFrame, as_of: Union[str, date, pd.Timestamp, None] = None,
+                    date_column: Optional[str] = None) -> pd.DataFrame:
+    """
+    Replaces the followers column with the count valid at a date, in one as-of join.
+
+    Each row gets the latest snapshot of its artist_id on or before its date: either a
+    single as_of date for every row, or a per-row date_column. Rows without a snapshot
+    get a null count.
+
+    Args:
+        df (pd.DataFrame): Frame with an artist_id column
+        history (pd.DataFrame): Snapshots from load_follower_history
+        as_of (Union[str, date, pd.Timestamp, None]): Date for every row
+        date_column (Optional[str]): Column holding each row's date, used when as_of is omitted
+
+    Returns:
+        pd.DataFrame: Copy of df with followers as of the requested dates, in the original row order
+    """
+    if as_of is None and date_column is None:
+        raise ValueError("Either as_of or date_column is required")
+    left = df.drop(columns=["followers"], errors="ignore").copy()
+    left["_row"] = range(len(left))
+    left["_as_of"] = pd.Timestamp(as_of) if as_of is not None else pd.to_datetime(left[date_column])
+    known = left[left["artist_id"].notna()].sort_values("_as_of", kind="mergesort")
+    right = (history.dropna(subset=["artist_id"])
+             .sort_values("snapshot_date", kind="mergesort")[["artist_id", "snapshot_date", "followers"]])
+    joined = pd.merge_asof(known, right, left_on="_as_of", right_on="snapshot_date", by="artist_id",
+                           direction="backward")
+    result = pd.concat([joined, left[left["artist_id"].isna()]], ignore_index=True)
+    result = result.sort_values("_row").drop(columns=["_row", "_as_of", "snapshot_date"], errors="ignore")
+    return result.reset_index(drop=True)
+
+
+REFRESH_TABLE: str = "artist_refresh_state"
+
+
+def ensure_refresh_table(engine: Engine) -> None:
+    """
+    Creates the follower refresh state table if it does not exist.
+
+    Args:
+        engine (Engine): SQLAlchemy database engine
+    """
+    with engine.begin() as conn:
+        conn.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS {SNAPSHOT_SCHEMA}.{REFRESH_TABLE} (
+                artist_name TEXT PRIMARY KEY,
+                artist_id TEXT,
+                followers BIGINT,
+                refreshed_at DATE NOT NULL
+            )
+        """))
+
+
+def load_refresh_state(engine: Engine) -> pd.DataFrame:
+    """
+    Reads the last refresh of every artist credit.
+
+    Args:
+        engine (Engine): SQLAlchemy database engine
+
+    Returns:
+        pd.DataFrame: artist_name, artist_id, followers, refreshed_at
+    """
+    ensure_refresh_table(engine)
+    state = pd.read_sql(
+        text(f"SELECT artist_name, artist_id, followers, refreshed_at FROM {SNAPSHOT_SCHEMA}.{REFRESH_TABLE}"),
+        con=engine
+    )
+    state["refreshed_at"] = pd.to_datetime(state["refreshed_at"])
+    return state
+
+
+def save_refresh_state(engine: Engine, api_df: pd.DataFrame, refreshed_at: Union[str, date]) -> int:
+    """
+    Upserts the artist credits refreshed by a run.
+
+    Credits Spotify didn't find are stored too, with a null artist_id, so they age like
+    any other entry instead of being searched again on every run.
+
+    Args:
+        engine (Engine): SQLAlchemy database engine
+        api_df (pd.DataFrame): Refreshed Spotify API data (artist_name, artist_id, followers)
+        refreshed_at (Union[str, date]): Date of the refresh
+
+    Returns:
+        int: Number of credits upserted
+    """
+    ensure_refresh_table(engine)
+    refreshed = api_df[["artist_name", "artist_id", "followers"]].drop_duplicates(subset=["artist_name"])
+    # A found artist whose follower lookup failed keeps its last state and is retried next run.
+    refreshed = refreshed[refreshed["artist_id"].isna() | refreshed["followers"].notna()]
+    staging_table = f"{REFRESH_TABLE}_load"
+    refreshed.to_sql(staging_table, con=engine, schema="staging", if_exists="replace", index=False)
+
+    with engine.begin() as conn:
+        conn.execute(text(f"""
+            INSERT INTO {SNAPSHOT_SCHEMA}.{REFRESH_TABLE} (artist_name, artist_id, followers, refreshed_at)
+            SELECT artist_name, artist_id, followers, :refreshed_at FROM staging.{staging_table}
+            ON CONFLICT (artist_name) DO UPDATE
+            SET artist_id = EXCLUDED.artist_id, followers = EXCLUDED.followers, refreshed_at = EXCLUDED.refreshed_at
+        """), {"refreshed_at": refreshed_at})
+        conn.execute(text(f"DROP TABLE staging.{staging_table}"))
+    logging.info(f"Saved the refresh state of {len(refreshed)} artist credits for {refreshed_at}.")
+    return len(refreshed)
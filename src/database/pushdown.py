@@ -0,0 +1,103 @@
+import logging
+from typing import Any, Dict, List, Tuple
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%d/%m/%Y %I:%M:%S %p")
+
+# Supported declarative steps, applied in order:
+#   {"op": "rename",  "columns": {old: new}}
+#   {"op": "drop",    "columns": [name, ...]}         (columns already absent are ignored)
+#   {"op": "dropna",  "subset": [name, ...]}
+#   {"op": "exclude", "column": name, "values": [...], "where_null": [name, ...]}
+#   {"op": "fill",    "column": name, "value_from": name, "where_null": [name, ...]}
+#   {"op": "between", "column": name, "min": value, "max": value}   (either bound may be None)
+#   {"op": "include", "column": name, "values": [...]}
+# Filters and fills always see the current expression of a column, so a step behaves
+# exactly as its pandas counterpart would at the same position in the pipeline.
+
+
+def quote_identifier(name: str) -> str:
+    """
+    Quotes a PostgreSQL identifier.
+
+    Args:
+        name (str): Column, table or schema name
+
+    Returns:
+        str: The double-quoted identifier
+    """
+    return '"' + name.replace('"', '""') + '"'
+
+
+def compile_select(schema: str, table: str, columns: List[str], steps: List[Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
+    """
+    Compiles declarative cleaning steps into a single SELECT statement.
+
+    Args:
+        schema (str): Source schema
+        table (str): Source table
+        columns (List[str]): Source columns, in table order
+        steps (List[Dict[str, Any]]): Cleaning steps (see module comment)
+
+    Returns:
+        Tuple[str, Dict[str, Any]]: SQL with named bind parameters, and the parameters
+
+    Raises:
+        KeyError: If a step references a column that is not available at that point
+        ValueError: If a step has an unknown op
+    """
+    projection: Dict[str, str] = {name: quote_identifier(name) for name in columns}
+    conditions: List[str] = []
+    params: Dict[str, Any] = {}
+
+    def expr(name: str) -> str:
+        if name not in projection:
+            raise KeyError(f"Pushdown step references unknown column '{name}'")
+        return projection[name]
+
+    def all_null(names: List[str]) -> str:
+        return " AND ".join(f"{expr(name)} IS NULL" for name in names)
+
+    def bind(value: Any) -> str:
+        key = f"p{len(params)}"
+        params[key] = value
+        return f":{key}"
+
+    for step in steps:
+        op = step["op"]
+        if op == "rename":
+            projection = {step["columns"].get(name, name): sql for name, sql in projection.items()}
+        elif op == "drop":
+            # Columns may already be projected away by the column contracts.
+            projection = {name: sql for name, sql in projection.items() if name not in step["columns"]}
+        elif op == "dropna":
+            conditions.extend(f"{expr(name)} IS NOT NULL" for name in step["subset"])
+        elif op == "exclude":
+            placeholders = [bind(value) for value in step["values"]]
+            # COALESCE keeps NULLs out of the IN, matching pandas' isin() which is False for NaN.
+            condition = f"COALESCE({expr(step['column'])} IN ({', '.join(placeholders)}), FALSE)"
+            if step.get("where_null"):
+                condition = f"{all_null(step['where_null'])} AND {condition}"
+            conditions.append(f"NOT ({condition})")
+        elif op == "fill":
+            when = all_null(step["where_null"]) if step.get("where_null") else f"{expr(step['column'])} IS NULL"
+            projection[step["column"]] = f"CASE WHEN {when} THEN {expr(step['value_from'])} ELSE {expr(step['column'])} END"
+        elif op == "between":
+            # Plain comparisons on the source column so PostgreSQL can use an index on it.
+            if step.get("min") is not None:
+                conditions.append(f"{expr(step['column'])} >= {bind(step['min'])}")
+            if step.get("max") is not None:
+                conditions.append(f"{expr(step['column'])} <= {bind(step['max'])}")
+        elif op == "include":
+            placeholders = [bind(value) for value in step["values"]]
+            conditions.append(f"{expr(step['column'])} IN ({', '.join(placeholders)})" if placeholders else "FALSE")
+        else:
+            raise ValueError(f"Unknown pushdown op '{op}'")
+
+    select_list = ",\n    ".join(
+        sql if sql == quote_identifier(name) else f"{sql} AS {quote_identifier(name)}"
+        for name, sql in projection.items()
+    )
+    sql = f"SELECT\n    {select_list}\nFROM {quote_identifier(schema)}.{quote_identifier(table)}"
+    if conditions:
+        sql += "\nWHERE " + "\n  AND ".join(f"({condition})" for condition in conditions)
+    return sql, params
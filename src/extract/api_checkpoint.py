@@ -0,0 +1,107 @@
+import os
+import re
+import json
+import hashlib
+import logging
+from typing import Dict, Iterable, Optional
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%d/%m/%Y %I:%M:%S %p")
+
+CHECKPOINT_DIR: str = os.getenv("SPOTIFY_CHECKPOINT_DIR", "/opt/airflow/data/cache/checkpoints/extract_spotify_api")
+# Searches between two checkpoints; follower batches are checkpointed one by one.
+CHECKPOINT_EVERY: int = int(os.getenv("SPOTIFY_CHECKPOINT_EVERY", "50"))
+
+
+def checkpoint_path(run_id: str, checkpoint_dir: str = CHECKPOINT_DIR) -> str:
+    """
+    Returns the checkpoint file of a DAG run.
+
+    Args:
+        run_id (str): Airflow run id, e.g. "scheduled__2025-04-09T00:00:00+00:00"
+        checkpoint_dir (str): Directory holding the checkpoints
+
+    Returns:
+        str: Path of the run's checkpoint file
+    """
+    return os.path.join(checkpoint_dir, re.sub(r"[^A-Za-z0-9_.-]", "_", run_id) + ".json")
+
+
+def worklist_digest(artist_names: Iterable[str], known_ids: Optional[Dict[str, str]] = None) -> str:
+    """
+    Fingerprints an extraction's inputs, so a checkpoint is only resumed for the same worklist.
+
+    Args:
+        artist_names (Iterable[str]): Artist credits to extract
+        known_ids (Optional[Dict[str, str]]): Credits with an already known Spotify id
+
+    Returns:
+        str: Hex digest
+    """
+    payload = json.dumps([list(artist_names), sorted((known_ids or {}).items())], default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ExtractionCheckpoint:
+    """
+    Durable progress of one Spotify API extraction: search results per canonical key,
+    follower counts per Spotify id, and the ids whose batch lookup completed.
+
+    The file is replaced atomically and fsynced, so a crash leaves either the previous
+    or the new checkpoint. A retry resumes from it and, since searches and batches are
+    deterministic in the worklist, produces the same output as an uninterrupted run.
+    """
+
+    def __init__(self, path: str, digest: str):
+        self.path = path
+        self.digest = digest
+        self.found: Dict[str, Optional[Dict]] = {}
+        self.followers: Dict[str, int] = {}
+        self.looked_up: set = set()
+        self._unsaved = 0
+
+    @classmethod
+    def load(cls, path: str, digest: str) -> "ExtractionCheckpoint":
+        checkpoint = cls(path, digest)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return checkpoint
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+            return checkpoint
+        if state.get("digest") != digest:
+            logging.warning(f"Ignoring checkpoint {path}: it was written for a different worklist.")
+            return checkpoint
+        checkpoint.found = state["found"]
+        checkpoint.followers = state["followers"]
+        checkpoint.looked_up = set(state["looked_up"])
+        logging.info(f"Resuming from {path}: {len(checkpoint.found)} searches and "
+                     f"{len(checkpoint.looked_up)} follower lookups already done.")
+        return checkpoint
+
+    def searched(self) -> None:
+        """Counts a completed search and checkpoints every CHECKPOINT_EVERY searches."""
+        self._unsaved += 1
+        if self._unsaved >= CHECKPOINT_EVERY:
+            self.save()
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"digest": self.digest, "found": self.found, "followers": self.followers,
+                       "looked_up": sorted(self.looked_up)}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._unsaved = 0
+
+    def clear(self) -> None:
+        """Removes the checkpoint once the extraction's output is saved."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
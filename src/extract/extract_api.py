@@ -5,6 +5,9 @@ from spotipy.oauth2 import SpotifyClientCredentials
 from dotenv import load_dotenv
 import os
 import time
+from src.transform.artist_names import canonicalise_artist_names, pending_queries, resolve_candidates
+from src.extract.spotify_replay import RecordingClient
+from src.extract.api_checkpoint import ExtractionCheckpoint, worklist_digest
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -14,81 +17,174 @@ load_dotenv("/opt/airflow/.env")
 SPOTIFY_CLIENT_ID = os.getenv("SPOTIFY_CLIENT_ID")
 SPOTIFY_CLIENT_SECRET = os.getenv("SPOTIFY_CLIENT_SECRET")
 
+SPOTIFY_API_BASE_URL = os.getenv("SPOTIFY_API_BASE_URL")
+SPOTIFY_RECORDINGS_MODE = os.getenv("SPOTIFY_RECORDINGS_MODE", "off")
+ARTISTS_OUTPUT_PATH = "/opt/airflow/data/spotify_artists_followers.csv"
+
+def create_spotify_client():
+    """
+    Create the Spotify client used by the extraction.
+
+    With SPOTIFY_API_BASE_URL set, the client talks to that base URL (e.g. the replay
+    server in spotify_replay) with a dummy token instead of authenticating. With
+    SPOTIFY_RECORDINGS_MODE=record, responses are recorded to SPOTIFY_RECORDINGS_PATH.
+
+    Returns:
+        The spotipy client, or a RecordingClient wrapping it.
+    """
+    if SPOTIFY_API_BASE_URL:
+        client = spotipy.Spotify(auth="replay")
+        client.prefix = SPOTIFY_API_BASE_URL.rstrip("/") + "/"
+        logger.info(f"Using Spotify API at {client.prefix}")
+    else:
+        client = spotipy.Spotify(auth_manager=SpotifyClientCredentials(
+            client_id=SPOTIFY_CLIENT_ID,
+            client_secret=SPOTIFY_CLIENT_SECRET
+        ))
+        logger.info("Spotify API authentication successful")
+
+    if SPOTIFY_RECORDINGS_MODE == "record":
+        logger.info("Recording Spotify API responses")
+        return RecordingClient(client)
+    return client
+
 try:
-    sp = spotipy.Spotify(auth_manager=SpotifyClientCredentials(
-        client_id=SPOTIFY_CLIENT_ID,
-        client_secret=SPOTIFY_CLIENT_SECRET
-    ))
-    logger.info("Spotify API authentication successful")
+    sp = create_spotify_client()
 except Exception as e:
     logger.error(f"Failed to authenticate with Spotify API: {e}")
     raise
 
-def extract_spotify_api_data(artist_names):
+def extract_spotify_api_data(artist_names, output_path=ARTISTS_OUTPUT_PATH, known_ids=None, checkpoint_path=None,
+                             final_attempt=False):
     """
     Extract artist data (name and followers) from Spotify API for a list of artists, and save to the data folder.
     
+    The raw credits are canonicalised first (collaborations split, case, whitespace and
+    diacritics folded, non-artists dropped) so each distinct artist is searched only once.
+    Results are mapped back to every original credit. Credits with a known Spotify id
+    skip the search and only take part in the batched follower lookup.
+    
     Args:
         artist_names (list): List of artist names to search for.
-    
+        output_path (str): CSV file the artist data is saved to.
+        known_ids (dict, optional): Artist name -> Spotify id resolved by an earlier run.
+        checkpoint_path (str, optional): File to checkpoint progress to and resume from;
+            removed once the output is saved. Only completed searches and follower batches
+            are checkpointed: when a search or batch failed, the checkpoint is kept and a
+            RuntimeError is raised once the rest is done, so the task's retry redoes just those.
+        final_attempt (bool, optional): No retry follows; failed searches and batches are
+            logged and kept as misses instead of raising.
+
     Returns:
-        pd.DataFrame: DataFrame containing artist data (name and followers).
+        pd.DataFrame: DataFrame containing artist data (name, Spotify id and followers), one row per original name.
     """
     logger.info(f"Extracting Spotify artist data for {len(artist_names)} artists")
-    artists_data = []
-    artist_ids = []
-    artist_name_mapping = {}
+    known_ids = {name: artist_id for name, artist_id in (known_ids or {}).items() if artist_id}
+    canonical = canonicalise_artist_names(name for name in artist_names if name not in known_ids)
+    checkpoint = None
+    if checkpoint_path:
+        checkpoint = ExtractionCheckpoint.load(checkpoint_path, worklist_digest(artist_names, known_ids))
     
-    for idx, artist_name in enumerate(artist_names):
-        try:
-            logger.info(f"Searching for artist {idx + 1}/{len(artist_names)}: {artist_name}")
-            artist_results = sp.search(q=f"artist:{artist_name}", type="artist", limit=1)
-            if not artist_results or not artist_results["artists"]["items"]:
-                logger.warning(f"No artist found for: {artist_name}")
-                artists_data.append({"artist_name": artist_name, "followers": None})
-                continue
-            
-            artist = artist_results["artists"]["items"][0]
-            artist_ids.append(artist["id"])
-            artist_name_mapping[artist["id"]] = artist["name"]
+    found = checkpoint.found if checkpoint else {}
+    # Searches that raised (token expiry, timeouts) count as misses for this attempt only.
+    failed_searches = set()
+    searched = 0
+    pending = pending_queries(canonical, found)
+    while pending:
+        for key in pending:
+            query = canonical["display"][key]
+            searched += 1
+            try:
+                logger.info(f"Searching for artist {searched}: {query}")
+                artist_results = sp.search(q=f"artist:{query}", type="artist", limit=1)
+                if not artist_results or not artist_results["artists"]["items"]:
+                    logger.warning(f"No artist found for: {query}")
+                    found[key] = None
+                else:
+                    artist = artist_results["artists"]["items"][0]
+                    found[key] = {"id": artist["id"], "name": artist["name"]}
+                    time.sleep(0.05)
             
-            time.sleep(0.05)
-        
-        except Exception as e:
-            logger.error(f"Error searching for artist {artist_name}: {e}")
-            artists_data.append({"artist_name": artist_name, "followers": None})
-            continue
+            except Exception as e:
+                logger.error(f"Error searching for artist {query}: {e}")
+                failed_searches.add(key)
+                continue
+            if checkpoint:
+                checkpoint.searched()
+        pending = pending_queries(canonical, {**dict.fromkeys(failed_searches), **found})
+    if checkpoint:
+        checkpoint.save()
+    
+    distinct_names = len(canonical["candidates"])
+    # Searches an uncanonicalised run would issue: every candidate of every credit.
+    candidate_queries = sum(len(candidates) for candidates in canonical["candidates"].values())
+    logger.info(f"Searched {searched} artists for {distinct_names} distinct credits; "
+                f"{candidate_queries - searched} API calls saved by canonicalisation")
     
+    artist_ids = list(dict.fromkeys(
+        [hit["id"] for hit in found.values() if hit is not None] +
+        [known_ids[name] for name in artist_names if name in known_ids]
+    ))
+    followers_by_id = checkpoint.followers if checkpoint else {}
+    failed_batches = 0
     batch_size = 50
     for i in range(0, len(artist_ids), batch_size):
         batch_ids = artist_ids[i:i + batch_size]
+        if checkpoint and checkpoint.looked_up.issuperset(batch_ids):
+            continue
         try:
             logger.info(f"Fetching details for artist batch {i // batch_size + 1}/{(len(artist_ids) // batch_size) + 1}")
             artists_batch = sp.artists(batch_ids)
             for artist in artists_batch["artists"]:
-                artist_data = {
-                    "artist_name": artist_name_mapping[artist["id"]],
-                    "followers": artist["followers"]["total"]
-                }
-                artists_data.append(artist_data)
+                if artist:
+                    followers_by_id[artist["id"]] = artist["followers"]["total"]
             
             time.sleep(0.05)
         
         except Exception as e:
             logger.error(f"Error fetching artist batch: {e}")
-            for artist_id in batch_ids:
-                artists_data.append({"artist_name": artist_name_mapping.get(artist_id, "Unknown"), "followers": None})
+            failed_batches += 1
             continue
+        
+        if checkpoint:
+            checkpoint.looked_up.update(batch_ids)
+            checkpoint.save()
+    
+    if checkpoint and (failed_searches or failed_batches):
+        if not final_attempt:
+            checkpoint.save()
+            raise RuntimeError(f"{len(failed_searches)} artist searches and {failed_batches} follower batches failed; "
+                               f"a retry resumes from {checkpoint.path} and redoes only those")
+        logger.warning(f"{len(failed_searches)} artist searches and {failed_batches} follower batches failed on the "
+                       "final attempt; their artists are saved without followers")
+    
+    artists_data = []
+    for artist_name in dict.fromkeys(artist_names):
+        if artist_name in known_ids:
+            artist_id = known_ids[artist_name]
+        else:
+            hit = resolve_candidates(canonical["candidates"][artist_name], found)
+            artist_id = hit["id"] if hit is not None else None
+        artists_data.append({
+            "artist_name": artist_name,
+            "artist_id": artist_id,
+            "followers": followers_by_id.get(artist_id) if artist_id is not None else None
+        })
     
     artist_df = pd.DataFrame(artists_data)
     logger.info(f"Extracted data for {len(artist_df)} artists from Spotify API")
     logger.info(f"Spotify artist sample data:\n{artist_df.head(2).to_string()}")
 
-    data_dir = "/opt/airflow/data"
-    os.makedirs(data_dir, exist_ok=True)
-    
-    artist_file_path = os.path.join(data_dir, "spotify_artists_followers.csv")
-    artist_df.to_csv(artist_file_path, index=False)
-    logger.info(f"Saved artist data to {artist_file_path}")
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    artist_df.to_csv(output_path, index=False)
+    logger.info(f"Saved artist data to {output_path}")
+
+    if isinstance(sp, RecordingClient):
+        sp.save()
+    if checkpoint:
+        checkpoint.clear()
 
-    return artist_df
\ No newline at end of file
+    return artist_df
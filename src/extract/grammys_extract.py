@@ -5,6 +5,10 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..
 sys.path.append(project_root)
 
 from src.database.db_operations import create_gcp_engine, dispose_engine
+from src.database.pushdown import compile_select
+from src.transform.grammys_transform import GRAMMYS_PUSHDOWN_STEPS
+from src.pipeline.contracts import source_projection
+from sqlalchemy import inspect, text
 import pandas as pd
 import logging
 
@@ -14,10 +18,51 @@ logging.basicConfig(
     datefmt="%d/%m/%Y %I:%M:%S %p"
 )
 
-def extract_grammys_data():
+PUSHDOWN_STEPS = {
+    'grammy_awards': GRAMMYS_PUSHDOWN_STEPS
+}
+
+# Keys and indexes of raw.grammy_awards. award_id is the row number in the source CSV.
+GRAMMYS_RAW_PRIMARY_KEY = 'award_id'
+GRAMMYS_RAW_INDEXES = [['year', 'category'], ['category']]
+
+def grammys_filter_steps(year_from=None, year_to=None, categories=None):
+    """
+    Build pushdown steps restricting raw.grammy_awards to a year range and/or categories.
+
+    The steps compare the raw 'year' and 'category' columns directly so the
+    (year, category) and (category) indexes can serve the query.
+
+    Args:
+        year_from (int, optional): First year to include.
+        year_to (int, optional): Last year to include.
+        categories (list, optional): Categories to include.
+
+    Returns:
+        list: Pushdown steps, empty when no filter is given.
+    """
+    steps = []
+    if year_from is not None or year_to is not None:
+        steps.append({"op": "between", "column": "year", "min": year_from, "max": year_to})
+    if categories:
+        steps.append({"op": "include", "column": "category", "values": list(categories)})
+    return steps
+
+def extract_grammys_data(pushdown=True, year_from=None, year_to=None, categories=None):
     """
     Extract data from the raw schema of the database and return it as a dictionary of DataFrames.
 
+    Only the columns required by the stage contracts are selected. With pushdown enabled,
+    the declarative cleaning steps of each table are compiled into the same SELECT so
+    PostgreSQL returns rows that are already filtered and renamed. Year and category
+    filters are always pushed down and applied before the cleaning steps.
+
+    Args:
+        pushdown (bool): Whether to push the cleaning steps down into the query.
+        year_from (int, optional): First Grammy year to extract.
+        year_to (int, optional): Last Grammy year to extract.
+        categories (list, optional): Grammy categories to extract.
+
     Returns:
         dict: A dictionary where keys are table names and values are the corresponding DataFrames.
     """
@@ -35,7 +80,16 @@ def extract_grammys_data():
         for table in tables:
             try:
                 logging.info(f"Extracting data from raw.{table} table.")
-                df = pd.read_sql(f"SELECT * FROM raw.{table}", con=engine)
+                table_columns = [col["name"] for col in inspect(engine).get_columns(table, schema="raw")]
+                columns = source_projection(table)
+                missing_columns = [col for col in columns if col not in table_columns]
+                if missing_columns:
+                    raise ValueError(f"Column contract broken: raw.{table} is missing {missing_columns}")
+                steps = grammys_filter_steps(year_from, year_to, categories) if table == 'grammy_awards' else []
+                steps += PUSHDOWN_STEPS.get(table, []) if pushdown else []
+                query, params = compile_select("raw", table, columns, steps)
+                logging.info(f"Extracting with query:\n{query}")
+                df = pd.read_sql(text(query), con=engine, params=params)
                 dataframes[table] = df
                 logging.info(f"Successfully extracted {len(df)} rows from raw.{table} table.")
             except Exception as e:
@@ -0,0 +1,152 @@
+import os
+import json
+import glob
+import hashlib
+import logging
+from typing import List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%d/%m/%Y %I:%M:%S %p")
+
+PARSED_CACHE_DIR: str = os.getenv("PARSED_CACHE_DIR", "/opt/airflow/data/cache")
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Computes the SHA-256 of a file without loading it into memory.
+
+    Args:
+        path (str): File to hash
+        chunk_size (int): Read size in bytes
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _check_columns(usecols: List[str], available: List[str]) -> None:
+    missing = [col for col in usecols if col not in available]
+    if missing:
+        raise ValueError(f"Usecols do not match columns, columns expected but not found: {missing}")
+
+
+def _meta_path(path: str, cache_dir: str) -> str:
+    return os.path.join(cache_dir, f"{os.path.basename(path)}.meta.json")
+
+
+def _load_meta(meta_path: str) -> Optional[dict]:
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(meta_path: str, meta: dict) -> None:
+    tmp_path = f"{meta_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+
+
+def cached_arrow_path(path: str, cache_dir: str = PARSED_CACHE_DIR) -> Optional[str]:
+    """
+    Returns the Arrow copy of a CSV if it is still valid, refreshing the stat key on a
+    content-identical touch.
+
+    The cache is keyed by size and mtime; when those change the content hash decides
+    whether the parsed copy can be reused.
+
+    Args:
+        path (str): Source CSV
+        cache_dir (str): Directory holding the parsed copies
+
+    Returns:
+        Optional[str]: Path of the valid Arrow IPC file, or None when it must be rebuilt
+    """
+    meta_path = _meta_path(path, cache_dir)
+    meta = _load_meta(meta_path)
+    if not meta or not os.path.exists(meta.get("arrow_path", "")):
+        return None
+
+    stat = os.stat(path)
+    if meta["size"] == stat.st_size and meta["mtime_ns"] == stat.st_mtime_ns:
+        return meta["arrow_path"]
+    if meta["size"] == stat.st_size and meta["sha256"] == file_digest(path):
+        meta["mtime_ns"] = stat.st_mtime_ns
+        _write_meta(meta_path, meta)
+        return meta["arrow_path"]
+    return None
+
+
+def read_csv_cached(path: str, usecols: Optional[List[str]] = None, cache_dir: str = PARSED_CACHE_DIR) -> pd.DataFrame:
+    """
+    Reads a CSV through a parsed Arrow IPC cache.
+
+    The first read parses the CSV and writes every column to an Arrow IPC file; later
+    reads memory-map that file and only materialise the requested columns. The copy is
+    rebuilt automatically when the CSV's content changes. Falls back to pd.read_csv
+    when pyarrow is not installed or the cache can't be written.
+
+    Args:
+        path (str): Source CSV
+        usecols (Optional[List[str]]): Columns to return, all when omitted
+        cache_dir (str): Directory holding the parsed copies
+
+    Returns:
+        pd.DataFrame: The parsed data
+    """
+    if pa is None:
+        logging.info("pyarrow is not installed; parsing CSV without cache.")
+        return pd.read_csv(path, usecols=usecols)
+
+    arrow_path = cached_arrow_path(path, cache_dir)
+    if arrow_path is not None:
+        logging.info(f"Reading parsed copy {arrow_path} (memory-mapped).")
+        table = pa.ipc.open_file(pa.memory_map(arrow_path, "r")).read_all()
+        if usecols is not None:
+            _check_columns(usecols, table.column_names)
+            table = table.select(list(usecols))
+        return table.to_pandas()
+
+    df = pd.read_csv(path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        stat = os.stat(path)
+        digest = file_digest(path)
+        stem = os.path.basename(path)
+        new_arrow_path = os.path.join(cache_dir, f"{stem}.{digest[:16]}.arrow")
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        tmp_path = f"{new_arrow_path}.tmp"
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, new_arrow_path)
+        for stale in glob.glob(os.path.join(cache_dir, f"{glob.escape(stem)}.*.arrow")):
+            if stale != new_arrow_path:
+                os.remove(stale)
+        _write_meta(_meta_path(path, cache_dir), {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": digest,
+            "arrow_path": new_arrow_path,
+        })
+        logging.info(f"Wrote parsed copy of {path} to {new_arrow_path}.")
+    except (OSError, pa.ArrowException) as e:
+        logging.warning(f"Could not write parsed cache for {path}: {e}")
+
+    if usecols is None:
+        return df
+    _check_columns(usecols, list(df.columns))
+    return df[list(usecols)]
@@ -0,0 +1,244 @@
+"""
+Priority-based refresh of Spotify follower counts under a per-run API call budget.
+
+Every artist credit gets a priority from how recently it was nominated, whether it
+ever won, its Spotify popularity and how much its follower count has moved in the
+snapshot history. The value of refreshing it is that priority times the days since
+its last refresh, so a current winner checked yesterday and a 1960s nominee left
+alone for months can both come up. The highest-value credits are refreshed first
+until the budget is spent, and the rest keep their last known count.
+
+A credit never refreshed before costs a search per candidate name it may be searched
+under (a collaboration's group, then its first member); one already resolved to a
+Spotify id only takes a slot in a batched lookup of 50 ids. Both are upper bounds, so
+a plan within the budget never spends more than the budget.
+"""
+import os
+import logging
+from typing import Dict, List, Optional, Union
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from src.transform.artist_names import canonicalise_artist_names
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%d/%m/%Y %I:%M:%S %p")
+
+# Spotify API calls one run may spend on follower refreshes; 0 refreshes every credit.
+REFRESH_CALL_BUDGET: int = int(os.getenv("SPOTIFY_REFRESH_CALL_BUDGET", "0"))
+ARTISTS_BATCH_SIZE: int = 50
+NOMINATION_HALF_LIFE_YEARS: float = 5.0
+STALENESS_PERCENTILES: List[float] = [0.5, 0.9, 0.99]
+
+# Weight of each priority feature; every feature is scaled to [0, 1].
+PRIORITY_WEIGHTS: Dict[str, float] = {
+    "recency": 0.35,
+    "won": 0.2,
+    "popularity": 0.25,
+    "volatility": 0.2,
+}
+# Keeps featureless credits from never being refreshed at all.
+PRIORITY_FLOOR: float = 0.05
+
+
+def _artist_key(names: pd.Series) -> pd.Series:
+    return names.astype(str).str.lower().str.strip()
+
+
+def artist_activity(grammys_df: pd.DataFrame, artist_col: str = "artist") -> pd.DataFrame:
+    """
+    Summarises the Grammy history of every artist credit.
+
+    Args:
+        grammys_df (pd.DataFrame): Extracted Grammy Awards data with year and is_winner
+                                   (winner when the cleaning steps were not pushed down)
+        artist_col (str): Column holding the artist credit
+
+    Returns:
+        pd.DataFrame: artist_name, last_nominated (year), wins
+    """
+    winner_col = "is_winner" if "is_winner" in grammys_df.columns else "winner"
+    df = grammys_df[[artist_col, "year", winner_col]].dropna(subset=[artist_col])
+    won = df[winner_col].astype(str).str.lower().isin(["true", "1"])
+    return (df.assign(won=won.astype(int))
+            .groupby(artist_col, sort=False)
+            .agg(last_nominated=("year", "max"), wins=("won", "sum"))
+            .reset_index()
+            .rename(columns={artist_col: "artist_name"}))
+
+
+def artist_popularity(spotify_df: pd.DataFrame) -> Dict[str, int]:
+    """
+    Returns the highest track popularity of each Spotify artist credit.
+
+    Args:
+        spotify_df (pd.DataFrame): Extracted Spotify dataset with artists and popularity
+
+    Returns:
+        Dict[str, int]: Lower-cased artist credit -> popularity (0-100)
+    """
+    df = spotify_df[["artists", "popularity"]].dropna()
+    popularity = df.groupby(_artist_key(df["artists"]), sort=False)["popularity"].max()
+    return {key: int(value) for key, value in popularity.items()}
+
+
+def follower_volatility(history: pd.DataFrame) -> pd.Series:
+    """
+    Measures how fast each artist's follower count moves.
+
+    The volatility is the mean absolute change of log followers per day between
+    consecutive snapshots, so gaps between delta-only snapshots are accounted for.
+
+    Args:
+        history (pd.DataFrame): Snapshots from load_follower_history
+
+    Returns:
+        pd.Series: Volatility indexed by artist_id; artists with a single snapshot are left out
+    """
+    df = history.dropna(subset=["artist_id", "followers"]).sort_values(["artist_id", "snapshot_date"], kind="mergesort")
+    log_followers = np.log1p(df["followers"].astype(float))
+    grouped = df["artist_id"]
+    change = log_followers.groupby(grouped).diff().abs()
+    days = df["snapshot_date"].groupby(grouped).diff().dt.days
+    rate = (change / days.where(days > 0)).dropna()
+    return rate.groupby(grouped.loc[rate.index]).mean()
+
+
+def score_artists(artist_names: List[str], state: pd.DataFrame, activity: pd.DataFrame,
+                  popularity: Dict[str, int], volatility: pd.Series,
+                  as_of: Union[str, date, pd.Timestamp]) -> pd.DataFrame:
+    """
+    Scores every artist credit of a run for refreshing.
+
+    Args:
+        artist_names (List[str]): Artist credits of the run
+        state (pd.DataFrame): Refresh state from load_refresh_state
+        activity (pd.DataFrame): Result of artist_activity
+        popularity (Dict[str, int]): Result of artist_popularity
+        volatility (pd.Series): Result of follower_volatility
+        as_of (Union[str, date, pd.Timestamp]): Date of the run
+
+    Returns:
+        pd.DataFrame: One row per credit with artist_id, followers, refreshed_at,
+                      staleness_days (NaN when never refreshed), priority, value and
+                      search_calls (the most searches the credit can take), in descending
+                      order of value
+    """
+    as_of = pd.Timestamp(as_of)
+    df = pd.DataFrame({"artist_name": list(dict.fromkeys(artist_names))})
+    df = df.merge(state[["artist_name", "artist_id", "followers", "refreshed_at"]], on="artist_name", how="left")
+    df = df.merge(activity, on="artist_name", how="left")
+
+    years_since = (as_of.year - df["last_nominated"]).clip(lower=0)
+    recency = np.exp2(-years_since / NOMINATION_HALF_LIFE_YEARS).fillna(0.0)
+    won = (df["wins"].fillna(0) > 0).astype(float)
+    pop = _artist_key(df["artist_name"]).map(popularity).fillna(0).astype(float) / 100.0
+    vol = df["artist_id"].map(volatility)
+    # Ranked so a handful of exploding accounts doesn't flatten everyone else.
+    vol = vol.rank(pct=True).fillna(0.0)
+
+    df["priority"] = (PRIORITY_FLOOR
+                      + PRIORITY_WEIGHTS["recency"] * recency
+                      + PRIORITY_WEIGHTS["won"] * won
+                      + PRIORITY_WEIGHTS["popularity"] * pop
+                      + PRIORITY_WEIGHTS["volatility"] * vol)
+    df["staleness_days"] = (as_of - df["refreshed_at"]).dt.days.clip(lower=0)
+    df["value"] = (df["priority"] * df["staleness_days"]).fillna(np.inf)
+    unresolved = df.loc[df["artist_id"].isna(), "artist_name"]
+    candidates = canonicalise_artist_names(unresolved)["candidates"]
+    df["search_calls"] = df["artist_name"].map(lambda name: len(candidates.get(name, []))).astype(int)
+    # Never-refreshed credits first, then by value; ties broken by priority.
+    return df.sort_values(["value", "priority"], ascending=False, kind="mergesort").reset_index(drop=True)
+
+
+def plan_refresh(scored: pd.DataFrame, budget: int = REFRESH_CALL_BUDGET) -> pd.DataFrame:
+    """
+    Selects the longest prefix of the scored credits that fits the call budget.
+
+    Args:
+        scored (pd.DataFrame): Result of score_artists
+        budget (int): API calls available; 0 or less selects every credit
+
+    Returns:
+        pd.DataFrame: scored with a boolean "selected" column and the cumulative "calls"
+    """
+    plan = scored.copy()
+    searches = plan["search_calls"].cumsum()
+    lookups = -(-np.arange(1, len(plan) + 1) // ARTISTS_BATCH_SIZE)
+    plan["calls"] = searches + lookups
+    plan["selected"] = True if budget <= 0 else plan["calls"] <= budget
+    return plan
+
+
+def staleness_report(plan: pd.DataFrame) -> Dict[str, Optional[float]]:
+    """
+    Summarises how stale the follower counts are once the planned refresh is done.
+
+    Args:
+        plan (pd.DataFrame): Result of plan_refresh
+
+    Returns:
+        Dict[str, Optional[float]]: Refreshed and skipped counts, calls spent, credits
+                                    never refreshed, and staleness percentiles in days
+    """
+    after = plan["staleness_days"].where(~plan["selected"], 0.0)
+    known = after.dropna()
+    report = {
+        "refreshed": int(plan["selected"].sum()),
+        "skipped": int((~plan["selected"]).sum()),
+        "calls": int(plan.loc[plan["selected"], "calls"].max()) if plan["selected"].any() else 0,
+        "never_refreshed": int(after.isna().sum()),
+    }
+    for q in STALENESS_PERCENTILES:
+        report[f"staleness_p{int(q * 100)}"] = float(known.quantile(q)) if not known.empty else None
+    report["staleness_max"] = float(known.max()) if not known.empty else None
+    return report
+
+
+def refresh_artist_followers(engine, artist_names: List[str], activity: pd.DataFrame, popularity: Dict[str, int],
+                             snapshot_date: Union[str, date], budget: int = REFRESH_CALL_BUDGET,
+                             checkpoint_path: Optional[str] = None, final_attempt: bool = False) -> Dict:
+    """
+    Refreshes the highest-value artist credits within the budget and carries the rest forward.
+
+    The refreshed credits are written to the refresh state and the follower snapshot
+    history; the skipped ones keep their last known id and follower count.
+
+    Args:
+        engine: SQLAlchemy database engine
+        artist_names (List[str]): Artist credits of the run
+        activity (pd.DataFrame): Result of artist_activity
+        popularity (Dict[str, int]): Result of artist_popularity
+        snapshot_date (Union[str, date]): Date of the run
+        budget (int): API calls available; 0 or less refreshes every credit
+        checkpoint_path (Optional[str]): Checkpoint file the extraction resumes from on retry
+        final_attempt (bool): No retry follows, so failed API calls are kept as misses
+
+    Returns:
+        Dict: "artists" (pd.DataFrame with artist_name, artist_id and followers for every
+              credit), "refreshed" (pd.DataFrame of the refreshed credits) and "report"
+    """
+    from src.extract.extract_api import extract_spotify_api_data
+    from src.database.follower_snapshots import load_refresh_state, load_follower_history, save_refresh_state
+
+    state = load_refresh_state(engine)
+    history = load_follower_history(engine, artist_ids=state["artist_id"].dropna().unique().tolist(),
+                                    until=snapshot_date)
+    scored = score_artists(artist_names, state, activity, popularity, follower_volatility(history), snapshot_date)
+    plan = plan_refresh(scored, budget)
+    report = staleness_report(plan)
+    logging.info(f"Refresh plan within a budget of {budget or 'unlimited'} calls: {report}")
+
+    selected = plan[plan["selected"]]
+    if selected.empty:
+        refreshed = pd.DataFrame(columns=["artist_name", "artist_id", "followers"])
+    else:
+        known_ids = dict(zip(selected["artist_name"], selected["artist_id"]))
+        refreshed = extract_spotify_api_data(selected["artist_name"].tolist(), known_ids=known_ids,
+                                             checkpoint_path=checkpoint_path, final_attempt=final_attempt)
+        save_refresh_state(engine, refreshed, snapshot_date)
+
+    carried = plan.loc[~plan["selected"], ["artist_name", "artist_id", "followers"]]
+    artists = pd.concat([refreshed, carried], ignore_index=True)
+    return {"artists": artists, "refreshed": refreshed, "report": report}
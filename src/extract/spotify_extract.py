@@ -1,18 +1,28 @@
 import os
 import pandas as pd
 import logging
+from src.extract.parsed_cache import read_csv_cached
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%d/%m/%Y %I:%M:%S %p")
 
-def extract_spotify_data(path):
+def extract_spotify_data(path, usecols=None, use_cache=True):
     """
     Extracting data from the Spotify CSV file and return it as a DataFrame.   
 
+    Args:
+        path (str): Absolute path to the Spotify CSV file.
+        usecols (list, optional): Columns to parse, usually the projection computed from
+                                  the column contracts. All columns are read when omitted.
+        use_cache (bool): Read through the memory-mapped parsed cache instead of re-parsing
+                          the CSV text. Defaults to True.
     """
     if not os.path.exists(path):
         raise FileNotFoundError(f"File not found: {path}. Make sure you entered the correct absolute path.")
     try:
-        df = pd.read_csv(path)
+        if use_cache:
+            df = read_csv_cached(path, usecols=usecols)
+        else:
+            df = pd.read_csv(path, usecols=usecols)
         logging.info(f"Data extracted from {path}.")
         return df
     except Exception as e:
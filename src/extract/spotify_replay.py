@@ -0,0 +1,224 @@
+"""
+Record/replay harness for the Spotify Web API calls made by extract_api.
+
+Record once against the live API:
+    SPOTIFY_RECORDINGS_MODE=record (run the extract_spotify_api task as usual)
+
+Replay offline:
+    python -m src.extract.spotify_replay --port 8765 --latency-ms 120 --error-rate 0.01 \
+        --burst-every 200 --burst-length 5
+    SPOTIFY_API_BASE_URL=http://127.0.0.1:8765/v1/ (run the extract or the benchmark)
+"""
+import os
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%d/%m/%Y %I:%M:%S %p")
+
+SPOTIFY_RECORDINGS_PATH: str = os.getenv("SPOTIFY_RECORDINGS_PATH", "/opt/airflow/data/cache/spotify_recordings.json")
+
+
+def load_recordings(path: str = SPOTIFY_RECORDINGS_PATH) -> Dict[str, Dict[str, Any]]:
+    """
+    Loads recorded responses, returning empty recordings when the file doesn't exist.
+
+    Args:
+        path (str): Recordings file
+
+    Returns:
+        Dict[str, Dict[str, Any]]: {"search": {query: response}, "artists": {id: artist}}
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            recordings = json.load(f)
+    except FileNotFoundError:
+        recordings = {}
+    recordings.setdefault("search", {})
+    recordings.setdefault("artists", {})
+    return recordings
+
+
+class RecordingClient:
+    """
+    Wraps a spotipy client and records every search and artists response it returns.
+
+    Only the calls extract_api makes are wrapped; the recordings are merged into any
+    existing file on save, so several recording runs accumulate.
+    """
+
+    def __init__(self, client, path: str = SPOTIFY_RECORDINGS_PATH):
+        self.client = client
+        self.path = path
+        self.recordings = load_recordings(path)
+        self._lock = threading.Lock()
+
+    def search(self, q: str, limit: int = 10, offset: int = 0, type: str = "track", **kwargs):
+        response = self.client.search(q=q, limit=limit, offset=offset, type=type, **kwargs)
+        with self._lock:
+            self.recordings["search"][q] = response
+        return response
+
+    def artists(self, artists: List[str]):
+        response = self.client.artists(artists)
+        with self._lock:
+            for artist in response.get("artists", []):
+                if artist:
+                    self.recordings["artists"][artist["id"]] = artist
+        return response
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.recordings, f)
+        os.replace(tmp_path, self.path)
+        logging.info(f"Saved {len(self.recordings['search'])} searches and "
+                     f"{len(self.recordings['artists'])} artists to {self.path}")
+
+
+class ReplaySimulator:
+    """
+    Decides how the replay server answers each request: latency, injected errors and 429 bursts.
+
+    Latency is drawn from a lognormal distribution with the given median and sigma (sigma
+    0 gives a fixed delay). Every burst_every requests, the next burst_length requests are
+    throttled with 429 and a Retry-After header.
+    """
+
+    def __init__(self, latency_ms: float = 0.0, latency_sigma: float = 0.0, error_rate: float = 0.0,
+                 burst_every: int = 0, burst_length: int = 0, retry_after_s: int = 1, seed: Optional[int] = None):
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.burst_every = burst_every
+        self.burst_length = burst_length
+        self.retry_after_s = retry_after_s
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+
+    def delay_s(self) -> float:
+        if self.latency_ms <= 0:
+            return 0.0
+        with self._lock:
+            factor = self._random.lognormvariate(0.0, self.latency_sigma) if self.latency_sigma > 0 else 1.0
+        return self.latency_ms * factor / 1000
+
+    def outcome(self) -> int:
+        """Returns the HTTP status to answer with (200, 429 or 500)."""
+        with self._lock:
+            self.requests += 1
+            if self.burst_every and self.burst_length:
+                position = (self.requests - 1) % self.burst_every
+                if position >= self.burst_every - self.burst_length:
+                    self.throttled += 1
+                    return 429
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.errors += 1
+                return 500
+        return 200
+
+
+def _handler(recordings: Dict[str, Dict[str, Any]], simulator: ReplaySimulator):
+    class ReplayHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            time.sleep(simulator.delay_s())
+            status = simulator.outcome()
+            if status == 429:
+                return self._send(429, {"error": {"status": 429, "message": "API rate limit exceeded"}},
+                                  {"Retry-After": str(simulator.retry_after_s)})
+            if status == 500:
+                return self._send(500, {"error": {"status": 500, "message": "Simulated server error"}})
+
+            url = urlparse(self.path)
+            params = parse_qs(url.query)
+            if url.path.endswith("/search"):
+                query = params.get("q", [""])[0]
+                response = recordings["search"].get(query)
+                if response is None:
+                    response = {"artists": {"items": [], "total": 0}}
+                return self._send(200, response)
+            if url.path.endswith("/artists"):
+                ids = params.get("ids", [""])[0].split(",")
+                return self._send(200, {"artists": [recordings["artists"].get(artist_id) for artist_id in ids]})
+            return self._send(404, {"error": {"status": 404, "message": "Service not found"}})
+
+    return ReplayHandler
+
+
+def serve_replay(recordings_path: str = SPOTIFY_RECORDINGS_PATH, host: str = "127.0.0.1", port: int = 8765,
+                 simulator: Optional[ReplaySimulator] = None) -> ThreadingHTTPServer:
+    """
+    Starts the replay server on a background thread.
+
+    Point the client at it with SPOTIFY_API_BASE_URL=http://<host>:<port>/v1/.
+
+    Args:
+        recordings_path (str): Recordings file
+        host (str): Interface to bind
+        port (int): Port to bind, 0 for any free port
+        simulator (Optional[ReplaySimulator]): Latency and failure model, none when omitted
+
+    Returns:
+        ThreadingHTTPServer: The running server; call shutdown() to stop it
+    """
+    recordings = load_recordings(recordings_path)
+    server = ThreadingHTTPServer((host, port), _handler(recordings, simulator or ReplaySimulator()))
+    server.simulator = simulator
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logging.info(f"Replaying {len(recordings['search'])} searches and {len(recordings['artists'])} artists "
+                 f"on http://{server.server_address[0]}:{server.server_address[1]}/v1/")
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recordings", default=SPOTIFY_RECORDINGS_PATH)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Median response latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.0, help="Lognormal sigma; 0 for a fixed latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 500")
+    parser.add_argument("--burst-every", type=int, default=0, help="Requests per throttling cycle")
+    parser.add_argument("--burst-length", type=int, default=0, help="Requests answered with 429 per cycle")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds on 429")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    simulator = ReplaySimulator(args.latency_ms, args.latency_sigma, args.error_rate,
+                                args.burst_every, args.burst_length, args.retry_after, args.seed)
+    server = serve_replay(args.recordings, args.host, args.port, simulator)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,23 @@
-from src.database.db_operations import create_gcp_engine, load_data_clean, dispose_engine
+from src.database.db_operations import create_gcp_engine, load_data_clean, load_data_swap, rollback_swap, dispose_engine
+from src.database.dimensions import encode_foreign_keys, create_labelled_view, replace_labelled_view
 
+import os
+import argparse
 import pandas as pd
 import logging
-from typing import Optional, Union
+from typing import List, Optional, Union
 import json
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%d/%m/%Y %I:%M:%S %p")
 
-def load_data(df: Union[pd.DataFrame, str], table_name: str = "merged_data", schema: str = "merged") -> Optional[str]:
+# "swap" fully reloads the table through a shadow table; "create" only loads a table that doesn't exist yet.
+LOAD_MODE: str = os.getenv("MERGED_LOAD_MODE", "swap")
+
+# Built on the shadow table once its data is in; columns missing from the data are skipped.
+MERGED_DATA_INDEXES: List[List[str]] = [["artist_name"], ["track_id"], ["year", "category_id"]]
+
+def load_data(df: Union[pd.DataFrame, str], table_name: str = "merged_data", schema: str = "merged",
+              mode: str = LOAD_MODE, load_id: Optional[str] = None) -> Optional[int]:
     """
     Loads a DataFrame into the specified database table.
     
@@ -16,6 +26,12 @@ def load_data(df: Union[pd.DataFrame, str], table_name: str = "merged_data", sch
     logging of the process and handles potential errors that might occur during
     database operations.
     
+    Dimension columns (see DIMENSIONS) are stored as SMALLINT foreign keys into their
+    lookup tables; the <table_name>_labelled view joins the labels back.
+    
+    In "swap" mode the table is fully reloaded through an indexed shadow table that is
+    renamed into place atomically, keeping the previous version as <table_name>__previous.
+    
     Parameters:
         df (Union[pd.DataFrame, str]): The DataFrame to be loaded into the database.
                                      Can be either a DataFrame or a JSON string.
@@ -23,10 +39,12 @@ def load_data(df: Union[pd.DataFrame, str], table_name: str = "merged_data", sch
                          Defaults to "merged_data".
         schema (str): The database schema to load the data into.
                      Defaults to "merged".
+        mode (str): "swap" or "create". Defaults to MERGED_LOAD_MODE.
+        load_id (Optional[str]): Identifies the load across retries, e.g. the DAG run id;
+                                 a retry continues from the first uncommitted chunk.
     
     Returns:
-        Optional[str]: JSON string representation of the loaded DataFrame if successful,
-                      None if an error occurs.
+        Optional[int]: Number of rows loaded if successful, None if an error occurs.
         
     Raises:
         ValueError: If the input DataFrame is empty or if table_name is empty.
@@ -49,11 +67,56 @@ def load_data(df: Union[pd.DataFrame, str], table_name: str = "merged_data", sch
     engine = create_gcp_engine()
     
     try:
-        loaded_df = load_data_clean(engine, df, table_name, schema)
-        logging.info(f"Successfully loaded {len(loaded_df)} rows to table: {schema}.{table_name}")
-        return loaded_df.to_json(orient="records")
+        encoded_df, foreign_keys = encode_foreign_keys(engine, df, schema)
+        columns = list(encoded_df.columns)
+        if mode == "swap":
+            rows_loaded = load_data_swap(
+                engine, encoded_df, table_name, schema, indexes=MERGED_DATA_INDEXES, foreign_keys=foreign_keys,
+                after_swap=lambda conn: replace_labelled_view(conn, table_name, schema, columns), load_id=load_id
+            )
+        else:
+            rows_loaded = len(load_data_clean(engine, encoded_df, table_name, schema, foreign_keys=foreign_keys,
+                                              load_id=load_id))
+            create_labelled_view(engine, table_name, schema, columns)
+        logging.info(f"Successfully loaded {rows_loaded} rows to table: {schema}.{table_name}")
+        return rows_loaded
     except Exception as e:
         logging.error(f"Error loading clean data to the database: {str(e)}")
         return None
     finally:
-        dispose_engine(engine)
\ No newline at end of file
+        dispose_engine(engine)
+
+def rollback_load(table_name: str = "merged_data", schema: str = "merged") -> None:
+    """
+    Puts the version of a table replaced by the last swap load back in service.
+    
+    The rolled-back version is kept as <table_name>__previous, so running the rollback
+    again undoes it. The <table_name>_labelled view follows the restored table.
+    
+    From the command line: python -m src.load_store.load rollback [--table merged_data]
+    
+    Parameters:
+        table_name (str): The table to roll back. Defaults to "merged_data".
+        schema (str): The schema of the table. Defaults to "merged".
+        
+    Raises:
+        ValueError: If the table has no previous version.
+    """
+    engine = create_gcp_engine()
+    try:
+        rollback_swap(engine, table_name, schema, indexes=MERGED_DATA_INDEXES)
+    finally:
+        dispose_engine(engine)
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintenance of the swap-loaded merged tables.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    rollback = commands.add_parser("rollback", help="Swap <table>__previous back in as <table>")
+    rollback.add_argument("--table", default="merged_data")
+    rollback.add_argument("--schema", default="merged")
+    args = parser.parse_args()
+    if args.command == "rollback":
+        rollback_load(args.table, args.schema)
+
+if __name__ == "__main__":
+    main()
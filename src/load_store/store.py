@@ -2,10 +2,13 @@ from pydrive2.auth import GoogleAuth
 from pydrive2.drive import GoogleDrive
 from dotenv import load_dotenv
 import os
+import io
+import gzip
+import hashlib
 import pandas as pd
 import logging
 import json
-from typing import Union
+from typing import Dict, Optional, Union
 
 logging.basicConfig(
                     level=logging.INFO, 
@@ -19,6 +22,8 @@ client_secrets_file = os.getenv('CLIENT_SECRETS_PATH')
 settings_file = os.getenv('SETTINGS_PATH')
 credentials_file = os.getenv('SAVED_CREDENTIALS_PATH')
 folder_id = os.getenv("FOLDER_ID")
+# Upload gzip-compressed CSVs as "<title>.gz" instead of plain "<title>" files.
+STORE_GZIP: bool = os.getenv("DRIVE_STORE_GZIP", "false").lower() == "true"
 
 def auth_drive():
     """
@@ -70,17 +75,65 @@ def auth_drive():
         logging.error(f"Authentication error: {e}", exc_info=True)
         raise
 
-def store_merged_data(title: str, df: Union[pd.DataFrame, str]) -> None:
+def encode_content(df: pd.DataFrame, compress: bool = STORE_GZIP) -> bytes:
     """
-    Stores a given DataFrame as a CSV file on Google Drive.
+    Serialises a DataFrame to the exact bytes stored on Google Drive.
+    
+    The gzip header's timestamp is fixed, so the same data always compresses to the
+    same bytes and the MD5 checksum Drive reports can be compared across runs.
+    
+    Parameters:
+        df (pd.DataFrame): The DataFrame to serialise.
+        compress (bool): Whether to gzip the CSV. Defaults to DRIVE_STORE_GZIP.
+    
+    Returns:
+        bytes: UTF-8 CSV, gzip-compressed when compress is set.
+    """
+    content = df.to_csv(index=False).encode("utf-8")
+    return gzip.compress(content, compresslevel=6, mtime=0) if compress else content
+
+def find_drive_file(drive, title: str, parent_id: str) -> Optional[Dict]:
+    """
+    Finds the file with a given title in a Google Drive folder.
+    
+    Runs before this module updated files in place left one copy per run behind; the
+    most recently modified copy is the one kept up to date.
+    
+    Parameters:
+        drive (GoogleDrive): An authenticated GoogleDrive instance.
+        title (str): The title of the file.
+        parent_id (str): The ID of the folder holding it.
+    
+    Returns:
+        Optional[Dict]: The file's metadata (id, md5Checksum, ...), or None if there is none.
+    """
+    query_title = title.replace("\\", "\\\\").replace("'", "\\'")
+    files = drive.ListFile({
+        "q": f"title = '{query_title}' and '{parent_id}' in parents and trashed = false",
+        "orderBy": "modifiedDate desc",
+    }).GetList()
+    if len(files) > 1:
+        logging.warning(f"Found {len(files)} files titled {title}; updating the most recent one ({files[0]['id']}).")
+    return files[0] if files else None
+
+def store_merged_data(title: str, df: Union[pd.DataFrame, str], compress: bool = STORE_GZIP) -> Dict:
+    """
+    Stores a given DataFrame as a CSV file on Google Drive, updating the existing file in place.
+    
+    The file with the same title in the folder is looked up first. When its MD5 checksum
+    matches the new content nothing is uploaded; otherwise its content is replaced, so
+    the folder keeps a single copy. The file is only created when there is none yet.
     
     Parameters:
         title (str): The title of the file to be stored on Google Drive.
         df (Union[pd.DataFrame, str]): The DataFrame to be stored as a CSV file.
                                      Can be either a DataFrame or a JSON string.
+        compress (bool): Whether to upload a gzip-compressed CSV titled "<title>.gz".
+                         Defaults to DRIVE_STORE_GZIP.
     
     Returns:
-        None
+        Dict: "action" ("unchanged", "updated" or "created"), "file_id", "md5" and the
+              "bytes" uploaded.
     
     Raises:
         ValueError: If the input DataFrame is empty or if title is empty.
@@ -104,19 +157,34 @@ def store_merged_data(title: str, df: Union[pd.DataFrame, str]) -> None:
         logging.info(f"Storing {title} on Google Drive.")
         logging.info(f"DataFrame has {len(df)} rows and {len(df.columns)} columns.")
         
-        csv_file = df.to_csv(index=False) 
-        
-        file = drive.CreateFile({
-            "title": title,
-            "parents": [{"kind": "drive#fileLink", "id": folder_id}],
-            "mimeType": "text/csv"
-        })
-        
-        file.SetContentString(csv_file)
-        
+        content = encode_content(df, compress)
+        md5 = hashlib.md5(content).hexdigest()
+        if compress:
+            title = f"{title}.gz"
+        mime_type = "application/gzip" if compress else "text/csv"
+
+        existing = find_drive_file(drive, title, folder_id)
+        if existing is not None and existing.get("md5Checksum") == md5:
+            logging.info(f"File {title} is unchanged (md5 {md5}); skipping the upload.")
+            return {"action": "unchanged", "file_id": existing["id"], "md5": md5, "bytes": 0}
+
+        if existing is not None:
+            file = drive.CreateFile({"id": existing["id"], "mimeType": mime_type})
+            action = "updated"
+        else:
+            file = drive.CreateFile({
+                "title": title,
+                "parents": [{"kind": "drive#fileLink", "id": folder_id}],
+                "mimeType": mime_type
+            })
+            action = "created"
+
+        file.content = io.BytesIO(content)
+        file.dirty["content"] = True
         file.Upload()
         
-        logging.info(f"File {title} uploaded successfully.")
+        logging.info(f"File {title} {action} successfully ({len(content)} bytes, md5 {md5}).")
+        return {"action": action, "file_id": file["id"], "md5": md5, "bytes": len(content)}
 
     except Exception as e:
         logging.error(f"Error storing data on Google Drive: {e}", exc_info=True)
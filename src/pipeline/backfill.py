@@ -0,0 +1,346 @@
+"""
+Reprocesses a list of dates or input snapshots through the pipeline with bounded parallelism.
+
+Each snapshot is a directory holding spotify_dataset.csv and the_grammy_awards.csv. Dates
+are turned into snapshot directories with --snapshot-template. Every snapshot is merged
+into its own table, processed.merged_data_<label>.
+
+Usage:
+    python -m src.pipeline.backfill --dates 2025-04-01 2025-04-02 \
+        --snapshot-template /opt/airflow/data/snapshots/{date} --workers 4
+    python -m src.pipeline.backfill --snapshots /data/snap_a /data/snap_b --skip-api
+"""
+import os
+import re
+import sys
+import json
+import hashlib
+import time
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(project_root)
+
+from src.extract.parsed_cache import PARSED_CACHE_DIR, file_digest, read_csv_cached
+from src.pipeline.contracts import source_projection
+from src.pipeline.quality import run_quality_gate, SPOTIFY_EXPECTATIONS, SPOTIFY_TRANSFORMED_EXPECTATIONS, GRAMMYS_EXPECTATIONS
+from src.transform.credits import CreditsCache
+from src.transform.spotify_transform import transform_spotify_data
+from src.transform.grammys_transform import transform_grammys_data
+from src.transform.transform_api import transform_spotify_api_data
+from src.transform.merge import merge_data
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%d/%m/%Y %I:%M:%S %p")
+
+BACKFILL_STATE_PATH: str = os.getenv("BACKFILL_STATE_PATH", "/opt/airflow/data/cache/backfill_state.json")
+# Intermediate outputs of a backfill, kept apart from the scheduled DAG's files.
+BACKFILL_WORK_DIR: str = os.getenv("BACKFILL_WORK_DIR", "/opt/airflow/data/backfill")
+SPOTIFY_FILE = "spotify_dataset.csv"
+GRAMMYS_FILE = "the_grammy_awards.csv"
+
+
+def backfill_fingerprint(options: Dict) -> str:
+    """
+    Fingerprints the pipeline code and the options a backfill ran with.
+
+    Completed snapshots are only skipped by a backfill with the same fingerprint, so
+    reprocessing after a code change (e.g. a new genre mapping) needs no --restart.
+
+    Args:
+        options (Dict): Options that change the results, e.g. skip_api
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256(json.dumps(options, sort_keys=True).encode("utf-8"))
+    src_root = os.path.join(project_root, "src")
+    for directory, dirs, files in sorted(os.walk(src_root)):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(".py"):
+                path = os.path.join(directory, name)
+                digest.update(os.path.relpath(path, src_root).encode("utf-8"))
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+    return digest.hexdigest()
+
+
+def load_state(path: str, fingerprint: Optional[str] = None) -> Dict[str, Dict]:
+    """
+    Loads the completed snapshots of a previous backfill.
+
+    Args:
+        path (str): State file
+        fingerprint (Optional[str]): backfill_fingerprint of the current backfill; a state
+                                     written with another fingerprint is ignored
+
+    Returns:
+        Dict[str, Dict]: Completed snapshot label -> result
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return {}
+    if fingerprint is not None and state.get("fingerprint") != fingerprint:
+        logging.info(f"Ignoring {path}: it was written by a different pipeline version or options.")
+        return {}
+    return state.get("completed", {})
+
+
+def _save_state(path: str, completed: Dict[str, Dict], fingerprint: Optional[str] = None) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"fingerprint": fingerprint, "completed": completed}, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def snapshot_label(snapshot: str) -> str:
+    """Returns a table-name-safe label for a snapshot directory or date."""
+    return re.sub(r"[^0-9a-zA-Z_]+", "_", os.path.basename(os.path.normpath(snapshot))).strip("_").lower()
+
+
+class SharedInputs:
+    """
+    Inputs shared by every snapshot of a backfill.
+
+    Parsed CSVs are keyed by content hash, so identical files across snapshots are parsed
+    (or memory-mapped from the Arrow cache) once. A parsed frame is held only while some
+    owner (a snapshot in flight) still uses it; see release. The credits cache and the API follower
+    lookup are shared as well, together with the follower snapshot history used to
+    pick each dated snapshot's follower counts.
+    """
+
+    def __init__(self, cache_dir: str = PARSED_CACHE_DIR, api_df: Optional[pd.DataFrame] = None):
+        self.cache_dir = cache_dir
+        self.credits_cache = CreditsCache.load()
+        self.api_df = api_df
+        self.follower_history: Optional[pd.DataFrame] = None
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._owners: Dict[str, set] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.credits_lock = threading.Lock()
+
+    def read_csv(self, path: str, owner: str, usecols: Optional[List[str]] = None) -> pd.DataFrame:
+        digest = file_digest(path)
+        key = f"{digest}:{','.join(usecols or [])}"
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+            self._owners.setdefault(key, set()).add(owner)
+        with lock:
+            frame = self._frames.get(key)
+            if frame is None:
+                # One cache directory per content hash: snapshots share file names, so keying
+                # the parsed copy by name alone would rebuild it for every snapshot.
+                cache_dir = os.path.join(self.cache_dir, "backfill", digest[:16])
+                frame = self._frames[key] = read_csv_cached(path, usecols=usecols, cache_dir=cache_dir)
+            else:
+                logging.info(f"Reusing parsed {path} (content {digest[:12]}).")
+        return frame
+
+    def release(self, owner: str) -> None:
+        """Drops the parsed frames no owner but this one still uses."""
+        with self._lock:
+            for key in [key for key, owners in self._owners.items() if owner in owners]:
+                self._owners[key].discard(owner)
+                if not self._owners[key]:
+                    del self._owners[key]
+                    self._frames.pop(key, None)
+                    self._locks.pop(key, None)
+
+
+def process_snapshot(snapshot: str, shared: SharedInputs, engine, as_of: Optional[str] = None) -> Dict:
+    """
+    Runs extract, transform and merge for one snapshot and loads the result to its own table.
+
+    Args:
+        snapshot (str): Snapshot directory
+        shared (SharedInputs): Shared parsed inputs and caches
+        engine: Shared SQLAlchemy engine, or None to skip loading
+        as_of (Optional[str]): Snapshot date; follower counts valid at that date are used when known
+
+    Returns:
+        Dict: Rows and table produced for the snapshot
+    """
+    try:
+        return _process_snapshot(snapshot, shared, engine, as_of)
+    finally:
+        shared.release(snapshot)
+
+
+def _process_snapshot(snapshot: str, shared: SharedInputs, engine, as_of: Optional[str]) -> Dict:
+    label = snapshot_label(snapshot)
+    spotify_raw = shared.read_csv(os.path.join(snapshot, SPOTIFY_FILE), snapshot,
+                                  usecols=source_projection("spotify_csv"))
+    run_quality_gate(f"backfill.{label}.spotify", spotify_raw, SPOTIFY_EXPECTATIONS)
+    grammys_raw = shared.read_csv(os.path.join(snapshot, GRAMMYS_FILE), snapshot,
+                                  usecols=source_projection("grammy_awards"))
+    run_quality_gate(f"backfill.{label}.grammys", grammys_raw, GRAMMYS_EXPECTATIONS)
+
+    spotify_df = transform_spotify_data(spotify_raw, as_frame=True)
+    if spotify_df is None:
+        raise ValueError(f"Spotify transformation returned no data for {snapshot}")
+    run_quality_gate(f"backfill.{label}.transform_spotify", spotify_df, SPOTIFY_TRANSFORMED_EXPECTATIONS)
+    with shared.credits_lock:
+        grammys_df = transform_grammys_data(grammys_raw, credits_cache=shared.credits_cache, as_frame=True)
+    if grammys_df is None:
+        raise ValueError(f"Grammy Awards transformation returned no data for {snapshot}")
+
+    # merge_data normalises the API frame's keys in place, so each snapshot gets its own copy.
+    api_df = shared.api_df.copy() if shared.api_df is not None else None
+    merged = merge_data(spotify_df, grammys_df, api_df, follower_history=shared.follower_history, as_of=as_of)
+    table = f"merged_data_{label}"
+    if engine is not None:
+        from src.database.db_operations import load_data_raw
+        load_data_raw(engine, merged, table, schema="processed")
+    return {"rows": len(merged), "table": f"processed.{table}"}
+
+
+def followers_output_path(snapshots: List[str], work_dir: str = BACKFILL_WORK_DIR) -> str:
+    """Returns the follower CSV of a backfill, named after the labels of its first and last snapshot."""
+    labels = [snapshot_label(snapshots[0]), snapshot_label(snapshots[-1])]
+    return os.path.join(work_dir, f"spotify_artists_followers_{'__'.join(dict.fromkeys(labels))}.csv")
+
+
+def fetch_followers(snapshots: List[str], shared: SharedInputs, work_dir: str = BACKFILL_WORK_DIR) -> pd.DataFrame:
+    """
+    Looks up followers once for the union of Grammy artists across every snapshot.
+
+    The results are saved under work_dir rather than to the scheduled DAG's follower
+    file, which a backfill running next to the DAG would otherwise overwrite.
+
+    Args:
+        snapshots (List[str]): Snapshot directories
+        shared (SharedInputs): Shared parsed inputs
+        work_dir (str): Directory for the backfill's follower CSV
+
+    Returns:
+        pd.DataFrame: Transformed Spotify API data for all snapshots
+    """
+    from src.extract.extract_api import extract_spotify_api_data
+
+    artist_names = []
+    for snapshot in snapshots:
+        grammys_raw = shared.read_csv(os.path.join(snapshot, GRAMMYS_FILE), "fetch_followers",
+                                      usecols=source_projection("grammy_awards"))
+        artist_names.extend(grammys_raw["artist"].dropna().tolist())
+        shared.release("fetch_followers")
+    artist_names = list(dict.fromkeys(artist_names))
+    logging.info(f"Looking up {len(artist_names)} distinct artists once for {len(snapshots)} snapshots.")
+    return transform_spotify_api_data(extract_spotify_api_data(artist_names,
+                                                               output_path=followers_output_path(snapshots, work_dir)))
+
+
+def run_backfill(snapshots: List[str], workers: int = 2, state_path: str = BACKFILL_STATE_PATH,
+                 restart: bool = False, skip_api: bool = False, load: bool = True,
+                 snapshot_dates: Optional[Dict[str, str]] = None) -> Dict[str, Dict]:
+    """
+    Processes snapshots with at most `workers` in flight, resuming after the last completed one.
+
+    Progress is logged as each snapshot finishes, and completed snapshots are recorded in
+    the state file straight away, so an interrupted backfill picks up where it stopped.
+
+    Args:
+        snapshots (List[str]): Snapshot directories, in processing order
+        workers (int): Maximum snapshots processed concurrently
+        state_path (str): File recording completed snapshots
+        restart (bool): Ignore the state file and reprocess everything; a state written
+                        by other code or options is ignored anyway
+        skip_api (bool): Merge without Spotify API followers
+        load (bool): Load each merged snapshot to PostgreSQL
+        snapshot_dates (Optional[Dict[str, str]]): Snapshot -> date, for as-of follower counts
+
+    Returns:
+        Dict[str, Dict]: Completed snapshot label -> result, including earlier runs
+
+    Raises:
+        RuntimeError: If any snapshot failed; the others are still completed and recorded
+    """
+    fingerprint = backfill_fingerprint({"skip_api": skip_api, "as_of": bool(snapshot_dates)})
+    completed = {} if restart else load_state(state_path, fingerprint)
+    pending = [snapshot for snapshot in snapshots if snapshot_label(snapshot) not in completed]
+    skipped = len(snapshots) - len(pending)
+    if skipped:
+        logging.info(f"Resuming backfill: {skipped} snapshots already completed, {len(pending)} to go.")
+    if not pending:
+        return completed
+
+    shared = SharedInputs()
+    if not skip_api:
+        shared.api_df = fetch_followers(pending, shared)
+
+    engine = None
+    if load:
+        from src.database.db_operations import create_gcp_engine
+        # One pooled engine for the whole backfill, sized to the number of workers.
+        engine = create_gcp_engine(pool_size=workers)
+        if snapshot_dates and shared.api_df is not None:
+            from src.database.follower_snapshots import load_follower_history
+            shared.follower_history = load_follower_history(engine, until=max(snapshot_dates.values()))
+
+    state_lock = threading.Lock()
+    failures = {}
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(process_snapshot, snapshot, shared, engine, (snapshot_dates or {}).get(snapshot)): snapshot
+                       for snapshot in pending}
+            for done, future in enumerate(as_completed(futures), start=1):
+                snapshot = futures[future]
+                label = snapshot_label(snapshot)
+                elapsed = time.perf_counter() - start
+                eta = elapsed / done * (len(pending) - done)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failures[label] = str(e)
+                    logging.error(f"[{done}/{len(pending)}] {snapshot} failed: {e}")
+                    continue
+                with state_lock:
+                    completed[label] = result
+                    _save_state(state_path, completed, fingerprint)
+                logging.info(f"[{done}/{len(pending)}] {snapshot} -> {result['table']} ({result['rows']} rows); "
+                             f"elapsed {elapsed:.1f}s, ETA {eta:.1f}s")
+    finally:
+        shared.credits_cache.save()
+        if engine is not None:
+            from src.database.db_operations import dispose_engine
+            dispose_engine(engine)
+
+    if failures:
+        raise RuntimeError(f"Backfill failed for {len(failures)} snapshots: {failures}")
+    return completed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    inputs = parser.add_mutually_exclusive_group(required=True)
+    inputs.add_argument("--snapshots", nargs="+", help="Snapshot directories")
+    inputs.add_argument("--dates", nargs="+", help="Dates (YYYY-MM-DD) resolved with --snapshot-template")
+    parser.add_argument("--snapshot-template", default="/opt/airflow/data/snapshots/{date}")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--state", default=BACKFILL_STATE_PATH)
+    parser.add_argument("--restart", action="store_true", help="Ignore completed snapshots in the state file")
+    parser.add_argument("--skip-api", action="store_true", help="Merge without Spotify API followers")
+    parser.add_argument("--no-load", action="store_true", help="Don't load the merged snapshots to PostgreSQL")
+    args = parser.parse_args()
+
+    snapshot_dates = {args.snapshot_template.format(date=date): date for date in args.dates or []}
+    snapshots = args.snapshots or list(snapshot_dates)
+    completed = run_backfill(snapshots, workers=args.workers, state_path=args.state, restart=args.restart,
+                             skip_api=args.skip_api, load=not args.no_load, snapshot_dates=snapshot_dates)
+    print(json.dumps(completed, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import logging
+from typing import Dict, List
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%d/%m/%Y %I:%M:%S %p")
+
+# Columns each source can provide, in source order.
+SOURCE_COLUMNS: Dict[str, List[str]] = {
+    "spotify_csv": [
+        "Unnamed: 0", "track_id", "artists", "album_name", "track_name", "popularity",
+        "duration_ms", "explicit", "danceability", "energy", "key", "loudness", "mode",
+        "speechiness", "acousticness", "instrumentalness", "liveness", "valence", "tempo",
+        "time_signature", "track_genre"
+    ],
+    "grammy_awards": [
+        "year", "title", "published_at", "updated_at", "category", "nominee", "artist",
+        "workers", "img", "winner"
+    ],
+    "spotify_api": ["artist_name", "artist_id", "followers"],
+}
+
+# Each stage declares, per upstream node:
+#   consumes    - columns the stage reads itself,
+#   passthrough - columns forwarded unchanged ("*" for every upstream column),
+#   renames     - columns forwarded under a new name,
+# and the new columns it produces. A stage with no downstream consumer is a sink and
+# needs every column of its inputs.
+STAGE_CONTRACTS: Dict[str, Dict] = {
+    "transform_spotify": {
+        "inputs": {
+            "spotify_csv": {
+                # dropna() and the drop_duplicates() passes look at every column but
+                # "Unnamed: 0", so the audio features are consumed even though they are dropped.
+                "consumes": [
+                    "track_id", "artists", "album_name", "track_name", "popularity", "duration_ms",
+                    "explicit", "danceability", "energy", "key", "loudness", "mode", "speechiness",
+                    "acousticness", "instrumentalness", "liveness", "valence", "tempo",
+                    "time_signature", "track_genre"
+                ],
+                "passthrough": [
+                    "track_id", "album_name", "track_name", "popularity", "explicit",
+                    "danceability", "energy", "track_genre"
+                ],
+                "renames": {"artists": "artist_name"},
+            },
+        },
+        "produces": ["duration_min", "duration_category", "popularity_category", "track_mood", "live_performance"],
+    },
+    "transform_grammys": {
+        "inputs": {
+            "grammy_awards": {
+                "consumes": ["category", "nominee", "artist", "workers"],
+                "passthrough": ["year", "title", "category", "nominee", "artist"],
+                "renames": {"winner": "is_winner"},
+            },
+        },
+        "produces": [],
+    },
+    "transform_spotify_api": {
+        "inputs": {
+            "spotify_api": {"consumes": ["artist_name", "followers"], "passthrough": ["artist_name", "artist_id", "followers"]},
+        },
+        "produces": [],
+    },
+    "merge_data": {
+        "inputs": {
+            # track_name and nominee key the track-level join (MERGE_GRANULARITY=track).
+            "transform_spotify": {"consumes": ["artist_name", "track_name"], "passthrough": "*"},
+            "transform_grammys": {"consumes": ["artist", "nominee"], "passthrough": "*"},
+            # artist_id keys the as-of lookup of followers in the snapshot history.
+            "transform_spotify_api": {"consumes": ["artist_name", "artist_id", "followers"], "passthrough": ["followers"]},
+        },
+        "produces": [],
+    },
+    "load_data": {
+        "inputs": {"merge_data": {"consumes": "*"}},
+        "produces": [],
+    },
+    "store_data": {
+        "inputs": {"merge_data": {"consumes": "*"}},
+        "produces": [],
+    },
+}
+
+
+def _unique(columns: List[str]) -> List[str]:
+    return list(dict.fromkeys(columns))
+
+
+def output_columns(node: str) -> List[str]:
+    """
+    Returns the columns a source or stage makes available downstream.
+
+    Args:
+        node (str): Source or stage name
+
+    Returns:
+        List[str]: Output columns, in order
+
+    Raises:
+        KeyError: If the node is unknown
+    """
+    if node in SOURCE_COLUMNS:
+        return list(SOURCE_COLUMNS[node])
+    contract = STAGE_CONTRACTS[node]
+    columns = []
+    for upstream, spec in contract["inputs"].items():
+        upstream_columns = output_columns(upstream)
+        passthrough = spec.get("passthrough", [])
+        columns.extend(upstream_columns if passthrough == "*" else passthrough)
+        columns.extend(spec.get("renames", {}).values())
+    columns.extend(contract["produces"])
+    return _unique(columns)
+
+
+def _consumers(node: str) -> List[str]:
+    return [stage for stage, contract in STAGE_CONTRACTS.items() if node in contract["inputs"]]
+
+
+def required_columns(node: str) -> List[str]:
+    """
+    Computes the minimal set of output columns of a node that downstream stages need.
+
+    Args:
+        node (str): Source or stage name
+
+    Returns:
+        List[str]: Required columns, in the node's output order
+    """
+    available = output_columns(node)
+    consumers = _consumers(node)
+    if not consumers:
+        return available
+
+    required = set()
+    for stage in consumers:
+        spec = STAGE_CONTRACTS[stage]["inputs"][node]
+        if spec.get("consumes") == "*":
+            return available
+        required.update(spec.get("consumes", []))
+        needed_downstream = set(required_columns(stage))
+        passthrough = spec.get("passthrough", [])
+        forwarded = available if passthrough == "*" else passthrough
+        required.update(col for col in forwarded if col in needed_downstream)
+        required.update(old for old, new in spec.get("renames", {}).items() if new in needed_downstream)
+    return [col for col in available if col in required]
+
+
+def validate_contracts() -> None:
+    """
+    Checks that every stage only consumes columns its upstream nodes provide.
+
+    Called at DAG-parse time so a broken contract fails the DAG import rather than a run.
+
+    Raises:
+        ValueError: If a stage references an unknown node or a column its upstream doesn't provide
+    """
+    errors = []
+    for stage, contract in STAGE_CONTRACTS.items():
+        for upstream, spec in contract["inputs"].items():
+            if upstream not in SOURCE_COLUMNS and upstream not in STAGE_CONTRACTS:
+                errors.append(f"{stage}: unknown upstream '{upstream}'")
+                continue
+            available = set(output_columns(upstream))
+            referenced = []
+            for key in ("consumes", "passthrough"):
+                if spec.get(key, []) != "*":
+                    referenced.extend(spec.get(key, []))
+            referenced.extend(spec.get("renames", {}).keys())
+            missing = [col for col in _unique(referenced) if col not in available]
+            if missing:
+                errors.append(f"{stage}: columns {missing} are not provided by '{upstream}'")
+    if errors:
+        raise ValueError("Broken column contracts:\n" + "\n".join(errors))
+
+
+def source_projection(source: str) -> List[str]:
+    """
+    Returns the columns to read from a source, after validating the contracts.
+
+    Args:
+        source (str): Source name, e.g. "spotify_csv" or "grammy_awards"
+
+    Returns:
+        List[str]: Minimal column set, in source order
+    """
+    validate_contracts()
+    columns = required_columns(source)
+    pruned = [col for col in SOURCE_COLUMNS[source] if col not in columns]
+    logging.info(f"Projection for {source}: reading {len(columns)} columns, pruning {pruned}.")
+    return columns
@@ -0,0 +1,95 @@
+import os
+import time
+import logging
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%d/%m/%Y %I:%M:%S %p")
+
+# Verbosity levels, each including the previous one.
+LEVELS: Dict[str, int] = {"off": 0, "counts": 1, "schema": 2, "sample": 3}
+
+DIAGNOSTICS_LEVEL: str = os.getenv("DIAGNOSTICS_LEVEL", "sample")
+DIAGNOSTICS_TIME_BUDGET_MS: float = float(os.getenv("DIAGNOSTICS_TIME_BUDGET_MS", "50"))
+DIAGNOSTICS_MAX_SAMPLE_CHARS: int = int(os.getenv("DIAGNOSTICS_MAX_SAMPLE_CHARS", "2000"))
+DIAGNOSTICS_SAMPLE_ROWS: int = int(os.getenv("DIAGNOSTICS_SAMPLE_ROWS", "2"))
+
+
+def _level(level: Optional[str]) -> int:
+    name = (level or DIAGNOSTICS_LEVEL).lower()
+    if name not in LEVELS:
+        raise ValueError(f"Unknown diagnostics level '{name}'; expected one of {list(LEVELS)}")
+    return LEVELS[name]
+
+
+def describe_frame(stage: str, df: pd.DataFrame, level: Optional[str] = None,
+                   time_budget_ms: float = DIAGNOSTICS_TIME_BUDGET_MS,
+                   max_sample_chars: int = DIAGNOSTICS_MAX_SAMPLE_CHARS) -> Dict[str, Any]:
+    """
+    Logs diagnostics for a DataFrame a stage already holds in memory.
+
+    Only metadata is read: the row count, dtypes, the shallow memory footprint and the
+    first rows. Sections are skipped once the time budget is spent, and the sample text
+    is capped at max_sample_chars, so diagnostics cost the same at any data size.
+
+    Args:
+        stage (str): Stage name used as the log prefix
+        df (pd.DataFrame): The stage's input or output frame
+        level (Optional[str]): "off", "counts", "schema" or "sample"; DIAGNOSTICS_LEVEL when omitted
+        time_budget_ms (float): Time budget for the whole description
+        max_sample_chars (int): Upper bound on the sample text kept in memory and logged
+
+    Returns:
+        Dict[str, Any]: The collected diagnostics
+    """
+    level_value = _level(level)
+    summary: Dict[str, Any] = {}
+    if level_value == 0:
+        return summary
+
+    start = time.perf_counter()
+
+    def over_budget() -> bool:
+        return (time.perf_counter() - start) * 1000 > time_budget_ms
+
+    summary["rows"] = len(df)
+    summary["columns"] = df.shape[1]
+    logging.info(f"[{stage}] {summary['rows']} rows, {summary['columns']} columns")
+
+    if level_value >= LEVELS["schema"] and not over_budget():
+        summary["schema"] = {str(col): str(dtype) for col, dtype in df.dtypes.items()}
+        summary["memory_bytes"] = int(df.memory_usage(index=False, deep=False).sum())
+        logging.info(f"[{stage}] schema: {summary['schema']} (~{summary['memory_bytes']} bytes, shallow)")
+
+    if level_value >= LEVELS["sample"] and not over_budget():
+        sample = df.head(DIAGNOSTICS_SAMPLE_ROWS).to_string(max_colwidth=50)
+        if len(sample) > max_sample_chars:
+            sample = sample[:max_sample_chars] + "..."
+        summary["sample"] = sample
+        logging.info(f"[{stage}] sample:\n{sample}")
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if elapsed_ms > time_budget_ms:
+        logging.info(f"[{stage}] diagnostics budget of {time_budget_ms:.0f} ms exhausted ({elapsed_ms:.1f} ms); "
+                     f"remaining sections skipped")
+    return summary
+
+
+def describe_payload(stage: str, payload: Optional[str], level: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Logs the size of a serialised payload received through XCom without parsing it.
+
+    Args:
+        stage (str): Stage name used as the log prefix
+        payload (Optional[str]): The serialised payload
+        level (Optional[str]): Diagnostics level; DIAGNOSTICS_LEVEL when omitted
+
+    Returns:
+        Dict[str, Any]: The collected diagnostics
+    """
+    if _level(level) == 0:
+        return {}
+    size = len(payload) if payload else 0
+    logging.info(f"[{stage}] received payload of {size} characters")
+    return {"payload_chars": size}
@@ -0,0 +1,58 @@
+import json
+import logging
+from typing import Any, Dict
+
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%d/%m/%Y %I:%M:%S %p")
+
+
+def to_payload(df: pd.DataFrame) -> str:
+    """
+    Serialises a DataFrame for XCom, sending Categorical columns as integer codes.
+
+    Each Categorical column's labels are written once in a dictionary instead of once
+    per row. Other columns are serialised exactly as DataFrame.to_json would.
+
+    Args:
+        df (pd.DataFrame): Frame to serialise
+
+    Returns:
+        str: JSON payload readable by from_payload
+    """
+    dictionaries: Dict[str, Dict[str, Any]] = {}
+    encoded = df
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            if encoded is df:
+                encoded = df.copy()
+            dictionaries[col] = {
+                "categories": df[col].cat.categories.tolist(),
+                "ordered": bool(df[col].cat.ordered),
+            }
+            encoded[col] = df[col].cat.codes
+    return '{"dictionaries":' + json.dumps(dictionaries) + ',"frame":' + encoded.to_json(orient="split", index=False) + '}'
+
+
+def from_payload(payload: str) -> pd.DataFrame:
+    """
+    Rebuilds a DataFrame from to_payload output, restoring Categorical columns.
+
+    Plain records JSON (DataFrame.to_json(orient="records")) is accepted as well.
+
+    Args:
+        payload (str): JSON payload
+
+    Returns:
+        pd.DataFrame: The deserialised frame
+    """
+    data = json.loads(payload)
+    if isinstance(data, list):
+        return pd.DataFrame(data)
+
+    frame = data["frame"]
+    df = pd.DataFrame(frame["data"], columns=frame["columns"])
+    for col, dictionary in data["dictionaries"].items():
+        codes = df[col].fillna(-1).astype(int)
+        df[col] = pd.Categorical.from_codes(codes, categories=dictionary["categories"], ordered=dictionary["ordered"])
+    return df
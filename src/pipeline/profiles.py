@@ -0,0 +1,328 @@
+import os
+import json
+import base64
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from src.database.db_operations import create_gcp_engine, dispose_engine
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%d/%m/%Y %I:%M:%S %p")
+
+PROFILES_SCHEMA: str = "meta"
+PROFILES_TABLE: str = "run_profiles"
+HLL_PRECISION: int = 14
+TDIGEST_COMPRESSION: float = 200.0
+PROFILE_QUANTILES: List[float] = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+DRIFT_DISTINCT_PCT: float = float(os.getenv("PROFILE_DRIFT_DISTINCT_PCT", "20"))
+DRIFT_QUANTILE_PCT: float = float(os.getenv("PROFILE_DRIFT_QUANTILE_PCT", "20"))
+
+# Columns profiled per stage output: approximate distinct counts and quantiles.
+PROFILE_SPECS: Dict[str, Dict[str, List[str]]] = {
+    "extract_spotify": {"distinct": ["artists", "track_id", "track_name", "track_genre"],
+                        "quantiles": ["popularity", "duration_ms"]},
+    "transform_spotify": {"distinct": ["artist_name", "track_id", "track_genre"],
+                          "quantiles": ["popularity", "duration_min"]},
+    "extract_grammys": {"distinct": ["artist", "nominee", "category"], "quantiles": ["year"]},
+    "transform_grammys": {"distinct": ["artist", "category"], "quantiles": ["year"]},
+    "transform_spotify_api": {"distinct": ["artist_name"], "quantiles": ["followers"]},
+    "merge_data": {"distinct": ["artist_name", "track_id", "category"],
+                   "quantiles": ["popularity", "followers", "duration_min"]},
+}
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct-count sketch with 2**precision one-byte registers.
+
+    Values are hashed with pandas' stable 64-bit hash, so sketches built in different
+    runs or processes merge by taking the register-wise maximum.
+    """
+
+    def __init__(self, precision: int = HLL_PRECISION, registers: Optional[np.ndarray] = None):
+        self.precision = precision
+        self.registers = registers if registers is not None else np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, series: pd.Series) -> "HyperLogLog":
+        values = series.dropna()
+        if values.empty:
+            return self
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+        p = self.precision
+        index = (hashes >> np.uint64(64 - p)).astype(np.int64)
+        remainder = hashes & np.uint64((1 << (64 - p)) - 1)
+        # frexp's exponent is the bit length; the remainder has at most 50 bits, so the
+        # float64 conversion is exact.
+        _, bit_length = np.frexp(remainder.astype(np.float64))
+        rank = (64 - p) - bit_length + 1
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        return HyperLogLog(self.precision, np.maximum(self.registers, other.registers))
+
+    def estimate(self) -> float:
+        m = float(len(self.registers))
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return m * np.log(m / zeros)
+        return float(raw)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"precision": self.precision, "registers": base64.b64encode(self.registers.tobytes()).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HyperLogLog":
+        registers = np.frombuffer(base64.b64decode(data["registers"]), dtype=np.uint8).copy()
+        return cls(data["precision"], registers)
+
+
+class TDigest:
+    """
+    Merging t-digest quantile sketch, compressed in one vectorised pass.
+
+    Sorted centroids are grouped by the integer part of the k1 scale function at their
+    cumulative quantile, which keeps clusters small in the tails and large in the
+    middle. Exact minimum and maximum are kept for the extreme quantiles.
+    """
+
+    def __init__(self, compression: float = TDIGEST_COMPRESSION):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray) -> None:
+        order = np.argsort(means, kind="mergesort")
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        q = (np.cumsum(weights) - weights / 2) / total
+        k = np.floor(self.compression / (2 * np.pi) * np.arcsin(2 * q - 1)).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, k[1:] != k[:-1]])
+        cluster_weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / cluster_weights
+        self.weights = cluster_weights
+
+    def add(self, series: pd.Series) -> "TDigest":
+        values = pd.to_numeric(series, errors="coerce").dropna().to_numpy(dtype=np.float64)
+        if values.size == 0:
+            return self
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._compress(np.r_[self.means, values], np.r_[self.weights, np.ones(values.size)])
+        return self
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        merged = TDigest(self.compression)
+        merged.min, merged.max = min(self.min, other.min), max(self.max, other.max)
+        if self.count + other.count:
+            merged._compress(np.r_[self.means, other.means], np.r_[self.weights, other.weights])
+        return merged
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.weights.size == 0:
+            return None
+        positions = (np.cumsum(self.weights) - self.weights / 2) / self.count
+        return float(np.interp(q, np.r_[0.0, positions, 1.0], np.r_[self.min, self.means, self.max]))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"compression": self.compression, "means": self.means.tolist(), "weights": self.weights.tolist(),
+                "min": self.min, "max": self.max}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TDigest":
+        digest = cls(data["compression"])
+        digest.means = np.asarray(data["means"], dtype=np.float64)
+        digest.weights = np.asarray(data["weights"], dtype=np.float64)
+        digest.min, digest.max = data["min"], data["max"]
+        return digest
+
+
+def profile_frame(stage: str, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Builds the sketches declared for a stage in PROFILE_SPECS.
+
+    Args:
+        stage (str): Stage name
+        df (pd.DataFrame): The stage's output frame
+
+    Returns:
+        List[Dict[str, Any]]: One profile row per sketched column
+    """
+    spec = PROFILE_SPECS.get(stage, {})
+    rows = []
+    for column in spec.get("distinct", []):
+        if column in df.columns:
+            sketch = HyperLogLog().add(df[column])
+            rows.append({"column_name": column, "kind": "hll", "estimate": sketch.estimate(),
+                         "quantiles": None, "sketch": sketch.to_dict()})
+    for column in spec.get("quantiles", []):
+        if column in df.columns:
+            sketch = TDigest().add(df[column])
+            if sketch.count == 0:
+                continue
+            quantiles = {str(q): sketch.quantile(q) for q in PROFILE_QUANTILES}
+            rows.append({"column_name": column, "kind": "tdigest", "estimate": sketch.count,
+                         "quantiles": quantiles, "sketch": sketch.to_dict()})
+    return rows
+
+
+def ensure_profiles_table(engine: Engine) -> None:
+    """
+    Creates the meta.run_profiles table if it does not exist.
+
+    Args:
+        engine (Engine): SQLAlchemy database engine
+    """
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {PROFILES_SCHEMA}"))
+        conn.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS {PROFILES_SCHEMA}.{PROFILES_TABLE} (
+                id BIGSERIAL PRIMARY KEY,
+                dag_id TEXT NOT NULL,
+                run_id TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                column_name TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                estimate DOUBLE PRECISION,
+                quantiles JSONB,
+                sketch JSONB NOT NULL,
+                created_at TIMESTAMPTZ NOT NULL
+            )
+        """))
+        conn.execute(text(f"""
+            CREATE INDEX IF NOT EXISTS {PROFILES_TABLE}_dag_stage_created_idx
+            ON {PROFILES_SCHEMA}.{PROFILES_TABLE} (dag_id, stage, column_name, created_at DESC)
+        """))
+
+
+def record_profile(stage: str, df: pd.DataFrame, context: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Profiles a stage's output and stores the sketches in meta.run_profiles.
+
+    Like the run stats, failing to store a profile never fails the stage itself.
+
+    Args:
+        stage (str): Stage name, usually the task_id
+        df (pd.DataFrame): The stage's output frame
+        context (Dict[str, Any]): Airflow task context
+
+    Returns:
+        List[Dict[str, Any]]: The profile rows
+    """
+    rows = profile_frame(stage, df)
+    if not rows:
+        return rows
+    dag = context.get("dag")
+    created_at = datetime.now(timezone.utc)
+    base = {
+        "dag_id": dag.dag_id if dag is not None else "workshop_002_etl_pipeline",
+        "run_id": context.get("run_id") or created_at.isoformat(),
+        "stage": stage,
+        "created_at": created_at,
+    }
+    records = [{**base, **row, "quantiles": json.dumps(row["quantiles"]), "sketch": json.dumps(row["sketch"])}
+               for row in rows]
+    engine = None
+    try:
+        engine = create_gcp_engine()
+        ensure_profiles_table(engine)
+        with engine.begin() as conn:
+            conn.execute(text(f"""
+                INSERT INTO {PROFILES_SCHEMA}.{PROFILES_TABLE}
+                    (dag_id, run_id, stage, column_name, kind, estimate, quantiles, sketch, created_at)
+                VALUES (:dag_id, :run_id, :stage, :column_name, :kind, :estimate,
+                        CAST(:quantiles AS JSONB), CAST(:sketch AS JSONB), :created_at)
+            """), records)
+        summary = ", ".join(f"{row['column_name']}~{row['estimate']:.0f}" for row in rows if row["kind"] == "hll")
+        logging.info(f"[{stage}] profiled {len(rows)} columns ({summary})")
+    except Exception as e:
+        logging.warning(f"Could not record profile for stage {stage}: {e}")
+    finally:
+        if engine is not None:
+            dispose_engine(engine)
+    return rows
+
+
+def _relative_change(value: Optional[float], reference: Optional[float]) -> Optional[float]:
+    if value is None or reference is None or reference == 0:
+        return None
+    return (value - reference) / abs(reference) * 100
+
+
+def find_drift(engine: Engine, dag_id: str, run_id: str,
+               distinct_pct: float = DRIFT_DISTINCT_PCT,
+               quantile_pct: float = DRIFT_QUANTILE_PCT) -> List[Dict[str, Any]]:
+    """
+    Compares a run's profiles with the most recent earlier profile of each stage and column.
+
+    Distinct counts are flagged when they move by more than distinct_pct percent, and
+    the 10th, 50th and 90th percentiles when they move by more than quantile_pct percent.
+
+    Args:
+        engine (Engine): SQLAlchemy database engine
+        dag_id (str): DAG identifier
+        run_id (str): Run to check
+        distinct_pct (float): Allowed change of distinct counts, in percent
+        quantile_pct (float): Allowed change of quantiles, in percent
+
+    Returns:
+        List[Dict[str, Any]]: One entry per drifted (stage, column, statistic)
+    """
+    ensure_profiles_table(engine)
+    table = f"{PROFILES_SCHEMA}.{PROFILES_TABLE}"
+    profiles = pd.read_sql(
+        text(f"""
+            SELECT DISTINCT ON (current.stage, current.column_name)
+                   current.stage, current.column_name, current.kind,
+                   current.estimate, current.quantiles,
+                   previous.estimate AS previous_estimate, previous.quantiles AS previous_quantiles
+            FROM {table} current
+            JOIN LATERAL (
+                SELECT estimate, quantiles FROM {table} earlier
+                WHERE earlier.dag_id = current.dag_id AND earlier.stage = current.stage
+                  AND earlier.column_name = current.column_name AND earlier.run_id <> current.run_id
+                  AND earlier.created_at < current.created_at
+                ORDER BY earlier.created_at DESC
+                LIMIT 1
+            ) previous ON TRUE
+            WHERE current.dag_id = :dag_id AND current.run_id = :run_id
+            ORDER BY current.stage, current.column_name, current.created_at DESC
+        """),
+        con=engine, params={"dag_id": dag_id, "run_id": run_id}
+    )
+
+    drift = []
+    for row in profiles.itertuples(index=False):
+        if row.kind == "hll":
+            checks = [("distinct", row.estimate, row.previous_estimate, distinct_pct)]
+        else:
+            current, previous = row.quantiles or {}, row.previous_quantiles or {}
+            checks = [(f"p{int(float(q) * 100)}", current.get(q), previous.get(q), quantile_pct)
+                      for q in ("0.1", "0.5", "0.9")]
+        for statistic, value, reference, threshold in checks:
+            change = _relative_change(value, reference)
+            if change is not None and abs(change) > threshold:
+                drift.append({
+                    "stage": row.stage,
+                    "column": row.column_name,
+                    "statistic": statistic,
+                    "value": float(value),
+                    "previous": float(reference),
+                    "change_pct": round(float(change), 1),
+                })
+    return drift
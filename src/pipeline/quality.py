@@ -0,0 +1,126 @@
+import os
+import time
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%d/%m/%Y %I:%M:%S %p")
+
+QUALITY_SAMPLE_ROWS: int = int(os.getenv("QUALITY_SAMPLE_ROWS", "1000000"))
+
+# Supported checks:
+#   {"check": "between",       "column": c, "min": x, "max": y, "mostly": 1.0}
+#   {"check": "max_null_rate", "column": c, "max": rate}
+#   {"check": "unique",        "column": c}
+# Range checks ignore nulls; null rates are checked separately. "mostly" is the share of
+# non-null values that must be in range.
+SPOTIFY_EXPECTATIONS: List[Dict[str, Any]] = [
+    {"check": "between", "column": "popularity", "min": 0, "max": 100},
+    {"check": "between", "column": "valence", "min": 0.0, "max": 1.0},
+    # The catalogue has an empty placeholder row with duration_ms 0; transform_spotify_data drops it.
+    {"check": "between", "column": "duration_ms", "min": 0, "max": 3 * 60 * 60 * 1000},
+    {"check": "max_null_rate", "column": "track_id", "max": 0.01},
+    {"check": "max_null_rate", "column": "artists", "max": 0.01},
+    {"check": "max_null_rate", "column": "track_name", "max": 0.01},
+    {"check": "max_null_rate", "column": "track_genre", "max": 0.0},
+]
+
+# The raw catalogue lists a track once per genre, so track_id is only unique after
+# transform_spotify_data has deduplicated it.
+SPOTIFY_TRANSFORMED_EXPECTATIONS: List[Dict[str, Any]] = [
+    {"check": "unique", "column": "track_id"},
+]
+
+GRAMMYS_EXPECTATIONS: List[Dict[str, Any]] = [
+    {"check": "between", "column": "year", "min": 1958, "max": datetime.now().year + 1},
+    {"check": "max_null_rate", "column": "year", "max": 0.0},
+    {"check": "max_null_rate", "column": "category", "max": 0.0},
+    {"check": "max_null_rate", "column": "nominee", "max": 0.01},
+]
+
+
+def _evaluate(df: pd.DataFrame, expectation: Dict[str, Any]) -> Optional[str]:
+    column = expectation["column"]
+    check = expectation["check"]
+    if column not in df.columns:
+        return f"{check}({column}): column is missing"
+    series = df[column]
+
+    if check == "between":
+        values = pd.to_numeric(series, errors="coerce")
+        non_null = series.notna()
+        in_range = values.between(expectation["min"], expectation["max"]) & non_null
+        total = int(non_null.sum())
+        if total == 0:
+            return None
+        share = in_range.sum() / total
+        if share < expectation.get("mostly", 1.0):
+            bad = values[non_null & ~in_range]
+            return (f"between({column}, {expectation['min']}, {expectation['max']}): "
+                    f"{total - int(in_range.sum())} of {total} values out of range "
+                    f"(observed min {bad.min()}, max {bad.max()})")
+    elif check == "max_null_rate":
+        rate = series.isna().mean() if len(series) else 0.0
+        if rate > expectation["max"]:
+            return f"max_null_rate({column}, {expectation['max']}): observed {rate:.4f}"
+    elif check == "unique":
+        duplicated = int(series.duplicated().sum())
+        if duplicated:
+            return f"unique({column}): {duplicated} duplicated values"
+    else:
+        raise ValueError(f"Unknown expectation check '{check}'")
+    return None
+
+
+def validate_frame(df: pd.DataFrame, expectations: List[Dict[str, Any]],
+                   sample_rows: int = QUALITY_SAMPLE_ROWS, random_state: int = 0) -> List[str]:
+    """
+    Evaluates declarative expectations against a DataFrame, one vectorised pass per check.
+
+    Frames larger than sample_rows are checked on a fixed-seed random sample for range
+    and null-rate checks; uniqueness is always checked on the full column.
+
+    Args:
+        df (pd.DataFrame): Data to validate
+        expectations (List[Dict[str, Any]]): Expectations (see module comment)
+        sample_rows (int): Row count above which sampling kicks in
+        random_state (int): Seed for the sample
+
+    Returns:
+        List[str]: Failure descriptions, empty when every expectation holds
+    """
+    sampled = df.sample(n=sample_rows, random_state=random_state) if len(df) > sample_rows else df
+    failures = []
+    for expectation in expectations:
+        target = df if expectation["check"] == "unique" else sampled
+        failure = _evaluate(target, expectation)
+        if failure:
+            failures.append(failure)
+    return failures
+
+
+def run_quality_gate(stage: str, df: pd.DataFrame, expectations: List[Dict[str, Any]],
+                     sample_rows: int = QUALITY_SAMPLE_ROWS) -> None:
+    """
+    Validates a stage's data and fails the stage immediately if any expectation is broken.
+
+    Args:
+        stage (str): Stage name used in logs and the error
+        df (pd.DataFrame): Data to validate
+        expectations (List[Dict[str, Any]]): Expectations (see module comment)
+        sample_rows (int): Row count above which sampling kicks in
+
+    Raises:
+        ValueError: If any expectation fails
+    """
+    start = time.perf_counter()
+    failures = validate_frame(df, expectations, sample_rows=sample_rows)
+    elapsed = time.perf_counter() - start
+    sampled = " (sampled)" if len(df) > sample_rows else ""
+    if failures:
+        for failure in failures:
+            logging.error(f"[{stage}] data quality check failed: {failure}")
+        raise ValueError(f"Data quality gate failed for {stage}{sampled}: " + "; ".join(failures))
+    logging.info(f"[{stage}] {len(expectations)} data quality checks passed on {len(df)} rows{sampled} in {elapsed:.3f}s")
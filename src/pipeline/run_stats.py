@@ -0,0 +1,201 @@
+import os
+import time
+import resource
+import logging
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from src.database.db_operations import create_gcp_engine, dispose_engine
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%d/%m/%Y %I:%M:%S %p")
+
+RUN_STATS_SCHEMA: str = "meta"
+RUN_STATS_TABLE: str = "run_stats"
+REGRESSION_THRESHOLD_PCT: float = float(os.getenv("RUN_STATS_REGRESSION_PCT", "25"))
+BASELINE_RUNS: int = int(os.getenv("RUN_STATS_BASELINE_RUNS", "7"))
+MIN_BASELINE_RUNS: int = int(os.getenv("RUN_STATS_MIN_BASELINE_RUNS", "3"))
+REGRESSION_METRICS: List[str] = ["duration_s", "peak_memory_mb"]
+
+STAT_FIELDS: List[str] = [
+    "rows_in", "rows_out", "bytes_in", "bytes_out", "cache_hit_rate", "row_amplification"
+]
+
+
+def ensure_run_stats_table(engine: Engine) -> None:
+    """
+    Creates the meta.run_stats table if it does not exist.
+
+    Args:
+        engine (Engine): SQLAlchemy database engine
+    """
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {RUN_STATS_SCHEMA}"))
+        conn.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS {RUN_STATS_SCHEMA}.{RUN_STATS_TABLE} (
+                id BIGSERIAL PRIMARY KEY,
+                dag_id TEXT NOT NULL,
+                run_id TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                try_number INTEGER,
+                status TEXT NOT NULL,
+                started_at TIMESTAMPTZ NOT NULL,
+                duration_s DOUBLE PRECISION,
+                peak_memory_mb DOUBLE PRECISION,
+                rows_in BIGINT,
+                rows_out BIGINT,
+                bytes_in BIGINT,
+                bytes_out BIGINT,
+                cache_hit_rate DOUBLE PRECISION,
+                row_amplification DOUBLE PRECISION
+            )
+        """))
+        conn.execute(text(f"""
+            CREATE INDEX IF NOT EXISTS {RUN_STATS_TABLE}_dag_stage_started_idx
+            ON {RUN_STATS_SCHEMA}.{RUN_STATS_TABLE} (dag_id, stage, started_at DESC)
+        """))
+
+
+def record_stage_stats(engine: Engine, row: Dict[str, Any]) -> None:
+    """
+    Inserts one stage row into meta.run_stats.
+
+    Args:
+        engine (Engine): SQLAlchemy database engine
+        row (Dict[str, Any]): Column values for the row
+    """
+    ensure_run_stats_table(engine)
+    columns = ", ".join(row.keys())
+    values = ", ".join(f":{name}" for name in row.keys())
+    with engine.begin() as conn:
+        conn.execute(text(f"INSERT INTO {RUN_STATS_SCHEMA}.{RUN_STATS_TABLE} ({columns}) VALUES ({values})"), row)
+
+
+def _peak_memory_mb() -> float:
+    """Peak resident set size of the current process in MiB (ru_maxrss is KiB on Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+@contextmanager
+def track_stage(stage: str, context: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Times a DAG stage and writes its row to meta.run_stats when it finishes.
+
+    The caller fills the yielded dict with whatever it already knows (see STAT_FIELDS);
+    duration and peak memory are measured here. Failing to record stats never fails
+    the stage itself.
+
+    Args:
+        stage (str): Stage name, usually the task_id
+        context (Dict[str, Any]): Airflow task context
+
+    Yields:
+        Dict[str, Any]: Mutable stats for the caller to fill in
+    """
+    stats: Dict[str, Any] = {field: None for field in STAT_FIELDS}
+    started_at = datetime.now(timezone.utc)
+    start = time.perf_counter()
+    status = "failed"
+    try:
+        yield stats
+        status = "success"
+    finally:
+        ti = context.get("ti")
+        dag = context.get("dag")
+        row = {
+            "dag_id": dag.dag_id if dag is not None else "workshop_002_etl_pipeline",
+            "run_id": context.get("run_id") or started_at.isoformat(),
+            "stage": stage,
+            "try_number": getattr(ti, "try_number", None),
+            "status": status,
+            "started_at": started_at,
+            "duration_s": time.perf_counter() - start,
+            "peak_memory_mb": _peak_memory_mb(),
+        }
+        row.update({field: stats.get(field) for field in STAT_FIELDS})
+        logging.info(f"Stage {stage} finished with status {status} in {row['duration_s']:.2f}s "
+                     f"(peak memory {row['peak_memory_mb']:.1f} MiB).")
+        engine = None
+        try:
+            engine = create_gcp_engine()
+            record_stage_stats(engine, row)
+        except Exception as e:
+            logging.warning(f"Could not record run stats for stage {stage}: {e}")
+        finally:
+            if engine is not None:
+                dispose_engine(engine)
+
+
+def find_regressions(engine: Engine, dag_id: str, run_id: str,
+                     threshold_pct: float = REGRESSION_THRESHOLD_PCT,
+                     baseline_runs: int = BASELINE_RUNS,
+                     min_baseline_runs: int = MIN_BASELINE_RUNS) -> List[Dict[str, Any]]:
+    """
+    Compares each stage of a run against the median of its previous successful runs.
+
+    A stage is flagged when its duration or peak memory exceeds the rolling baseline
+    by more than threshold_pct percent. Stages with fewer than min_baseline_runs
+    previous runs are not judged.
+
+    Args:
+        engine (Engine): SQLAlchemy database engine
+        dag_id (str): DAG identifier
+        run_id (str): Run to check
+        threshold_pct (float): Allowed growth over the baseline, in percent
+        baseline_runs (int): Number of previous runs in the rolling baseline
+        min_baseline_runs (int): Minimum number of previous runs needed to compare
+
+    Returns:
+        List[Dict[str, Any]]: One entry per (stage, metric) regression
+    """
+    ensure_run_stats_table(engine)
+    table = f"{RUN_STATS_SCHEMA}.{RUN_STATS_TABLE}"
+    current = pd.read_sql(
+        text(f"""
+            SELECT DISTINCT ON (stage) stage, duration_s, peak_memory_mb
+            FROM {table}
+            WHERE dag_id = :dag_id AND run_id = :run_id AND status = 'success'
+            ORDER BY stage, started_at DESC
+        """),
+        con=engine, params={"dag_id": dag_id, "run_id": run_id}
+    )
+    history = pd.read_sql(
+        text(f"""
+            SELECT stage, duration_s, peak_memory_mb FROM (
+                SELECT stage, duration_s, peak_memory_mb,
+                       ROW_NUMBER() OVER (PARTITION BY stage ORDER BY started_at DESC) AS rn
+                FROM {table}
+                WHERE dag_id = :dag_id AND run_id <> :run_id AND status = 'success'
+            ) recent
+            WHERE rn <= :baseline_runs
+        """),
+        con=engine, params={"dag_id": dag_id, "run_id": run_id, "baseline_runs": baseline_runs}
+    )
+    if current.empty or history.empty:
+        return []
+
+    counts = history.groupby("stage").size()
+    baseline = history.groupby("stage")[REGRESSION_METRICS].median()
+    baseline = baseline[counts.reindex(baseline.index) >= min_baseline_runs]
+    compared = current.set_index("stage").join(baseline, rsuffix="_baseline", how="inner")
+
+    regressions = []
+    for stage, row in compared.iterrows():
+        for metric in REGRESSION_METRICS:
+            value, reference = row[metric], row[f"{metric}_baseline"]
+            if pd.isna(value) or pd.isna(reference) or reference <= 0:
+                continue
+            change_pct = (value - reference) / reference * 100
+            if change_pct > threshold_pct:
+                regressions.append({
+                    "stage": stage,
+                    "metric": metric,
+                    "value": float(value),
+                    "baseline": float(reference),
+                    "change_pct": round(float(change_pct), 1),
+                })
+    return regressions
@@ -0,0 +1,298 @@
+"""
+Read-side artist lookups over the merged data, without querying merged.merged_data.
+
+The load_data task publishes a compact, artist-keyed index of the run it loaded
+(tracks, Grammy nominations and wins, followers). ArtistLookup serves lookups from
+that index in memory, caching the decoded records in an LRU. The cache is dropped
+as soon as an index from a newer run is published.
+
+Python:
+    lookup = ArtistLookup()
+    lookup.get("Billie Eilish")
+
+HTTP:
+    python -m src.serving.artist_lookup --port 8766
+    curl http://127.0.0.1:8766/artists/billie%20eilish
+"""
+import os
+import json
+import time
+import logging
+import argparse
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import unquote, urlparse
+
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%d/%m/%Y %I:%M:%S %p")
+
+ARTIST_INDEX_PATH: str = os.getenv("ARTIST_INDEX_PATH", "/opt/airflow/data/serving/artist_index.json")
+ARTIST_LOOKUP_CACHE_SIZE: int = int(os.getenv("ARTIST_LOOKUP_CACHE_SIZE", "4096"))
+# How often a lookup may stat the index file for a newer run.
+ARTIST_LOOKUP_RECHECK_S: float = float(os.getenv("ARTIST_LOOKUP_RECHECK_S", "5"))
+
+TRACK_COLUMNS: List[str] = ["track_id", "track_name", "popularity", "track_genre"]
+NOMINATION_COLUMNS: List[str] = ["year", "category", "title", "is_winner"]
+
+
+def artist_key(name: str) -> str:
+    """Normalises an artist name the way merge_data keys the merged rows."""
+    return name.lower().strip()
+
+
+def _columnar(df: pd.DataFrame, columns: List[str]) -> Dict[str, List]:
+    return {col: json.loads(df[col].to_json(orient="values")) for col in columns}
+
+
+def build_artist_index(df: pd.DataFrame, run_id: str) -> Dict[str, Any]:
+    """
+    Builds the compact, columnar artist index of a merged DataFrame.
+
+    Artists are sorted by key; the tracks and nominations of artist i are the slices
+    between offsets i and i + 1 of their columns, each deduplicated and ordered by
+    popularity and year.
+
+    Args:
+        df (pd.DataFrame): Merged data (artist_name, tracks, nominations and followers)
+        run_id (str): Run that loaded the data
+
+    Returns:
+        Dict[str, Any]: The index, ready to be serialised
+    """
+    df = df.assign(artist_key=df["artist_name"].astype(str).map(artist_key))
+    track_columns = [col for col in TRACK_COLUMNS if col in df.columns]
+    nomination_columns = [col for col in NOMINATION_COLUMNS if col in df.columns]
+
+    tracks = (df[["artist_key"] + track_columns]
+              .drop_duplicates(subset=["artist_key", "track_id"])
+              .sort_values(["artist_key", "popularity"], ascending=[True, False], kind="mergesort"))
+    nominations = (df[["artist_key"] + nomination_columns]
+                   .drop_duplicates()
+                   .sort_values(["artist_key", "year"], ascending=[True, False], kind="mergesort"))
+    artists = df.groupby("artist_key", sort=True)["artist_name"].first().to_frame()
+    artists["followers"] = df.groupby("artist_key")["followers"].max() if "followers" in df.columns else None
+    keys = artists.index.tolist()
+    track_counts = tracks.groupby("artist_key").size().reindex(keys, fill_value=0)
+    nomination_counts = nominations.groupby("artist_key").size().reindex(keys, fill_value=0)
+    wins = (nominations[nominations["is_winner"].astype(str).str.lower().isin(["true", "1"])]
+            .groupby("artist_key").size().reindex(keys, fill_value=0)) if "is_winner" in nominations else None
+
+    return {
+        "run_id": run_id,
+        "published_at": datetime.now(timezone.utc).isoformat(),
+        "keys": keys,
+        "artists": {
+            "artist_name": artists["artist_name"].tolist(),
+            "followers": json.loads(artists["followers"].to_json(orient="values")),
+            "grammy_wins": wins.tolist() if wins is not None else [0] * len(keys),
+        },
+        "track_offsets": [0] + track_counts.cumsum().tolist(),
+        "tracks": _columnar(tracks, track_columns),
+        "nomination_offsets": [0] + nomination_counts.cumsum().tolist(),
+        "nominations": _columnar(nominations, nomination_columns),
+    }
+
+
+def publish_artist_index(df: pd.DataFrame, run_id: str, path: str = ARTIST_INDEX_PATH) -> int:
+    """
+    Builds and atomically publishes the artist index of a loaded run.
+
+    Args:
+        df (pd.DataFrame): Merged data that was loaded
+        run_id (str): Run that loaded the data
+        path (str): Index file
+
+    Returns:
+        int: Number of artists indexed
+    """
+    index = build_artist_index(df, run_id)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, path)
+    logging.info(f"Published the artist index of run {run_id} ({len(index['keys'])} artists) to {path}.")
+    return len(index["keys"])
+
+
+class IndexNotPublished(Exception):
+    """Raised by lookups before the first load has published the artist index."""
+
+
+class ArtistLookup:
+    """
+    In-memory artist lookups over the published index, with an LRU of decoded records.
+
+    The index file is re-checked at most every recheck_s seconds; when it was republished
+    by a different run, the new index is swapped in and the cache cleared. Safe to share
+    between threads.
+    """
+
+    def __init__(self, path: str = ARTIST_INDEX_PATH, cache_size: int = ARTIST_LOOKUP_CACHE_SIZE,
+                 recheck_s: float = ARTIST_LOOKUP_RECHECK_S):
+        self.path = path
+        self.cache_size = cache_size
+        self.recheck_s = recheck_s
+        self.run_id: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self._index: Optional[Dict[str, Any]] = None
+        self._positions: Dict[str, int] = {}
+        self._cache: "OrderedDict[str, Optional[Dict]]" = OrderedDict()
+        self._stat_key = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if self._index is not None and now - self._checked_at < self.recheck_s:
+            return
+        self._checked_at = now
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            # Nothing published yet; keep serving the index already loaded, if any.
+            return
+        stat_key = (stat.st_size, stat.st_mtime_ns)
+        if stat_key == self._stat_key:
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        self._stat_key = stat_key
+        if index["run_id"] == self.run_id:
+            return
+        logging.info(f"Serving the artist index of run {index['run_id']} ({len(index['keys'])} artists).")
+        self._index = index
+        self._positions = {key: position for position, key in enumerate(index["keys"])}
+        self._cache.clear()
+        self.run_id = index["run_id"]
+
+    def _decode(self, position: int) -> Dict:
+        index = self._index
+        track_slice = slice(index["track_offsets"][position], index["track_offsets"][position + 1])
+        nomination_slice = slice(index["nomination_offsets"][position], index["nomination_offsets"][position + 1])
+        tracks = index["tracks"]
+        nominations = index["nominations"]
+        return {
+            "artist_name": index["artists"]["artist_name"][position],
+            "followers": index["artists"]["followers"][position],
+            "grammy_wins": index["artists"]["grammy_wins"][position],
+            "tracks": [dict(zip(tracks, values)) for values in zip(*(col[track_slice] for col in tracks.values()))],
+            "nominations": [dict(zip(nominations, values))
+                            for values in zip(*(col[nomination_slice] for col in nominations.values()))],
+            "run_id": self.run_id,
+        }
+
+    @property
+    def ready(self) -> bool:
+        """Whether an index has been loaded; refreshes it first."""
+        with self._lock:
+            self._refresh()
+            return self._index is not None
+
+    def get(self, name: str) -> Optional[Dict]:
+        """
+        Looks an artist up by name (case and surrounding whitespace are ignored).
+
+        Args:
+            name (str): Artist name
+
+        Returns:
+            Optional[Dict]: artist_name, followers, grammy_wins, tracks, nominations and the
+                            run_id of the index, or None for an unknown artist
+
+        Raises:
+            IndexNotPublished: If no load has published the index yet
+        """
+        key = artist_key(name)
+        with self._lock:
+            self._refresh()
+            if self._index is None:
+                raise IndexNotPublished(f"No artist index published at {self.path} yet")
+            if key in self._cache:
+                self.hits += 1
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            self.misses += 1
+            position = self._positions.get(key)
+            record = self._decode(position) if position is not None else None
+            self._cache[key] = record
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return record
+
+
+def _handler(lookup: ArtistLookup):
+    class LookupHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body: Dict[str, Any]):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/health":
+                return self._send(200 if lookup.ready else 503,
+                                  {"run_id": lookup.run_id, "hits": lookup.hits, "misses": lookup.misses})
+            if url.path.startswith("/artists/"):
+                try:
+                    record = lookup.get(unquote(url.path[len("/artists/"):]))
+                except IndexNotPublished as e:
+                    return self._send(503, {"error": str(e), "run_id": None})
+                if record is None:
+                    return self._send(404, {"error": "Artist not found", "run_id": lookup.run_id})
+                return self._send(200, record)
+            return self._send(404, {"error": "Not found"})
+
+    return LookupHandler
+
+
+def serve_lookup(lookup: ArtistLookup, host: str = "127.0.0.1", port: int = 8766) -> ThreadingHTTPServer:
+    """
+    Starts the lookup endpoint on a background thread.
+
+    GET /artists/<name> returns the artist's record; GET /health the served run_id and
+    cache counters. Both answer 503 until the first index is published.
+
+    Args:
+        lookup (ArtistLookup): Lookup to serve
+        host (str): Interface to bind
+        port (int): Port to bind, 0 for any free port
+
+    Returns:
+        ThreadingHTTPServer: The running server; call shutdown() to stop it
+    """
+    server = ThreadingHTTPServer((host, port), _handler(lookup))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logging.info(f"Serving artist lookups on http://{server.server_address[0]}:{server.server_address[1]}/artists/")
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--index", default=ARTIST_INDEX_PATH)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--cache-size", type=int, default=ARTIST_LOOKUP_CACHE_SIZE)
+    args = parser.parse_args()
+
+    server = serve_lookup(ArtistLookup(args.index, args.cache_size), args.host, args.port)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import re
+import logging
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%d/%m/%Y %I:%M:%S %p")
+
+# Separators that always join distinct artists.
+FEATURING_PATTERN = re.compile(r"\s*(?:\bfeaturing\b|\bfeat\b\.?|\bft\b\.?|\bduet with\b|\bwith\b|;)\s*", re.IGNORECASE)
+
+# Separators that may also be part of a single act's name ("Simon & Garfunkel", "Earth, Wind & Fire", "AC/DC").
+GROUP_PATTERN = re.compile(r"\s*(?:&|,|/|\band\b)\s*", re.IGNORECASE)
+
+NON_ARTISTS: Set[str] = {
+    "various artists",
+    "various",
+    "various composers",
+    "original cast",
+    "original broadway cast",
+    "original cast recording",
+    "soundtrack",
+    "traditional",
+    "anonymous",
+    "unknown",
+}
+
+ROLE_WORDS: Set[str] = {
+    "artist", "artists", "composer", "composers", "conductor", "conductor/soloist",
+    "choir director", "chorus master", "graphic designer", "soloist", "soloists",
+    "ensembles", "producer", "producers", "engineer", "engineers", "engineer/mixer",
+    "mixer", "arranger", "songwriter", "songwriters", "album notes writer", "art director",
+}
+
+
+def fold_artist_name(name: str) -> str:
+    """
+    Folds an artist name into its canonical key: diacritics removed, case folded,
+    whitespace collapsed and surrounding parentheses dropped.
+
+    Args:
+        name (str): Raw artist name
+
+    Returns:
+        str: Canonical key, e.g. "(Beyoncé )" -> "beyonce"
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    key = " ".join(stripped.casefold().split())
+    while key.startswith("(") and key.endswith(")"):
+        key = key[1:-1].strip()
+    return key
+
+
+def _clean_piece(piece: str) -> Optional[str]:
+    piece = piece.strip().strip("()").strip()
+    if not piece:
+        return None
+    key = fold_artist_name(piece)
+    if not key or key in NON_ARTISTS or key in ROLE_WORDS:
+        return None
+    return piece
+
+
+def split_collaborations(name: str) -> List[Dict]:
+    """
+    Splits a raw Grammy artist credit into its individual artists.
+
+    "Featuring", "feat.", "with" and ';' always separate artists. '&', ',', '/' and
+    "and" separate artists too, but since they also appear inside act names the
+    unsplit piece is kept as a group candidate that only counts on an exact match.
+    Role suffixes ("..., conductor") and known non-artists are dropped.
+
+    Args:
+        name (str): Raw artist credit
+
+    Returns:
+        List[Dict]: One entry per credited act, in order, with the keys
+                    "group" (Optional[str]) and "members" (List[str])
+    """
+    acts = []
+    for piece in FEATURING_PATTERN.split(name):
+        piece = _clean_piece(piece)
+        if piece is None:
+            continue
+        members = [m for m in (_clean_piece(p) for p in GROUP_PATTERN.split(piece)) if m is not None]
+        if not members:
+            continue
+        group = piece if len(members) > 1 else None
+        acts.append({"group": group, "members": members})
+    return acts
+
+
+def canonicalise_artist_names(names: Iterable[str]) -> Dict:
+    """
+    Canonicalises raw Grammy artist credits into a deduplicated search worklist.
+
+    Each credit is represented by its primary act: the unsplit group first (it only
+    counts when the Spotify name matches exactly), then the group's first member.
+    Featured and secondary artists are split off and not searched, since nothing
+    downstream consumes their results.
+
+    Args:
+        names (Iterable[str]): Raw artist credits, as extracted from the Grammys data
+
+    Returns:
+        Dict: With the keys
+              "display": canonical key -> display name to search for,
+              "candidates": original credit -> ordered list of (key, exact) pairs used
+                            to map results back
+    """
+    display: Dict[str, str] = {}
+    candidates: Dict[str, List] = {}
+
+    for name in names:
+        if name in candidates:
+            continue
+        acts = split_collaborations(name) if isinstance(name, str) else []
+        original_candidates = []
+        if acts:
+            primary = acts[0]
+            if primary["group"] is not None:
+                original_candidates.append((fold_artist_name(primary["group"]), True))
+                display.setdefault(fold_artist_name(primary["group"]), primary["group"])
+            member = primary["members"][0]
+            original_candidates.append((fold_artist_name(member), False))
+            display.setdefault(fold_artist_name(member), member)
+        candidates[name] = original_candidates
+
+    first_keys = {c[0][0] for c in candidates.values() if c}
+    logging.info(f"Canonicalised {len(candidates)} distinct artist credits into {len(first_keys)} unique artists.")
+    return {"display": display, "candidates": candidates}
+
+
+def pending_queries(canonical: Dict, found: Dict[str, Optional[Dict]]) -> List[str]:
+    """
+    Returns the canonical keys that still need a search, in first-seen order.
+
+    A credit needs its next candidate searched only when every earlier candidate has
+    been searched without producing an acceptable hit, so group members are looked
+    up only for groups Spotify does not know by their full name.
+
+    Args:
+        canonical (Dict): Result of canonicalise_artist_names
+        found (Dict[str, Optional[Dict]]): Search results gathered so far
+
+    Returns:
+        List[str]: Keys to search next
+    """
+    pending = []
+    for original_candidates in canonical["candidates"].values():
+        for key, exact in original_candidates:
+            if key not in found:
+                pending.append(key)
+                break
+            if _accepts(found[key], key, exact):
+                break
+    return list(dict.fromkeys(pending))
+
+
+def _accepts(hit: Optional[Dict], key: str, exact: bool) -> bool:
+    return hit is not None and (not exact or fold_artist_name(hit["name"]) == key)
+
+
+def resolve_candidates(candidates: List, found: Dict[str, Optional[Dict]]) -> Optional[Dict]:
+    """
+    Picks the search result that represents an original credit.
+
+    Args:
+        candidates (List): Ordered (key, exact) pairs from canonicalise_artist_names
+        found (Dict[str, Optional[Dict]]): Canonical key -> search hit with "id" and "name",
+                                           or None when nothing was found
+
+    Returns:
+        Optional[Dict]: The chosen search hit, or None
+    """
+    for key, exact in candidates:
+        if _accepts(found.get(key), key, exact):
+            return found[key]
+    return None
@@ -0,0 +1,213 @@
+import os
+import re
+import json
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%d/%m/%Y %I:%M:%S %p")
+
+CREDITS_CACHE_PATH: str = os.getenv("GRAMMYS_CREDITS_CACHE_PATH", "/opt/airflow/data/cache/grammys_credits.json")
+CREDITS_CACHE_MAX_ENTRIES: int = int(os.getenv("GRAMMYS_CREDITS_CACHE_MAX_ENTRIES", "50000"))
+
+Credit = Tuple[str, Optional[str]]
+
+
+def workers_hash(workers: str) -> str:
+    """
+    Returns the stable hash used to key a 'workers' string in the credits cache.
+
+    Args:
+        workers (str): The raw workers string
+
+    Returns:
+        str: Hex SHA-1 digest of the UTF-8 encoded string
+    """
+    return hashlib.sha1(workers.encode("utf-8")).hexdigest()
+
+
+def parse_credits(workers: str) -> List[Credit]:
+    """
+    Splits a 'workers' string into structured (name, role) credits.
+
+    Credits are separated by ';'. Within a credit, the text after the last comma
+    is taken as the role, e.g. "John Williams, conductor" -> ("John Williams", "conductor").
+    Credits without a comma have no role.
+
+    Args:
+        workers (str): The raw workers string
+
+    Returns:
+        List[Credit]: Ordered list of (name, role) tuples
+    """
+    credits = []
+    for segment in workers.split(";"):
+        segment = segment.strip()
+        if not segment:
+            continue
+        if "," in segment:
+            name, role = segment.rsplit(",", 1)
+            credits.append((name.strip(), role.strip().lower() or None))
+        else:
+            credits.append((segment, None))
+    return credits
+
+
+def parse_workers(workers: str, roles: List[str]) -> Dict:
+    """
+    Parses a 'workers' string once into its credits and every artist candidate used
+    by the Grammys artist resolution.
+
+    Args:
+        workers (str): The raw workers string
+        roles (List[str]): List of roles of interest
+
+    Returns:
+        Dict: Cache entry with the roles it was parsed for, the structured credits and
+              the artist candidates, in the order the resolution tries them
+    """
+    from src.transform.grammys_transform import extract_artist, semicolon_artist, extract_roles
+
+    return {
+        "roles": sorted(roles),
+        "credits": [list(credit) for credit in parse_credits(workers)],
+        "candidates": [
+            extract_artist(workers),
+            None if re.search(r'[;,]', workers) else workers,
+            semicolon_artist(workers, roles),
+            extract_roles(workers, roles),
+        ],
+    }
+
+
+class CreditsCache:
+    """
+    Persistent, LRU-bounded memo of parsed 'workers' strings keyed by string hash.
+
+    Entries are stored as JSON so the cache survives between DAG runs; the least
+    recently used entries are evicted once the cache grows beyond max_entries.
+    """
+
+    def __init__(self, path: str = CREDITS_CACHE_PATH, max_entries: int = CREDITS_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: str = CREDITS_CACHE_PATH, max_entries: int = CREDITS_CACHE_MAX_ENTRIES) -> "CreditsCache":
+        """
+        Loads the cache from disk, starting empty if the file is missing or unreadable.
+
+        Args:
+            path (str): Location of the JSON cache file
+            max_entries (int): LRU bound on the number of cached strings
+
+        Returns:
+            CreditsCache: The loaded cache
+        """
+        cache = cls(path, max_entries)
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    cache.entries = OrderedDict(json.load(f))
+                logging.info(f"Loaded {len(cache.entries)} parsed credits from {path}.")
+            except (OSError, ValueError) as e:
+                logging.warning(f"Ignoring unreadable credits cache {path}: {e}")
+        return cache
+
+    def get(self, workers: str, roles: List[str]) -> Dict:
+        """
+        Returns the parsed entry for a workers string, parsing it on a cache miss.
+
+        The candidates depend on the roles of interest, so an entry parsed for other
+        roles counts as a miss and is replaced.
+
+        Args:
+            workers (str): The raw workers string
+            roles (List[str]): List of roles of interest
+
+        Returns:
+            Dict: The cache entry (see parse_workers)
+        """
+        key = workers_hash(workers)
+        entry = self.entries.get(key)
+        if entry is not None and entry.get("roles") == sorted(roles):
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        entry = parse_workers(workers, roles)
+        self.entries[key] = entry
+        self._dirty = True
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return entry
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+    def save(self) -> None:
+        """
+        Writes the cache back to disk if it changed. The file is replaced atomically
+        so a crashed run never leaves a truncated cache behind.
+        """
+        if not self._dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+            logging.info(f"Saved {len(self.entries)} parsed credits to {self.path}.")
+        except OSError as e:
+            logging.warning(f"Could not save credits cache to {self.path}: {e}")
+
+
+def resolve_workers(workers: pd.Series, cache: CreditsCache, roles: List[str]) -> pd.Series:
+    """
+    Resolves an artist for each workers string, parsing every distinct string once.
+
+    Args:
+        workers (pd.Series): The workers column
+        cache (CreditsCache): Cache of parsed workers strings
+        roles (List[str]): List of roles of interest
+
+    Returns:
+        pd.Series: First non-null artist candidate per row, aligned with workers
+    """
+    resolved = {}
+    for value in workers.dropna().unique():
+        candidates = cache.get(value, roles)["candidates"]
+        resolved[value] = next((c for c in candidates if c is not None), None)
+    return workers.map(resolved)
+
+
+def credits_frame(workers: Iterable, cache: CreditsCache, roles: List[str]) -> pd.DataFrame:
+    """
+    Builds the structured credits table, one row per (workers string, credit).
+
+    Args:
+        workers (Iterable): Workers strings, duplicates and nulls allowed
+        cache (CreditsCache): Cache of parsed workers strings
+        roles (List[str]): List of roles of interest
+
+    Returns:
+        pd.DataFrame: Columns workers_hash, workers, position, name, role
+    """
+    rows = []
+    for value in pd.Series(list(workers), dtype=object).dropna().unique():
+        key = workers_hash(value)
+        for position, (name, role) in enumerate(cache.get(value, roles)["credits"]):
+            rows.append({"workers_hash": key, "workers": value, "position": position, "name": name, "role": role})
+    return pd.DataFrame(rows, columns=["workers_hash", "workers", "position", "name", "role"])
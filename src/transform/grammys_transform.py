@@ -3,6 +3,7 @@ import re
 import logging
 from typing import Optional, Union, List
 import json
+from src.transform.credits import CreditsCache, resolve_workers
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%d/%m/%Y %I:%M:%S %p")
 
@@ -34,6 +35,16 @@ ROLES_OF_INTEREST: List[str] = [
     "ensembles"
 ]
 
+# Cleaning steps that don't need Python, in the order transform_grammys_data applies them.
+# extract_grammys_data compiles them into its SELECT (see src/database/pushdown.py).
+GRAMMYS_PUSHDOWN_STEPS: List[dict] = [
+    {"op": "rename", "columns": {"winner": "is_winner"}},
+    {"op": "drop", "columns": ["published_at", "updated_at", "img"]},
+    {"op": "dropna", "subset": ["nominee"]},
+    {"op": "exclude", "column": "category", "values": CATEGORIES, "where_null": ["artist", "workers"]},
+    {"op": "fill", "column": "artist", "value_from": "nominee", "where_null": ["artist", "workers"]},
+]
+
 def extract_artist(workers: Optional[str]) -> Optional[str]:
     """
     Extracts the artist name from the 'workers' column if it's within parentheses.
@@ -104,15 +115,25 @@ def extract_roles(workers: Optional[str], roles: List[str]) -> Optional[str]:
     matches = re.findall(pattern, workers, flags=re.IGNORECASE)
     return ", ".join(matches).strip() if matches else None
 
-def transform_grammys_data(df: Union[pd.DataFrame, str]) -> Optional[str]:
+def transform_grammys_data(df: Union[pd.DataFrame, str], credits_cache: Optional[CreditsCache] = None,
+                           as_frame: bool = False) -> Optional[Union[str, pd.DataFrame]]:
     """
     Cleans and transforms the Grammy Awards data and returns the DataFrame as JSON.
     
+    Accepts either the raw table or rows already cleaned by the SQL pushdown
+    (GRAMMYS_PUSHDOWN_STEPS); only the artist resolution is always done here.
+    Each distinct 'workers' string is parsed once through the credits cache; the
+    artist resolution reads the cached candidates instead of re-running the regexes.
+    
     Args:
         df (Union[pd.DataFrame, str]): Input DataFrame or JSON string
+        credits_cache (Optional[CreditsCache]): Shared credits cache. When omitted, the
+                                                persistent cache is loaded and saved here.
+        as_frame (bool): Return the transformed DataFrame instead of its JSON serialisation
         
     Returns:
-        Optional[str]: Transformed DataFrame as JSON string or None if error occurs
+        Optional[Union[str, pd.DataFrame]]: Transformed DataFrame as JSON string (or as a
+                                            DataFrame when as_frame is True), None if error occurs
         
     Raises:
         ValueError: If input DataFrame is empty or required columns are missing
@@ -128,17 +149,19 @@ def transform_grammys_data(df: Union[pd.DataFrame, str]) -> Optional[str]:
         if df.empty:
             raise ValueError("Input DataFrame is empty")
             
-        required_columns = ["winner", "nominee", "artist", "workers", "category", 
-                          "published_at", "updated_at", "img"]
+        required_columns = ["nominee", "artist", "workers", "category"]
         missing_columns = [col for col in required_columns if col not in df.columns]
+        if "winner" not in df.columns and "is_winner" not in df.columns:
+            missing_columns.append("winner")
         if missing_columns:
             raise ValueError(f"Missing required columns: {missing_columns}")
         
         logging.info(f"Starting transformation. The DataFrame has {df.shape[0]} rows and {df.shape[1]} columns.")
         
+        # These steps are no-ops when extraction already pushed them down to PostgreSQL.
         df = df.rename(columns={"winner": "is_winner"})
         
-        df = df.drop(columns=["published_at", "updated_at", "img"])
+        df = df.drop(columns=[col for col in ["published_at", "updated_at", "img"] if col in df.columns])
         
         df = df.dropna(subset=["nominee"])
         
@@ -148,34 +171,23 @@ def transform_grammys_data(df: Union[pd.DataFrame, str]) -> Optional[str]:
         df = df.drop(both_filtered.index)
         df.loc[both_null_values.index, "artist"] = both_null_values["nominee"]
         
-        df["artist"] = df.apply(
-            lambda row: extract_artist(row["workers"]) if pd.isna(row["artist"]) else row["artist"],
-            axis=1
-        )
-        
-        df["artist"] = df.apply(send_workers_to_artist, axis=1)
-        
-        df["artist"] = df.apply(
-            lambda row: semicolon_artist(row["workers"], ROLES_OF_INTEREST)
-            if pd.isna(row["artist"]) else row["artist"],
-            axis=1
-        )
-        
-        df["artist"] = df.apply(
-            lambda row: extract_roles(row["workers"], ROLES_OF_INTEREST)
-            if pd.isna(row["artist"]) else row["artist"],
-            axis=1
-        )
+        cache = credits_cache if credits_cache is not None else CreditsCache.load()
+        df["artist"] = df["artist"].fillna(resolve_workers(df["workers"], cache, ROLES_OF_INTEREST))
+        logging.info(f"Resolved artists from credits cache: {cache.hits} hits, {cache.misses} misses.")
+        if credits_cache is None:
+            cache.save()
         
         df = df.dropna(subset=["artist"])
         
         df["artist"] = df["artist"].replace({"(Various Artists)": "Various Artists"})
         
         df = df.drop(columns=["workers"])
-        
+
+        df["category"] = df["category"].astype("category")
+
         logging.info(f"Transformation complete. The DataFrame now has {df.shape[0]} rows and {df.shape[1]} columns.")
         
-        return df.to_json(orient="records")
+        return df if as_frame else df.to_json(orient="records")
     
     except Exception as e:
         logging.error(f"An error occurred during transformation: {str(e)}")
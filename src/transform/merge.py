@@ -1,17 +1,30 @@
 import pandas as pd
 import logging
+from src.database.follower_snapshots import followers_as_of
+from src.transform.title_match import MERGE_GRANULARITY, match_tracks
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
-def merge_data(spotify_df, grammys_df, spotify_api_df=None):
+def merge_data(spotify_df, grammys_df, spotify_api_df=None, follower_history=None, as_of=None,
+               granularity=MERGE_GRANULARITY):
     """
     Merge Spotify, Grammy Awards, and Spotify API artist data.
     
+    With follower_history and as_of, the follower counts are the ones valid at as_of
+    (an as-of join on artist_id) instead of the counts fetched by the current run.
+    
+    With granularity "track", a nomination is only paired with the artist's tracks whose
+    normalised title matches the nominee (see match_tracks), instead of with every track
+    of the artist.
+    
     Args:
         spotify_df (pd.DataFrame): DataFrame containing Spotify dataset data.
         grammys_df (pd.DataFrame): DataFrame containing Grammy Awards data.
-        spotify_api_df (pd.DataFrame, optional): DataFrame containing Spotify API artist data (artist_name, followers).
+        spotify_api_df (pd.DataFrame, optional): DataFrame containing Spotify API artist data (artist_name, artist_id, followers).
+        follower_history (pd.DataFrame, optional): Follower snapshots (artist_id, snapshot_date, followers).
+        as_of (str or date, optional): Date whose follower counts are used with follower_history.
+        granularity (str, optional): "artist" or "track". Defaults to MERGE_GRANULARITY.
     
     Returns:
         pd.DataFrame: Merged DataFrame.
@@ -37,18 +50,32 @@ def merge_data(spotify_df, grammys_df, spotify_api_df=None):
         spotify_df['artist_name'] = spotify_df['artist_name'].str.lower().str.strip()
         grammys_df['artist'] = grammys_df['artist'].str.lower().str.strip()
         
-        merged_df = pd.merge(
-            spotify_df,
-            grammys_df,
-            how='inner',
-            left_on='artist_name',
-            right_on='artist'
-        )
+        if granularity == 'track':
+            if 'nominee' not in grammys_df.columns or 'track_name' not in spotify_df.columns:
+                raise KeyError("Expected 'nominee' and 'track_name' columns for a track-level merge")
+            merged_df, _ = match_tracks(spotify_df, grammys_df)
+        elif granularity == 'artist':
+            merged_df = pd.merge(
+                spotify_df,
+                grammys_df,
+                how='inner',
+                left_on='artist_name',
+                right_on='artist'
+            )
+        else:
+            raise ValueError(f"Unknown merge granularity: {granularity}")
         
         if spotify_api_df is not None:
             if 'artist_name' not in spotify_api_df.columns:
                 raise KeyError("Expected 'artist_name' column in Spotify API DataFrame")
+            if follower_history is not None and as_of is not None:
+                if 'artist_id' not in spotify_api_df.columns:
+                    raise KeyError("Expected 'artist_id' column in Spotify API DataFrame for an as-of merge")
+                spotify_api_df = followers_as_of(spotify_api_df, follower_history, as_of=as_of)
+                logger.info(f"Using follower counts as of {as_of}")
             spotify_api_df['artist_name'] = spotify_api_df['artist_name'].str.lower().str.strip()
+            # Casing variants of the same credit fold to one key; keep one row so the join can't fan out.
+            spotify_api_df = spotify_api_df.drop_duplicates(subset=['artist_name'], keep='first')
             
             merged_df = pd.merge(
                 merged_df,
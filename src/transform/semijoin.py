@@ -0,0 +1,95 @@
+import os
+import logging
+from typing import Dict, Iterable, List, Tuple
+
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%d/%m/%Y %I:%M:%S %p")
+
+# Filter the Spotify rows down to the Grammy artists before transform_spotify. Only for
+# runs that need the joined output alone: transform_spotify's own output shrinks too.
+SEMIJOIN_PREFILTER: bool = os.getenv("SPOTIFY_SEMIJOIN_PREFILTER", "false").lower() == "true"
+# Look up followers only for Grammy artists that also have Spotify tracks. On by default,
+# since merge_data is the only consumer of the API data.
+API_JOIN_WORKLIST: bool = os.getenv("SPOTIFY_API_JOIN_WORKLIST", "true").lower() == "true"
+
+
+def join_keys(names: pd.Series) -> pd.Series:
+    """Normalises artist names into the keys merge_data joins on."""
+    return names.str.lower().str.strip()
+
+
+def artist_keys(grammys_df: pd.DataFrame, column: str = "artist") -> List[str]:
+    """
+    Returns the distinct join keys of the Grammy artists.
+
+    Args:
+        grammys_df (pd.DataFrame): Transformed Grammy Awards data
+        column (str): Artist column
+
+    Returns:
+        List[str]: Sorted, normalised artist keys
+    """
+    return sorted(join_keys(grammys_df[column].dropna().astype(str)).unique().tolist())
+
+
+def semijoin_prefilter(spotify_df: pd.DataFrame, keys: Iterable[str], artist_column: str = "artists",
+                       track_column: str = "track_id") -> Tuple[pd.DataFrame, Dict[str, float]]:
+    """
+    Keeps the Spotify rows whose track can end up in the inner join with the Grammys data.
+
+    A row is kept when any row of its track_id has a matching artist, not only when its
+    own artist matches: transform_spotify keeps the first row of every track_id, so
+    dropping a non-matching first row would let a later, matching duplicate survive
+    that the unfiltered run discards. With whole track_id groups kept, every
+    deduplication the transform does sees the same candidates for the matching artists,
+    and the merged output is identical.
+
+    Args:
+        spotify_df (pd.DataFrame): Extracted Spotify data
+        keys (Iterable[str]): Result of artist_keys
+        artist_column (str): Spotify artist column
+        track_column (str): Spotify track id column
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, float]]: The kept rows, in their original order, and a
+                                               report of rows and bytes kept and saved
+    """
+    matches = join_keys(spotify_df[artist_column].astype(str)).isin(set(keys))
+    matches &= spotify_df[artist_column].notna()
+    matched_tracks = spotify_df.loc[matches, track_column].unique()
+    kept = spotify_df[spotify_df[track_column].isin(matched_tracks)]
+
+    bytes_in = int(spotify_df.memory_usage(deep=True).sum())
+    bytes_kept = int(kept.memory_usage(deep=True).sum())
+    report = {
+        "rows_in": len(spotify_df),
+        "rows_kept": len(kept),
+        "rows_saved_pct": round(100 * (1 - len(kept) / len(spotify_df)), 1) if len(spotify_df) else 0.0,
+        "bytes_saved": bytes_in - bytes_kept,
+    }
+    logging.info(f"Semi-join pre-filter kept {report['rows_kept']} of {report['rows_in']} Spotify rows "
+                 f"({report['rows_saved_pct']}% and {report['bytes_saved'] / 2**20:.1f} MiB not transformed).")
+    return kept, report
+
+
+def join_worklist(artist_names: List[str], spotify_keys: Iterable[str]) -> List[str]:
+    """
+    Restricts the Spotify API worklist to Grammy artists that have Spotify tracks.
+
+    merge_data left-joins followers onto rows that survived the Spotify-by-Grammys inner
+    join, on the normalised artist name, so a credit whose key is not a Spotify artist
+    key can never receive its followers.
+
+    Args:
+        artist_names (List[str]): Grammy artist credits
+        spotify_keys (Iterable[str]): Normalised Spotify artist keys
+
+    Returns:
+        List[str]: The credits that can survive the join, in their original order
+    """
+    names = pd.Series(artist_names, dtype=object)
+    kept = names[join_keys(names.astype(str)).isin(set(spotify_keys))].tolist()
+    logging.info(f"Spotify API worklist restricted to {len(kept)} of {len(artist_names)} Grammy artists "
+                 f"with Spotify tracks; {len(artist_names) - len(kept)} lookups avoided.")
+    return kept
@@ -1,11 +1,80 @@
+import os
 import pandas as pd
 import logging
 from typing import Dict, List, Union, Optional
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import json
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%d/%m/%Y %I:%M:%S %p")
 log = logging.getLogger(__name__)
 
+SPOTIFY_TRANSFORM_WORKERS: int = int(os.getenv("SPOTIFY_TRANSFORM_WORKERS", "1"))
+# Below this size the pool's start-up and pickling cost more than the shards save.
+SHARD_MIN_ROWS: int = int(os.getenv("SPOTIFY_TRANSFORM_SHARD_MIN_ROWS", "200000"))
+
+GENRE_MAPPING: Dict[str, List[str]] = {
+    'Rock/Metal': [
+        'alt-rock', 'alternative', 'black-metal', 'death-metal', 'emo', 'grindcore',
+        'hard-rock', 'hardcore', 'heavy-metal', 'metal', 'metalcore', 'psych-rock',
+        'punk-rock', 'punk', 'rock-n-roll', 'rock', 'grunge', 'j-rock', 'goth',
+        'industrial', 'rockabilly', 'indie'
+    ],
+    
+    'Pop': [
+        'pop', 'indie-pop', 'power-pop', 'k-pop', 'j-pop', 'mandopop', 'cantopop',
+        'pop-film', 'j-idol', 'synth-pop'
+    ],
+    
+    'Electronic/Dance': [
+        'edm', 'electro', 'electronic', 'house', 'deep-house', 'progressive-house',
+        'techno', 'trance', 'dubstep', 'drum-and-bass', 'dub', 'garage', 'idm',
+        'club', 'dance', 'minimal-techno', 'detroit-techno', 'chicago-house',
+        'breakbeat', 'hardstyle', 'j-dance', 'trip-hop'
+    ],
+    
+    'Urban': [
+        'hip-hop', 'r-n-b', 'dancehall', 'reggaeton', 'reggae'
+    ],
+    
+    'Latino': [
+        'brazil', 'salsa', 'samba', 'spanish', 'pagode', 'sertanejo',
+        'mpb', 'latin', 'latino'
+    ],
+    
+    'Global Sounds': [
+        'indian', 'iranian', 'malay', 'turkish', 'tango', 'afrobeat', 'french', 'german', 'british', 'swedish'
+    ],
+    
+    'Jazz and Soul': [
+        'blues', 'bluegrass', 'funk', 'gospel', 'jazz', 'soul', 'groove', 'disco', 'ska'
+    ],
+    
+    'Varied Themes': [
+        'children', 'disney', 'forro', 'kids', 'party', 'romance', 'show-tunes',
+        'comedy', 'anime'
+    ],
+    
+    'Instrumental': [
+        'acoustic', 'classical', 'guitar', 'piano',
+        'world-music', 'opera', 'new-age'
+    ],
+    
+    'Mood': [
+        'ambient', 'chill', 'happy', 'sad', 'sleep', 'study'
+    ],
+    
+    'Single Genre': [
+        'country', 'honky-tonk', 'folk', 'singer-songwriter'
+    ]
+}
+
+# Ordered labels produced by the binning helpers below; they double as the seed rows of
+# the dimension tables in the merged schema.
+DURATION_CATEGORIES: List[str] = ["Short", "Average", "Long"]
+POPULARITY_CATEGORIES: List[str] = ["Low Popularity", "Average Popularity", "High Popularity"]
+MOOD_CATEGORIES: List[str] = ["Sad", "Neutral", "Happy"]
+
 def categorise_duration(duration_ms: int) -> str:
     """
     Categorises the duration of a song based on its duration in milliseconds.
@@ -57,7 +126,90 @@ def determine_mood(valence: float) -> str:
     else:
         return "Happy"
     
-def transform_spotify_data(df: Union[pd.DataFrame, str]) -> Optional[str]:
+def _hash_shards(df: pd.DataFrame, columns: List[str], shards: int) -> List[pd.DataFrame]:
+    shard_ids = pd.util.hash_pandas_object(df[columns], index=False).to_numpy() % shards
+    return [df[shard_ids == shard] for shard in range(shards)]
+
+def _dedupe_tracks(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Drops repeated rows and keeps the first row of every track_id.
+    
+    Rows keep their index labels, so shards of a frame partitioned by track_id give
+    the same rows as the whole frame.
+    """
+    return (df
+            .drop_duplicates()
+            .drop_duplicates(subset=["track_id"]))
+
+def _dedupe_songs(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Maps genres, then keeps one row per (track_name, artists): the most popular one,
+    the first in index order on ties. Rows keep their index labels, so shards of a frame
+    partitioned by (track_name, artists) give the same rows as the whole frame.
+    """
+    df = df.sort_index()
+    genre_category_mapping = {genre: category for category, genres in GENRE_MAPPING.items() for genre in genres}
+    df["track_genre"] = df["track_genre"].map(genre_category_mapping)
+    
+    subset_cols = [col for col in df.columns if col not in ["track_id", "album_name"]]
+    df = df.drop_duplicates(subset=subset_cols, keep="first")
+    
+    # A stable sort, so ties on popularity resolve the same way in every shard layout.
+    return (df
+            .sort_values(by="popularity", ascending=False, kind="mergesort")
+            .groupby(["track_name", "artists"])
+            .head(1)
+            .sort_index())
+
+def _derive_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Adds the duration, popularity, mood and live-performance columns, and drops the
+    audio features that are no longer needed.
+    """
+    df["duration_min"] = (df["duration_ms"]
+                            .apply(lambda x: f"{x // 60000}"))
+    
+    df["duration_min"] = df["duration_min"].astype(int)
+
+    df["duration_category"] = df["duration_ms"].apply(categorise_duration)
+    df["popularity_category"] = df["popularity"].apply(categorise_popularity)
+    df["track_mood"] = df["valence"].apply(determine_mood)
+    df["live_performance"] = df["liveness"] > 0.8
+
+    # Low-cardinality labels are dictionary-encoded; the category lists fix the codes.
+    df["track_genre"] = pd.Categorical(df["track_genre"], categories=list(GENRE_MAPPING))
+    df["duration_category"] = pd.Categorical(df["duration_category"], categories=DURATION_CATEGORIES, ordered=True)
+    df["popularity_category"] = pd.Categorical(df["popularity_category"], categories=POPULARITY_CATEGORIES, ordered=True)
+    df["track_mood"] = pd.Categorical(df["track_mood"], categories=MOOD_CATEGORIES, ordered=True)
+
+    columns_to_drop = [
+        "loudness", "mode", "duration_ms", "key", "tempo", "valence",
+        "speechiness", "acousticness", "instrumentalness", "liveness",
+        "time_signature"
+    ]
+    return df.drop(columns=columns_to_drop)
+
+def _transform_song_shard(df: pd.DataFrame) -> pd.DataFrame:
+    return _derive_columns(_dedupe_songs(df))
+
+def _transform_sharded(df: pd.DataFrame, workers: int) -> pd.DataFrame:
+    """
+    Runs the transform across a process pool in two hash-partitioned phases.
+    
+    Phase one partitions by track_id and drops duplicate tracks; phase two partitions
+    the survivors by (track_name, artists), so every duplicate group lives in one shard,
+    and runs the rest of the transform. Index labels carry the original row order
+    through both phases.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        shards = [shard for shard in _hash_shards(df, ["track_id"], workers) if not shard.empty]
+        df = pd.concat(pool.map(_dedupe_tracks, shards))
+        shards = [shard for shard in _hash_shards(df, ["track_name", "artists"], workers) if not shard.empty]
+        df = pd.concat(pool.map(_transform_song_shard, shards))
+    return df.sort_index()
+
+def transform_spotify_data(df: Union[pd.DataFrame, str], as_frame: bool = False,
+                           workers: Optional[int] = None) -> Optional[Union[str, pd.DataFrame]]:
     """
     Cleans and transforms the Spotify DataFrame.
     
@@ -65,11 +217,18 @@ def transform_spotify_data(df: Union[pd.DataFrame, str]) -> Optional[str]:
     including removing duplicates, categorising durations and popularity, determining moods,
     and standardising genres. It handles both DataFrame and JSON string inputs.
     
+    With more than one worker, frames of at least SHARD_MIN_ROWS rows are transformed
+    in hash-partitioned shards across a process pool; the output is identical to the
+    single-process path.
+    
     Args:
         df (Union[pd.DataFrame, str]): Input DataFrame or JSON string
+        as_frame (bool): Return the transformed DataFrame instead of its JSON serialisation
+        workers (Optional[int]): Worker processes; SPOTIFY_TRANSFORM_WORKERS when omitted
         
     Returns:
-        Optional[str]: Transformed DataFrame as JSON string or None if error occurs
+        Optional[Union[str, pd.DataFrame]]: Transformed DataFrame as JSON string (or as a
+                                            DataFrame when as_frame is True), None if error occurs
         
     Raises:
         ValueError: If input DataFrame is empty or required columns are missing
@@ -94,97 +253,21 @@ def transform_spotify_data(df: Union[pd.DataFrame, str]) -> Optional[str]:
                 .dropna()
                 .reset_index(drop=True))
         
-        df = df.drop_duplicates()
-        
-        df = (df
-                .drop_duplicates(subset=["track_id"])
-                .reset_index(drop=True))
-        
-        genre_mapping: Dict[str, List[str]] = {
-            'Rock/Metal': [
-                'alt-rock', 'alternative', 'black-metal', 'death-metal', 'emo', 'grindcore',
-                'hard-rock', 'hardcore', 'heavy-metal', 'metal', 'metalcore', 'psych-rock',
-                'punk-rock', 'punk', 'rock-n-roll', 'rock', 'grunge', 'j-rock', 'goth',
-                'industrial', 'rockabilly', 'indie'
-            ],
-            
-            'Pop': [
-                'pop', 'indie-pop', 'power-pop', 'k-pop', 'j-pop', 'mandopop', 'cantopop',
-                'pop-film', 'j-idol', 'synth-pop'
-            ],
-            
-            'Electronic/Dance': [
-                'edm', 'electro', 'electronic', 'house', 'deep-house', 'progressive-house',
-                'techno', 'trance', 'dubstep', 'drum-and-bass', 'dub', 'garage', 'idm',
-                'club', 'dance', 'minimal-techno', 'detroit-techno', 'chicago-house',
-                'breakbeat', 'hardstyle', 'j-dance', 'trip-hop'
-            ],
-            
-            'Urban': [
-                'hip-hop', 'r-n-b', 'dancehall', 'reggaeton', 'reggae'
-            ],
-            
-            'Latino': [
-                'brazil', 'salsa', 'samba', 'spanish', 'pagode', 'sertanejo',
-                'mpb', 'latin', 'latino'
-            ],
-            
-            'Global Sounds': [
-                'indian', 'iranian', 'malay', 'turkish', 'tango', 'afrobeat', 'french', 'german', 'british', 'swedish'
-            ],
-            
-            'Jazz and Soul': [
-                'blues', 'bluegrass', 'funk', 'gospel', 'jazz', 'soul', 'groove', 'disco', 'ska'
-            ],
-            
-            'Varied Themes': [
-                'children', 'disney', 'forro', 'kids', 'party', 'romance', 'show-tunes',
-                'comedy', 'anime'
-            ],
-            
-            'Instrumental': [
-                'acoustic', 'classical', 'guitar', 'piano',
-                'world-music', 'opera', 'new-age'
-            ],
-            
-            'Mood': [
-                'ambient', 'chill', 'happy', 'sad', 'sleep', 'study'
-            ],
-            
-            'Single Genre': [
-                'country', 'honky-tonk', 'folk', 'singer-songwriter'
-            ]
-        }
-        
-        genre_category_mapping = {genre: category for category, genres in genre_mapping.items() for genre in genres}
-        df["track_genre"] = df["track_genre"].map(genre_category_mapping)
-        
-        subset_cols = [col for col in df.columns if col not in ["track_id", "album_name"]]
-        df = df.drop_duplicates(subset=subset_cols, keep="first")
-        
-        df = (df
-                .sort_values(by="popularity", ascending=False)
-                .groupby(["track_name", "artists"])
-                .head(1)
-                .sort_index()
-                .reset_index(drop=True))
-        
-        df["duration_min"] = (df["duration_ms"]
-                                .apply(lambda x: f"{x // 60000}"))
-        
-        df["duration_min"] = df["duration_min"].astype(int)
-
-        df["duration_category"] = df["duration_ms"].apply(categorise_duration)
-        df["popularity_category"] = df["popularity"].apply(categorise_popularity)
-        df["track_mood"] = df["valence"].apply(determine_mood)
-        df["live_performance"] = df["liveness"] > 0.8
+        workers = SPOTIFY_TRANSFORM_WORKERS if workers is None else workers
+        df_sharded = None
+        if workers > 1 and len(df) >= SHARD_MIN_ROWS:
+            try:
+                log.info(f"Transforming {len(df)} rows in {workers} hash-partitioned shards.")
+                df_sharded = _transform_sharded(df, workers)
+            except (OSError, AssertionError, BrokenProcessPool) as e:
+                # e.g. a daemonic worker process that may not start a pool of its own.
+                log.warning(f"Sharded transform unavailable ({e}); running in a single process.")
         
-        columns_to_drop = [
-            "loudness", "mode", "duration_ms", "key", "tempo", "valence",
-            "speechiness", "acousticness", "instrumentalness", "liveness",
-            "time_signature"
-        ]
-        df = df.drop(columns=columns_to_drop)
+        if df_sharded is not None:
+            df = df_sharded
+        else:
+            df = _derive_columns(_dedupe_songs(_dedupe_tracks(df)))
+        df = df.reset_index(drop=True)
 
         if 'artists' in df.columns:
             df = df.rename(columns={'artists': 'artist_name'})
@@ -193,7 +276,7 @@ def transform_spotify_data(df: Union[pd.DataFrame, str]) -> Optional[str]:
 
         log.info(f"The DataFrame has been cleaned and transformed. Final dimensions: {df.shape[0]} rows and {df.shape[1]} columns.")
         
-        return df.to_json(orient="records")
+        return df if as_frame else df.to_json(orient="records")
         
     except Exception as e:
         log.error(f"An error occurred during transformation: {str(e)}")
@@ -0,0 +1,113 @@
+import os
+import re
+import logging
+import unicodedata
+from typing import Dict, Tuple
+
+import pandas as pd
+
+from src.transform.semijoin import join_keys
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%d/%m/%Y %I:%M:%S %p")
+
+# "artist" attaches every track of an artist to each of their nominations; "track" only
+# pairs a nomination with the artist's tracks whose title matches the nominee.
+MERGE_GRANULARITY: str = os.getenv("MERGE_GRANULARITY", "artist")
+
+# "(feat. X)", "(Remastered 2011)", "[Live]"
+BRACKETED_PATTERN = re.compile(r"\s*[\(\[][^\)\]]*[\)\]]")
+# "Song - Remastered 2011", "Song - From \"Frozen\""
+DASH_SUFFIX_PATTERN = re.compile(r"\s+-\s+.*$")
+# "Song feat. X"; "with" is left alone, it is part of too many titles.
+FEATURING_PATTERN = re.compile(r"\s+(?:featuring|feat\b\.?|ft\b\.?)\s.*$")
+PUNCTUATION_PATTERN = re.compile(r"[^\w\s]")
+
+
+def normalise_titles(titles: pd.Series) -> pd.Series:
+    """
+    Normalises track titles and Grammy nominees into comparable title keys.
+
+    Diacritics are removed and case folded, then bracketed suffixes, " - ..." version
+    suffixes and trailing featured artists are stripped, "&" becomes "and", and the
+    remaining punctuation and extra whitespace are dropped.
+
+    Args:
+        titles (pd.Series): Titles as strings
+
+    Returns:
+        pd.Series: Normalised titles; empty strings when nothing is left
+    """
+    folded = titles.astype(str).map(
+        lambda title: unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode("ascii").casefold()
+    )
+    return (folded.str.replace(BRACKETED_PATTERN, "", regex=True)
+            .str.replace(DASH_SUFFIX_PATTERN, "", regex=True)
+            .str.replace(FEATURING_PATTERN, "", regex=True)
+            .str.replace("&", " and ", regex=False)
+            .str.replace(PUNCTUATION_PATTERN, "", regex=True)
+            .str.split().str.join(" "))
+
+
+def track_keys(artists: pd.Series, titles: pd.Series) -> pd.DataFrame:
+    """
+    Builds the hashed (artist, title) keys the track-level join looks up.
+
+    Args:
+        artists (pd.Series): Artist names, keyed like the artist-level join (see join_keys)
+        titles (pd.Series): Track titles or nominees
+
+    Returns:
+        pd.DataFrame: "title_key" (normalised title) and "match_key" (uint64 hash of the
+                      artist key and title key), on the index of the inputs
+    """
+    keys = pd.DataFrame({"artist_key": join_keys(artists.astype(str)), "title_key": normalise_titles(titles)},
+                        index=artists.index)
+    keys["match_key"] = pd.util.hash_pandas_object(keys[["artist_key", "title_key"]], index=False)
+    return keys[["title_key", "match_key"]]
+
+
+def match_tracks(spotify_df: pd.DataFrame, grammys_df: pd.DataFrame, artist_column: str = "artist_name",
+                 title_column: str = "track_name", nominee_column: str = "nominee",
+                 grammy_artist_column: str = "artist") -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """
+    Pairs each Grammy nomination with the tracks of its artist whose title is the nominee.
+
+    The Spotify tracks are indexed by the hash of their (artist, title) key and every
+    nomination is looked up by the hash of its (artist, nominee) key, so the join is one
+    hash lookup per nomination instead of every track of the artist. Pairs whose
+    normalised titles differ despite a hash collision are dropped. Nominations of
+    albums, or of the artist themself, find no track and are left out.
+
+    Args:
+        spotify_df (pd.DataFrame): Transformed Spotify data
+        grammys_df (pd.DataFrame): Transformed Grammy Awards data
+        artist_column (str): Spotify artist column
+        title_column (str): Spotify track title column
+        nominee_column (str): Grammy nominee column
+        grammy_artist_column (str): Grammy artist column
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, int]]: The Spotify and Grammy columns of every
+                                             matched pair, and a report of nominations
+                                             and tracks matched
+    """
+    spotify_keys = track_keys(spotify_df[artist_column], spotify_df[title_column])
+    grammy_keys = track_keys(grammys_df[grammy_artist_column], grammys_df[nominee_column])
+    # Empty titles would pair every untitled track of an artist with every untitled nomination.
+    spotify_index = spotify_df.assign(__title_key=spotify_keys["title_key"],
+                                      __match_key=spotify_keys["match_key"])[spotify_keys["title_key"] != ""]
+    nominations = grammys_df.assign(__nominee_key=grammy_keys["title_key"],
+                                    __match_key=grammy_keys["match_key"])[grammy_keys["title_key"] != ""]
+
+    pairs = pd.merge(spotify_index, nominations, how="inner", on="__match_key")
+    pairs = pairs[pairs["__title_key"] == pairs["__nominee_key"]]
+    matched_keys = pairs["__match_key"].unique()
+    report = {
+        "nominations": len(grammys_df),
+        "nominations_matched": int(nominations["__match_key"].isin(matched_keys).sum()),
+        "tracks_matched": int(spotify_index["__match_key"].isin(matched_keys).sum()),
+        "pairs": len(pairs),
+    }
+    logging.info(f"Track-level match paired {report['nominations_matched']} of {report['nominations']} nominations "
+                 f"with {report['tracks_matched']} tracks ({report['pairs']} rows).")
+    return pairs.drop(columns=["__title_key", "__nominee_key", "__match_key"]).reset_index(drop=True), report
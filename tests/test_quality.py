@@ -0,0 +1,37 @@
+import pandas as pd
+import pytest
+
+from src.pipeline.quality import SPOTIFY_EXPECTATIONS, run_quality_gate
+
+
+def spotify_frame(rows):
+    return pd.DataFrame({
+        "track_id": [f"t{i}" for i in range(rows)],
+        "artists": ["Adele"] * rows,
+        "track_name": ["Hello"] * rows,
+        "track_genre": ["pop"] * rows,
+        "popularity": [50] * rows,
+        "valence": [0.5] * rows,
+        "duration_ms": [200000] * rows,
+    })
+
+
+# Row 65900 of spotify_dataset.csv: no artist, album or title, and a duration of 0.
+PLACEHOLDER_ROW = {
+    "track_id": "1kR4gIb7nGxHPI3D2ifs59", "artists": None, "track_name": None, "track_genre": "k-pop",
+    "popularity": 0, "valence": 0.0, "duration_ms": 0,
+}
+
+
+def test_spotify_gate_passes_catalogue_placeholder_row():
+    df = pd.concat([spotify_frame(199), pd.DataFrame([PLACEHOLDER_ROW])], ignore_index=True)
+
+    run_quality_gate("extract_spotify", df, SPOTIFY_EXPECTATIONS)
+
+
+def test_spotify_gate_rejects_negative_duration():
+    df = spotify_frame(10)
+    df.loc[0, "duration_ms"] = -1
+
+    with pytest.raises(ValueError, match="duration_ms"):
+        run_quality_gate("extract_spotify", df, SPOTIFY_EXPECTATIONS)
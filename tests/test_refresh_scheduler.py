@@ -0,0 +1,77 @@
+import re
+
+import pandas as pd
+
+from src.database.pushdown import compile_select
+from src.extract.refresh_scheduler import ARTISTS_BATCH_SIZE, artist_activity, plan_refresh, score_artists
+from src.pipeline.contracts import source_projection
+from src.transform.artist_names import canonicalise_artist_names, pending_queries
+from src.transform.grammys_transform import GRAMMYS_PUSHDOWN_STEPS
+
+
+def pushdown_columns():
+    """Returns the columns extract_grammys gets back from the pushed-down SELECT."""
+    sql, _ = compile_select("raw", "grammy_awards", source_projection("grammy_awards"), GRAMMYS_PUSHDOWN_STEPS)
+    select_list = sql.split("SELECT", 1)[1].split("\nFROM", 1)[0]
+    return [re.findall(r'"([^"]+)"', item)[-1] for item in select_list.split(",\n")]
+
+
+def test_artist_activity_reads_pushed_down_frame():
+    columns = pushdown_columns()
+    assert "is_winner" in columns and "winner" not in columns
+    rows = [
+        {"year": 2010, "artist": "Adele", "is_winner": True},
+        {"year": 2016, "artist": "Adele", "is_winner": False},
+        {"year": 2012, "artist": "Beyonce", "is_winner": False},
+    ]
+    df = pd.DataFrame([{column: row.get(column) for column in columns} for row in rows])
+
+    activity = artist_activity(df, "artist").set_index("artist_name")
+
+    assert activity.loc["Adele", "last_nominated"] == 2016
+    assert activity.loc["Adele", "wins"] == 1
+    assert activity.loc["Beyonce", "wins"] == 0
+
+
+def test_artist_activity_reads_unpushed_frame():
+    df = pd.DataFrame({"year": [2010, 2012], "artist": ["Adele", "Adele"], "winner": ["True", "False"]})
+
+    activity = artist_activity(df, "artist")
+
+    assert activity.to_dict("records") == [{"artist_name": "Adele", "last_nominated": 2012, "wins": 1}]
+
+
+def simulate_calls(selected):
+    """
+    Counts the most API calls extract_spotify_api_data can make for a plan: every search
+    misses, so each credit falls through all its candidates, yet every credit still ends
+    up in the follower lookup.
+    """
+    known_ids = {name: artist_id for name, artist_id in zip(selected["artist_name"], selected["artist_id"])
+                 if isinstance(artist_id, str)}
+    canonical = canonicalise_artist_names(name for name in selected["artist_name"] if name not in known_ids)
+    found = {}
+    pending = pending_queries(canonical, found)
+    while pending:
+        found.update(dict.fromkeys(pending))
+        pending = pending_queries(canonical, found)
+    lookups = -(-len(selected) // ARTISTS_BATCH_SIZE)
+    return len(found) + lookups
+
+
+def test_plan_refresh_stays_within_budget():
+    names = [f"Group {i} & Member {i}" for i in range(40)] + [f"Artist {i}" for i in range(80)]
+    state = pd.DataFrame({
+        "artist_name": names[40:100],
+        "artist_id": [f"id{i}" for i in range(60)],
+        "followers": [1000] * 60,
+        "refreshed_at": pd.to_datetime(["2025-01-01"] * 60),
+    })
+    activity = pd.DataFrame({"artist_name": names, "last_nominated": [2020] * len(names), "wins": [0] * len(names)})
+    scored = score_artists(names, state, activity, {}, pd.Series(dtype=float), "2025-04-01")
+
+    for budget in [10, 45, 80, 150]:
+        plan = plan_refresh(scored, budget)
+        selected = plan[plan["selected"]]
+        assert not selected.empty
+        assert simulate_calls(selected) <= budget